@@ -0,0 +1,79 @@
+"""Benchmark of decoding a row of the text protocol.
+
+Usage::
+
+    python benchmarks/decode_row.py
+
+Decodes a prebuilt row of 50 columns (INT, DOUBLE and VARCHAR) without a
+server. The row decoder of the result is compared with reading each column
+by MysqlPacket methods, which is how rows were decoded before.
+"""
+
+import argparse
+import timeit
+
+from pymysql.connections import _text_row_decoder
+from pymysql.protocol import MysqlPacket
+
+
+def build_row(columns):
+    converters = []
+    data = bytearray()
+    for i in range(columns):
+        if i % 3 == 0:
+            converters.append(("ascii", int))
+            value = str(i * 1000).encode()
+        elif i % 3 == 1:
+            converters.append(("ascii", float))
+            value = str(i / 7).encode()
+        else:
+            converters.append(("utf-8", None))
+            value = f"value{i}".encode()
+        data.append(len(value))
+        data += value
+    return converters, bytes(data)
+
+
+def read_row_from_packet(packet, converters):
+    row = []
+    for encoding, converter in converters:
+        try:
+            data = packet.read_length_coded_string()
+        except IndexError:
+            break
+        if data is not None:
+            if encoding is not None:
+                data = data.decode(encoding)
+            if converter is not None:
+                data = converter(data)
+        row.append(data)
+    return tuple(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--columns", type=int, default=50)
+    parser.add_argument("--number", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    converters, data = build_row(args.columns)
+    decode_row = _text_row_decoder(converters)
+    assert decode_row(data) == read_row_from_packet(
+        MysqlPacket(data, "utf-8"), converters
+    )
+    benchmarks = {
+        "MysqlPacket": lambda: read_row_from_packet(
+            MysqlPacket(data, "utf-8"), converters
+        ),
+        "decoder": lambda: decode_row(data),
+    }
+    for name, func in benchmarks.items():
+        best = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+        print(
+            f"{name:11} {args.columns} columns: {best / args.number * 1e6:.2f} us/row"
+        )
+
+
+if __name__ == "__main__":
+    main()
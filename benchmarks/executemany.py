@@ -0,0 +1,110 @@
+"""Benchmark of executemany() of INSERT.
+
+Usage::
+
+    python benchmarks/executemany.py
+    python benchmarks/executemany.py --execute --host 127.0.0.1 --user root --database test1
+
+Formats 1M rows of INT, DOUBLE, VARCHAR, DATETIME and NULL values into
+multiple-row INSERT statements, and compares the rows/sec with the formatting
+escaping each value by Connection.literal() ("per-value"), which is how
+executemany() formatted rows before the column encoders.
+No server is needed unless --execute is given to insert the rows into a
+temporary table.
+"""
+
+import argparse
+import datetime
+import time
+
+from fetch_rows import add_connection_arguments, connect
+
+import pymysql
+
+QUERY = "INSERT INTO bench_insert (a, b, c, d, e) VALUES (%s, %s, %s, %s, %s)"
+
+
+def make_rows(n):
+    now = datetime.datetime(2024, 1, 2, 3, 4, 5)
+    return [(i, i / 3, f"name'{i}", now, None) for i in range(n)]
+
+
+def per_value_statements(cursor, query, args):
+    """Format the statements by escaping each value by Connection.literal()."""
+    conn = cursor._get_db()
+    m = pymysql.cursors.RE_INSERT_VALUES.match(query)
+    prefix = m.group(1).encode(conn.encoding)
+    values = m.group(2).rstrip()
+    sql = bytearray(prefix)
+    for i, arg in enumerate(args):
+        v = (values % cursor._escape_args(arg, conn)).encode(conn.encoding)
+        if len(sql) + len(v) + 1 > cursor.max_stmt_length:
+            yield sql
+            sql = bytearray(prefix)
+        elif i:
+            sql += b","
+        sql += v
+    yield sql
+
+
+def bench_format(name, func, rows, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = sum(len(sql) for sql in func())
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    print(
+        f"{name:10} {len(rows)} rows: {best:.3f} s"
+        f" ({len(rows) / best:,.0f} rows/s, {size / 1024 / 1024:.1f} MB)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    add_connection_arguments(parser)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--execute", action="store_true", help="insert the rows into the server"
+    )
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    if args.execute:
+        conn = connect(args)
+    else:
+        conn = pymysql.connect(defer_connect=True)
+        # Set by the handshake. Escaping refers it for NO_BACKSLASH_ESCAPES.
+        conn.server_status = 0
+    cur = conn.cursor()
+
+    bench_format(
+        "per-value", lambda: per_value_statements(cur, QUERY, rows), rows, args.repeat
+    )
+    bench_format(
+        "columns", lambda: cur._bulk_insert_statements(QUERY, rows), rows, args.repeat
+    )
+
+    if args.execute:
+        cur.execute(
+            "CREATE TEMPORARY TABLE bench_insert"
+            " (a INT, b DOUBLE, c VARCHAR(20), d DATETIME, e INT)"
+        )
+        best = None
+        for _ in range(args.repeat):
+            cur.execute("TRUNCATE TABLE bench_insert")
+            start = time.perf_counter()
+            cur.executemany(QUERY, rows)
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        print(
+            f"executemany {len(rows)} rows: {best:.3f} s ({len(rows) / best:,.0f} rows/s)"
+        )
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
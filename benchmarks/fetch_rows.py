@@ -0,0 +1,87 @@
+"""Benchmark of fetching many small rows.
+
+Usage::
+
+    python benchmarks/fetch_rows.py --host 127.0.0.1 --user root --database test1
+
+Rows are generated by the server from a cross join of a 1000 rows temporary
+table, so 1M rows are fetched without creating a large table.
+Compare the result between revisions to see the per-row overhead of the
+client.
+"""
+
+import argparse
+import time
+
+import pymysql
+import pymysql.cursors
+
+
+def connect(args, **kwargs):
+    return pymysql.connect(
+        host=args.host,
+        port=args.port,
+        user=args.user,
+        password=args.password,
+        database=args.database,
+        unix_socket=args.unix_socket,
+        **kwargs,
+    )
+
+
+def add_connection_arguments(parser):
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=3306)
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="test1")
+    parser.add_argument("--unix-socket")
+
+
+def create_sequence(cur, name="bench_seq", size=1000):
+    cur.execute(f"CREATE TEMPORARY TABLE {name} (n INT PRIMARY KEY)")
+    cur.executemany(f"INSERT INTO {name} VALUES (%s)", [(i,) for i in range(size)])
+
+
+def bench(conn, cursor_class, query, repeat):
+    best = None
+    rows = 0
+    for _ in range(repeat):
+        cur = conn.cursor(cursor_class)
+        start = time.perf_counter()
+        cur.execute(query)
+        rows = 0
+        for _ in cur:
+            rows += 1
+        elapsed = time.perf_counter() - start
+        cur.close()
+        if best is None or elapsed < best:
+            best = elapsed
+    return rows, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    add_connection_arguments(parser)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    conn = connect(args)
+    cur = conn.cursor()
+    create_sequence(cur)
+    query = (
+        "SELECT a.n, b.n FROM bench_seq a, bench_seq b"
+        f" WHERE a.n * 1000 + b.n < {args.rows}"
+    )
+    for cursor_class in (pymysql.cursors.Cursor, pymysql.cursors.SSCursor):
+        rows, elapsed = bench(conn, cursor_class, query, args.repeat)
+        print(
+            f"{cursor_class.__name__:10} {rows} rows: {elapsed:.3f} s"
+            f" ({elapsed / rows * 1e6:.3f} us/row)"
+        )
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark of LOAD DATA LOCAL INFILE.
+
+Usage::
+
+    python benchmarks/load_local.py --host 127.0.0.1 --user root --database test1
+
+Loads a generated CSV file with several ``local_infile_packet_size`` values
+and reports the throughput. The file is sent by sendfile() when it is a
+regular file, and read into a buffer when it is a pipe (``--pipe``).
+The server must allow ``local_infile``, and max_allowed_packet of the server
+must be 16MB or more for the largest packets. The rows are discarded by the
+BLACKHOLE engine by default to measure the client and the network.
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from fetch_rows import add_connection_arguments, connect
+
+PACKET_SIZES = (16 * 1024, 256 * 1024, 1024 * 1024, 16 * 1024 * 1024)
+
+
+def write_file(path, size):
+    line = b"%d,0123456789abcdef0123456789abcdef0123456789abcdef\n"
+    with open(path, "wb") as f:
+        i = 0
+        written = 0
+        while written < size:
+            chunk = b"".join(line % n for n in range(i, i + 10000))
+            f.write(chunk)
+            written += len(chunk)
+            i += 10000
+    return written
+
+
+def load(conn, path, pipe_data=None):
+    cur = conn.cursor()
+    cur.execute("TRUNCATE TABLE bench_load")
+    writer = None
+    if pipe_data is not None:
+        read_fd, write_fd = os.pipe()
+        path = f"/dev/fd/{read_fd}"
+
+        def write():
+            with open(write_fd, "wb") as f:
+                f.write(pipe_data)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+    start = time.perf_counter()
+    try:
+        cur.execute(
+            f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE bench_load"
+            " FIELDS TERMINATED BY ','"
+        )
+    finally:
+        if writer is not None:
+            writer.join()
+            os.close(read_fd)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    add_connection_arguments(parser)
+    parser.add_argument("--size", type=int, default=256, help="file size in MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--pipe", action="store_true", help="load from a pipe")
+    parser.add_argument("--engine", default="BLACKHOLE")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "bench_load.csv")
+        size = write_file(path, args.size * 1024 * 1024)
+        pipe_data = None
+        if args.pipe:
+            with open(path, "rb") as f:
+                pipe_data = f.read()
+        for packet_size in PACKET_SIZES:
+            conn = connect(
+                args, local_infile=True, local_infile_packet_size=packet_size
+            )
+            cur = conn.cursor()
+            cur.execute(
+                "CREATE TEMPORARY TABLE bench_load (n INT, s VARCHAR(64))"
+                f" ENGINE={args.engine}"
+            )
+            best = min(load(conn, path, pipe_data) for _ in range(args.repeat))
+            print(
+                f"packet {packet_size:>8} bytes: {best:.3f} s"
+                f" ({size / best / 1024 / 1024:.1f} MB/s)"
+            )
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark of fetching wide rows.
+
+Usage::
+
+    python benchmarks/wide_rows.py --host 127.0.0.1 --user root --database test1
+
+Fetches rows of 60 columns (INT, DOUBLE and VARCHAR) to measure the cost of
+decoding rows in the client.
+"""
+
+import argparse
+
+from fetch_rows import add_connection_arguments, bench, connect, create_sequence
+
+import pymysql.cursors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    add_connection_arguments(parser)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    conn = connect(args)
+    cur = conn.cursor()
+    create_sequence(cur)
+    expressions = []
+    for i in range(args.columns):
+        if i % 3 == 0:
+            expressions.append(f"a.n + {i}")
+        elif i % 3 == 1:
+            expressions.append(f"b.n / {i}")
+        else:
+            expressions.append(f"CONCAT('value', b.n, '-{i}')")
+    query = (
+        f"SELECT {', '.join(expressions)} FROM bench_seq a, bench_seq b"
+        f" WHERE a.n * 1000 + b.n < {args.rows}"
+    )
+    for cursor_class in (pymysql.cursors.Cursor, pymysql.cursors.SSCursor):
+        rows, elapsed = bench(conn, cursor_class, query, args.repeat)
+        print(
+            f"{cursor_class.__name__:10} {rows} rows x {args.columns} columns:"
+            f" {elapsed:.3f} s ({elapsed / rows * 1e6:.2f} us/row)"
+        )
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
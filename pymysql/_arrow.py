@@ -0,0 +1,126 @@
+"""
+Conversion of result columns to Apache Arrow RecordBatches
+"""
+
+import array
+import datetime
+
+import pyarrow
+
+from . import converters
+from .constants import FIELD_TYPE, FLAG
+
+_INTEGER_TYPES = {
+    FIELD_TYPE.TINY: (pyarrow.int8(), pyarrow.uint8()),
+    FIELD_TYPE.SHORT: (pyarrow.int16(), pyarrow.uint16()),
+    FIELD_TYPE.INT24: (pyarrow.int32(), pyarrow.uint32()),
+    FIELD_TYPE.LONG: (pyarrow.int32(), pyarrow.uint32()),
+    FIELD_TYPE.LONGLONG: (pyarrow.int64(), pyarrow.uint64()),
+    FIELD_TYPE.YEAR: (pyarrow.uint16(), pyarrow.uint16()),
+}
+
+_TYPES = {
+    FIELD_TYPE.FLOAT: pyarrow.float32(),
+    FIELD_TYPE.DOUBLE: pyarrow.float64(),
+    FIELD_TYPE.DATETIME: pyarrow.timestamp("us"),
+    FIELD_TYPE.TIMESTAMP: pyarrow.timestamp("us"),
+    FIELD_TYPE.DATE: pyarrow.date32(),
+    FIELD_TYPE.TIME: pyarrow.duration("us"),
+    FIELD_TYPE.BIT: pyarrow.binary(),
+    FIELD_TYPE.NULL: pyarrow.null(),
+}
+
+
+def arrow_type(field, encoding, converter):
+    """Return the Arrow type of the column.
+
+    Returns None for columns using a custom converter.
+    """
+    type_code = field.type_code
+    default = converters.decoders.get(type_code)
+    if default is converters.through:
+        default = None
+    if converter is not default:
+        return None
+    if type_code in _INTEGER_TYPES:
+        signed, unsigned = _INTEGER_TYPES[type_code]
+        return unsigned if field.flags & FLAG.UNSIGNED else signed
+    if type_code in (FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL):
+        # field.length is the display length including the sign and the point.
+        precision = field.length
+        if field.scale:
+            precision -= 1
+        if not field.flags & FLAG.UNSIGNED:
+            precision -= 1
+        precision = max(precision, field.scale, 1)
+        if precision > 38:
+            return pyarrow.decimal256(precision, field.scale)
+        return pyarrow.decimal128(precision, field.scale)
+    if type_code in _TYPES:
+        return _TYPES[type_code]
+    return pyarrow.binary() if encoding is None else pyarrow.string()
+
+
+def _from_array(column, arrow_type):
+    # array.array is used as the data buffer without copy.
+    if column.typecode == "d":
+        buffer_type = pyarrow.float64()
+    else:
+        # Lower case typecodes are signed.
+        sign = "int" if column.typecode.islower() else "uint"
+        buffer_type = getattr(pyarrow, f"{sign}{column.itemsize * 8}")()
+    data = pyarrow.Array.from_buffers(
+        buffer_type, len(column), [None, pyarrow.py_buffer(column)]
+    )
+    if buffer_type != arrow_type:
+        data = data.cast(arrow_type)
+    return data
+
+
+def _from_list(column, arrow_type):
+    try:
+        return pyarrow.array(column, type=arrow_type)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+        if arrow_type is None or not pyarrow.types.is_temporal(arrow_type):
+            raise
+    # Invalid dates like "0000-00-00" are converted to str. Store them as null.
+    column = [
+        v if isinstance(v, (datetime.date, datetime.timedelta)) else None
+        for v in column
+    ]
+    return pyarrow.array(column, type=arrow_type)
+
+
+class BatchConverter:
+    """Convert columns of the result to RecordBatches of the same schema.
+
+    The schema is built from the fields of the result. Types of the columns
+    using custom converters are inferred from the first batch.
+    """
+
+    def __init__(self, result):
+        self._fields = result.fields
+        self._types = [
+            arrow_type(field, encoding, converter)
+            for field, (encoding, converter) in zip(result.fields, result.converters)
+        ]
+        self.schema = None
+
+    def convert(self, columns):
+        arrays = []
+        for column, arrow_type in zip(columns, self._types):
+            if type(column) is array.array:
+                arrays.append(_from_array(column, arrow_type))
+            else:
+                arrays.append(_from_list(column, arrow_type))
+        if self.schema is None:
+            self.schema = pyarrow.schema(
+                [
+                    pyarrow.field(
+                        field.name, data.type, not field.flags & FLAG.NOT_NULL
+                    )
+                    for field, data in zip(self._fields, arrays)
+                ]
+            )
+            self._types = list(self.schema.types)
+        return pyarrow.RecordBatch.from_arrays(arrays, schema=self.schema)
@@ -111,14 +111,29 @@ def ed25519_password(password, scramble):
     return R + S
 
 
-# sha256_password
+# Authentication steps
+#
+# Multi round trip auth methods are written as generators so that both of
+# Connection and AsyncConnection can drive them.  A generator yields the data
+# to send (or None to only receive), receives the next packet from the server
+# and returns the last packet.
+
 
+def run_steps(conn, steps):
+    """Run authentication steps with blocking I/O and return the last packet."""
+    try:
+        data = next(steps)
+        while True:
+            if data is not None:
+                conn.write_packet(data)
+            pkt = conn._read_packet()
+            pkt.check_error()
+            data = steps.send(pkt)
+    except StopIteration as e:
+        return e.value
 
-def _roundtrip(conn, send_data):
-    conn.write_packet(send_data)
-    pkt = conn._read_packet()
-    pkt.check_error()
-    return pkt
+
+# sha256_password
 
 
 def _xor_password(password, salt):
@@ -156,11 +171,15 @@ def sha2_rsa_encrypt(password, salt, public_key):
 
 
 def sha256_password_auth(conn, pkt):
+    return run_steps(conn, sha256_password_steps(conn, pkt))
+
+
+def sha256_password_steps(conn, pkt):
     if conn._secure:
         if DEBUG:
             print("sha256: Sending plain password")
         data = conn.password + b"\0"
-        return _roundtrip(conn, data)
+        return (yield data)
 
     if pkt.is_auth_switch_request():
         conn.salt = pkt.read_all()
@@ -170,7 +189,7 @@ def sha256_password_auth(conn, pkt):
             # Request server public key
             if DEBUG:
                 print("sha256: Requesting server public key")
-            pkt = _roundtrip(conn, b"\1")
+            pkt = yield b"\1"
 
     if pkt.is_extra_auth_data():
         conn.server_public_key = pkt._data[1:]
@@ -185,7 +204,7 @@ def sha256_password_auth(conn, pkt):
     else:
         data = b""
 
-    return _roundtrip(conn, data)
+    return (yield data)
 
 
 def scramble_caching_sha2(password, nonce):
@@ -209,9 +228,13 @@ def scramble_caching_sha2(password, nonce):
 
 
 def caching_sha2_password_auth(conn, pkt):
+    return run_steps(conn, caching_sha2_password_steps(conn, pkt))
+
+
+def caching_sha2_password_steps(conn, pkt):
     # No password fast path
     if not conn.password:
-        return _roundtrip(conn, b"")
+        return (yield b"")
 
     if pkt.is_auth_switch_request():
         # Try from fast auth
@@ -221,7 +244,7 @@ def caching_sha2_password_auth(conn, pkt):
         if DEBUG:
             print(f"caching sha2: Trying fast path. salt={conn.salt.hex()!r}")
         scrambled = scramble_caching_sha2(conn.password, conn.salt)
-        pkt = _roundtrip(conn, scrambled)
+        pkt = yield scrambled
     # else: fast auth is tried in initial handshake
 
     if not pkt.is_extra_auth_data():
@@ -240,9 +263,7 @@ def caching_sha2_password_auth(conn, pkt):
     if n == 3:
         if DEBUG:
             print("caching sha2: succeeded by fast path.")
-        pkt = conn._read_packet()
-        pkt.check_error()  # pkt must be OK packet
-        return pkt
+        return (yield None)  # OK packet follows
 
     if n != 4:
         raise OperationalError("caching sha2: Unknown result for fast auth: %s" % n)
@@ -253,10 +274,10 @@ def caching_sha2_password_auth(conn, pkt):
     if conn._secure:
         if DEBUG:
             print("caching sha2: Sending plain password via secure connection")
-        return _roundtrip(conn, conn.password + b"\0")
+        return (yield conn.password + b"\0")
 
     if not conn.server_public_key:
-        pkt = _roundtrip(conn, b"\x02")  # Request public key
+        pkt = yield b"\x02"  # Request public key
         if not pkt.is_extra_auth_data():
             raise OperationalError(
                 "caching sha2: Unknown packet for public key: %s" % pkt._data[:1]
@@ -267,4 +288,4 @@ def caching_sha2_password_auth(conn, pkt):
             print(conn.server_public_key.decode("ascii"))
 
     data = sha2_rsa_encrypt(conn.password, conn.salt, conn.server_public_key)
-    pkt = _roundtrip(conn, data)
+    return (yield data)
@@ -0,0 +1,172 @@
+"""
+Implements the compressed protocol
+"""
+
+# https://dev.mysql.com/doc/dev/mysql-server/latest/page_protocol_basic_compression.html
+
+import struct
+import zlib
+
+DEBUG = False
+
+#: Max length of the payload of a compressed packet.
+MAX_PAYLOAD_LEN = 2**24 - 1
+
+_zstd = None
+
+
+def _pack_int24(n):
+    return struct.pack("<I", n)[:3]
+
+
+def _init_zstd():
+    global _zstd
+    if _zstd is not None:
+        return
+    try:
+        # Python 3.14+
+        from compression import zstd
+
+        _zstd = (
+            lambda data, level: zstd.compress(data, level),
+            lambda data, length: zstd.decompress(data),
+        )
+        return
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("'zstandard' package is required for zstd compression")
+
+    def compress(data, level):
+        return zstandard.ZstdCompressor(level=level).compress(data)
+
+    def decompress(data, length):
+        return zstandard.ZstdDecompressor().decompress(data, max_output_size=length)
+
+    _zstd = (compress, decompress)
+
+
+def get_codec(algorithm, level=None):
+    """Return (compress, decompress) functions for the compression algorithm.
+
+    compress takes the data. decompress takes the data and the uncompressed length.
+    """
+    if algorithm == "zlib":
+        return zlib.compress, lambda data, length: zlib.decompress(data)
+    if algorithm == "zstd":
+        _init_zstd()
+        compress, decompress = _zstd
+        return (lambda data: compress(data, level)), decompress
+    raise ValueError(f"Unknown compression algorithm: {algorithm!r}")
+
+
+class CompressedIO:
+    """Compressed packets over the buffered reader of a connection.
+
+    read() returns the uncompressed stream, like the wrapped reader.
+    pack() converts the uncompressed data into compressed packets.
+    """
+
+    def __init__(self, rfile, algorithm, level=None, threshold=50):
+        self._rfile = rfile
+        self._compress, self._decompress = get_codec(algorithm, level)
+        self._threshold = threshold
+        self._buffer = bytearray()
+        self._position = 0
+        #: Sequence ID of the next compressed packet.
+        #: It is independent from the sequence ID of the packets in payload.
+        self.sequence_id = 0
+
+    @property
+    def closed(self):
+        return self._rfile.closed
+
+    def close(self):
+        self._rfile.close()
+
+    def read(self, size):
+        """Read up to size bytes of uncompressed data.
+
+        Shorter data is returned only when the connection is closed.
+        """
+        while len(self._buffer) - self._position < size:
+            if not self._read_packet():
+                break
+        position = self._position
+        with memoryview(self._buffer) as view:
+            result = bytes(view[position : position + size])
+        self._position = position + len(result)
+        return result
+
+    def unpack(self, st):
+        """Unpack fixed size data with struct.Struct st.
+
+        :raise EOFError: If the connection is closed.
+        """
+        size = st.size
+        while len(self._buffer) - self._position < size:
+            if not self._read_packet():
+                raise EOFError
+        position = self._position
+        self._position = position + size
+        return st.unpack_from(self._buffer, position)
+
+    def _read_packet(self):
+        header = self._rfile.read(7)
+        if len(header) < 7:
+            return False
+        btrl, btrh, sequence_id, ubtrl, ubtrh = struct.unpack("<HBBHB", header)
+        compressed_length = btrl + (btrh << 16)
+        uncompressed_length = ubtrl + (ubtrh << 16)
+        self.sequence_id = (sequence_id + 1) % 256
+
+        payload = self._rfile.read(compressed_length)
+        if len(payload) < compressed_length:
+            return False
+        if uncompressed_length:
+            payload = self._decompress(payload, uncompressed_length)
+        if DEBUG:
+            print(
+                "compressed packet: seq=%d compressed=%d uncompressed=%d"
+                % (sequence_id, compressed_length, uncompressed_length)
+            )
+
+        # Drop consumed data before appending new data.
+        if self._position:
+            del self._buffer[: self._position]
+            self._position = 0
+        self._buffer += payload
+        return True
+
+    def pack(self, data):
+        """Split data into compressed packets."""
+        packets = []
+        view = memoryview(data)
+        while True:
+            chunk = view[:MAX_PAYLOAD_LEN]
+            view = view[MAX_PAYLOAD_LEN:]
+            packets.append(self._pack_chunk(chunk))
+            if not view:
+                break
+        return b"".join(packets)
+
+    def _pack_chunk(self, chunk):
+        uncompressed_length = len(chunk)
+        payload = None
+        if uncompressed_length >= self._threshold:
+            payload = self._compress(chunk)
+            if len(payload) >= uncompressed_length:
+                # Incompressible data is sent as-is.
+                payload = None
+        if payload is None:
+            payload = chunk
+            uncompressed_length = 0
+        header = (
+            _pack_int24(len(payload))
+            + bytes([self.sequence_id])
+            + _pack_int24(uncompressed_length)
+        )
+        self.sequence_id = (self.sequence_id + 1) % 256
+        return header + bytes(payload)
@@ -0,0 +1,82 @@
+"""
+Conversion of result columns to NumPy arrays for NumpyCursor
+"""
+
+import datetime
+
+import numpy
+
+from . import converters
+from .constants import FIELD_TYPE, FLAG
+
+_INTEGER_TYPES = {
+    FIELD_TYPE.TINY,
+    FIELD_TYPE.SHORT,
+    FIELD_TYPE.INT24,
+    FIELD_TYPE.LONG,
+    FIELD_TYPE.LONGLONG,
+    FIELD_TYPE.YEAR,
+}
+
+_DTYPES = {
+    FIELD_TYPE.FLOAT: numpy.dtype("float64"),
+    FIELD_TYPE.DOUBLE: numpy.dtype("float64"),
+    FIELD_TYPE.DATETIME: numpy.dtype("datetime64[us]"),
+    FIELD_TYPE.TIMESTAMP: numpy.dtype("datetime64[us]"),
+    FIELD_TYPE.DATE: numpy.dtype("datetime64[D]"),
+}
+
+
+def column_dtype(field, converter):
+    """Return the dtype of the column, or None for object arrays.
+
+    Columns using a custom converter are object arrays.
+    """
+    type_code = field.type_code
+    if converter is not converters.decoders.get(type_code):
+        return None
+    if type_code in _INTEGER_TYPES:
+        if type_code == FIELD_TYPE.LONGLONG and field.flags & FLAG.UNSIGNED:
+            return numpy.dtype("uint64")
+        return numpy.dtype("int64")
+    return _DTYPES.get(type_code)
+
+
+def _to_date(value, converter):
+    if isinstance(value, bytes):
+        value = converter(value.decode("ascii"))
+    # Invalid dates like "0000-00-00" are converted to str.
+    if isinstance(value, datetime.date):
+        return value
+    return None
+
+
+def to_ndarray(values, dtype, converter):
+    """Convert the values of a column to an ndarray of dtype.
+
+    values contains bytes of the text protocol or the values decoded from the
+    binary protocol, and None for NULL. numpy parses the bytes.
+    A masked array is returned when the column contains NULL.
+    Invalid dates are masked too.
+    """
+    if dtype is None:
+        data = numpy.empty(len(values), dtype=object)
+        data[:] = values
+        return data
+
+    mask = None
+    if None in values:
+        mask = numpy.fromiter((v is None for v in values), bool, len(values))
+        if dtype.kind != "M":  # datetime64 converts None to NaT.
+            values = [0 if v is None else v for v in values]
+    try:
+        data = numpy.array(values, dtype=dtype)
+    except ValueError:
+        if dtype.kind != "M":
+            raise
+        values = [None if v is None else _to_date(v, converter) for v in values]
+        mask = numpy.fromiter((v is None for v in values), bool, len(values))
+        data = numpy.array(values, dtype=dtype)
+    if mask is not None and mask.any():
+        return numpy.ma.MaskedArray(data, mask=mask)
+    return data
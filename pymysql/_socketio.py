@@ -0,0 +1,98 @@
+"""
+Buffered reader of the socket
+"""
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+class SocketReader:
+    """Read buffer of the socket using recv_into().
+
+    Data is received into a reusable bytearray and copied only once, when
+    read() returns it. Unlike ``socket.makefile("rb")``, fixed size headers
+    can be parsed in place with unpack().
+
+    Closing the reader doesn't close the socket.
+    """
+
+    def __init__(self, sock, buffer_size=DEFAULT_BUFFER_SIZE):
+        self._sock = sock
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+        self.closed = False
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._view.release()
+            self._sock = None
+
+    def _fill(self, size):
+        """Receive data until size bytes are buffered.
+
+        size must not exceed the buffer size. Return False on EOF.
+        """
+        start = self._start
+        end = self._end
+        if start + size > len(self._buffer):
+            # Move the remaining data to the head of the buffer.
+            # It is shorter than size, so the copy is small.
+            remaining = end - start
+            self._buffer[:remaining] = self._buffer[start:end]
+            self._start = start = 0
+            self._end = end = remaining
+        recv_into = self._sock.recv_into
+        view = self._view
+        while end - start < size:
+            n = recv_into(view[end:])
+            if not n:
+                self._end = end
+                return False
+            end += n
+        self._end = end
+        return True
+
+    def read(self, size):
+        """Read size bytes.
+
+        Shorter data is returned only when the connection is closed.
+        """
+        if size > len(self._buffer):
+            return self._read_large(size)
+        if self._end - self._start < size and not self._fill(size):
+            size = self._end - self._start
+        start = self._start
+        self._start = start + size
+        return bytes(self._view[start : start + size])
+
+    def _read_large(self, size):
+        # Data larger than the buffer is received directly into its own buffer.
+        start = self._start
+        available = self._end - start
+        buff = bytearray(size)
+        buff[:available] = self._view[start : self._end]
+        self._start = self._end = 0
+        recv_into = self._sock.recv_into
+        with memoryview(buff) as view:
+            while available < size:
+                n = recv_into(view[available:])
+                if not n:
+                    break
+                available += n
+            return bytes(view[:available])
+
+    def unpack(self, st):
+        """Unpack fixed size data with struct.Struct st without copying it.
+
+        :raise EOFError: If the connection is closed.
+        """
+        start = self._start
+        size = st.size
+        if self._end - start < size:
+            if not self._fill(size):
+                raise EOFError
+            start = self._start
+        self._start = start + size
+        return st.unpack_from(self._buffer, start)
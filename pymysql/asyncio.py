@@ -0,0 +1,910 @@
+"""
+asyncio support
+
+:py:class:`AsyncConnection` does I/O with an asyncio Protocol. A whole
+response is received into a buffer before it is parsed by the same code as
+the blocking :py:class:`~pymysql.connections.Connection`.
+"""
+
+import asyncio
+import os
+import socket
+import stat
+import struct
+import warnings
+
+from . import err
+from .charset import charset_by_name
+from .connections import MAX_PACKET_LEN, Connection, MySQLResult, _pack_int24
+from .constants import COMMAND, CR, ER, SERVER_STATUS
+from .cursors import Cursor, DictCursorMixin, _backquote_escape
+from .pipeline import Pipeline
+
+_UINT16 = struct.Struct("<H")
+
+
+class _InputBuffer:
+    """Received data read by the blocking methods of Connection.
+
+    It has the same interface as _socketio.SocketReader, but reading beyond
+    the received data raises EOFError instead of blocking.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        #: Position of the next read.
+        self.position = 0
+        #: End of the responses received completely.
+        self.end = 0
+        self.closed = False
+
+    def read(self, size):
+        position = self.position
+        end = position + size
+        if end > len(self.data):
+            raise EOFError
+        self.position = end
+        with memoryview(self.data) as view:
+            return bytes(view[position:end])
+
+    def unpack(self, st):
+        try:
+            values = st.unpack_from(self.data, self.position)
+        except struct.error:
+            raise EOFError
+        self.position += st.size
+        return values
+
+    def compact(self):
+        """Remove the data read already."""
+        if self.position:
+            del self.data[: self.position]
+            self.end -= self.position
+            self.position = 0
+
+    def close(self):
+        self.closed = True
+        self.data = bytearray()
+        self.position = self.end = 0
+
+
+class _Protocol(asyncio.Protocol):
+    def __init__(self, loop):
+        self.buffer = _InputBuffer()
+        self._loop = loop
+        self._waiter = None
+        self._drain_waiter = None
+        self._paused = False
+        self._connection_lost = False
+        self._exception = None
+
+    def data_received(self, data):
+        self.buffer.data += data
+        self._wakeup(self._waiter)
+
+    def eof_received(self):
+        # Close the transport. connection_lost() is called.
+        return False
+
+    def connection_lost(self, exc):
+        self._connection_lost = True
+        self._exception = exc
+        self._wakeup(self._waiter)
+        self._wakeup(self._drain_waiter)
+
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        self._wakeup(self._drain_waiter)
+
+    @staticmethod
+    def _wakeup(waiter):
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _check_connection(self):
+        if self._connection_lost:
+            if self._exception is not None:
+                raise ConnectionError(str(self._exception))
+            raise EOFError
+
+    async def receive(self):
+        """Wait until more data is received."""
+        self._check_connection()
+        self._waiter = self._loop.create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+    async def drain(self):
+        """Wait until the write buffer of the transport is drained."""
+        self._check_connection()
+        if not self._paused:
+            return
+        self._drain_waiter = self._loop.create_future()
+        try:
+            await self._drain_waiter
+        finally:
+            self._drain_waiter = None
+        self._check_connection()
+
+
+def _read_lenenc(data, pos):
+    c = data[pos]
+    if c < 251:
+        return c, pos + 1
+    if c == 252:
+        return _UINT16.unpack_from(data, pos + 1)[0], pos + 3
+    if c == 253:
+        return int.from_bytes(data[pos + 1 : pos + 4], "little"), pos + 4
+    return int.from_bytes(data[pos + 1 : pos + 9], "little"), pos + 9
+
+
+def _ok_status(data, pos):
+    """Return the server status of the OK packet whose payload starts at pos."""
+    _, pos = _read_lenenc(data, pos + 1)  # affected_rows
+    _, pos = _read_lenenc(data, pos)  # insert_id
+    return _UINT16.unpack_from(data, pos)[0]
+
+
+def _next_packet(data, offset):
+    """Find the packet starting at offset.
+
+    Return (payload offset, payload length, offset of the next packet), or
+    None if the packet is not received completely. Payload length is the
+    length of the first part of a large packet.
+    """
+    size = len(data)
+    payload = offset + 4
+    if payload > size:
+        return None
+    length = data[offset] | data[offset + 1] << 8 | data[offset + 2] << 16
+    end = payload + length
+    # https://dev.mysql.com/doc/internals/en/sending-more-than-16mbyte.html
+    part = length
+    while part == MAX_PACKET_LEN:
+        if end + 4 > size:
+            return None
+        part = data[end] | data[end + 1] << 8 | data[end + 2] << 16
+        end += 4 + part
+    if end > size:
+        return None
+    return payload, length, end
+
+
+class AsyncConnection(Connection):
+    """
+    Connection to a MySQL server using asyncio.
+
+    Create it with :py:func:`pymysql.asyncio.connect`. Arguments are same to
+    :py:class:`~pymysql.connections.Connection` except:
+
+    - ``cursorclass`` defaults to :py:class:`AsyncCursor`.
+    - ``compress`` and ``auth_plugin_map`` are not supported.
+
+    Methods doing I/O are coroutines. Use ``async with`` instead of ``with``.
+    Results are always buffered, so unbuffered cursors and prepared statements
+    are not supported.
+    """
+
+    _protocol = None
+
+    def __init__(
+        self,
+        *,
+        cursorclass=None,
+        compress=None,
+        auth_plugin_map=None,
+        defer_connect=True,
+        **kwargs,
+    ):
+        if compress:
+            raise err.NotSupportedError("compress is not supported by AsyncConnection")
+        if auth_plugin_map:
+            raise err.NotSupportedError(
+                "auth_plugin_map is not supported by AsyncConnection"
+            )
+        del defer_connect  # connect() is a coroutine.
+        super().__init__(
+            cursorclass=cursorclass or AsyncCursor, defer_connect=True, **kwargs
+        )
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' for AsyncConnection")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        del exc_info
+        await self.close()
+
+    async def close(self):
+        """
+        Send the quit message and close the connection.
+
+        :raise Error: If the connection is already closed.
+        """
+        if self._closed:
+            raise err.Error("Already closed")
+        self._closed = True
+        if self._sock is None:
+            return
+        try:
+            self._write_bytes(struct.pack("<iB", 1, COMMAND.COM_QUIT))
+            try:
+                await self._drain()
+            except err.OperationalError:
+                pass
+        finally:
+            self._force_close()
+
+    def _force_close(self):
+        """Close connection without QUIT message."""
+        super()._force_close()
+        self._protocol = None
+
+    __del__ = _force_close
+
+    async def autocommit(self, value):
+        self.autocommit_mode = bool(value)
+        current = self.get_autocommit()
+        if value != current:
+            await self._send_autocommit_mode()
+
+    async def _send_autocommit_mode(self):
+        await self._command(
+            COMMAND.COM_QUERY, "SET AUTOCOMMIT = %s" % self.escape(self.autocommit_mode)
+        )
+        self._read_ok_packet()
+
+    async def begin(self):
+        """Begin transaction."""
+        await self._command(COMMAND.COM_QUERY, "BEGIN")
+        self._read_ok_packet()
+
+    async def commit(self):
+        """Commit changes to stable storage."""
+        await self._command(COMMAND.COM_QUERY, "COMMIT")
+        self._read_ok_packet()
+
+    async def rollback(self):
+        """Roll back the current transaction."""
+        await self._command(COMMAND.COM_QUERY, "ROLLBACK")
+        self._read_ok_packet()
+
+    async def show_warnings(self):
+        """Send the "SHOW WARNINGS" SQL command."""
+        await self._command(COMMAND.COM_QUERY, "SHOW WARNINGS")
+        result = MySQLResult(self)
+        result.read()
+        return result.rows
+
+    async def select_db(self, db):
+        """
+        Set current db.
+
+        :param db: The name of the db.
+        """
+        await self._command(COMMAND.COM_INIT_DB, db)
+        self._read_ok_packet()
+        self.current_db = db
+
+    async def query(self, sql, unbuffered=False):
+        if unbuffered:
+            raise err.NotSupportedError("AsyncConnection doesn't support unbuffered")
+        if isinstance(sql, str):
+            sql = sql.encode(self.encoding, "surrogateescape")
+        await self._command(COMMAND.COM_QUERY, sql)
+        self._affected_rows = self._read_query_result()
+        return self._affected_rows
+
+    def pipeline(self, cursor=None):
+        """
+        Create an :py:class:`AsyncPipeline` to send queries at once.
+
+        :param cursor: The type of cursors having the results.
+            None means the cursorclass of the connection.
+        """
+        return AsyncPipeline(self, cursor)
+
+    def prepare(self, query):
+        raise err.NotSupportedError(
+            "AsyncConnection doesn't support prepared statements"
+        )
+
+    async def kill(self, thread_id):
+        if not isinstance(thread_id, int):
+            raise TypeError("thread_id must be an integer")
+        await self.query(f"KILL {thread_id:d}")
+
+    async def ping(self):
+        """
+        Check if the server is alive.
+
+        :raise Error: If the connection is closed.
+        """
+        if self._sock is None:
+            raise err.Error("Already closed")
+        await self._command(COMMAND.COM_PING, "")
+        self._read_ok_packet()
+
+    async def reset(self):
+        """
+        Reset the session state of the connection.
+
+        See :py:meth:`pymysql.connections.Connection.reset`.
+        """
+        query = self._session_state_query()
+        self._reset_session_tracking(self.current_db)
+        if self._reset_connection_supported:
+            self._execute_command(COMMAND.COM_RESET_CONNECTION, b"")
+            self._execute_command(COMMAND.COM_QUERY, query)
+            await self._drain()
+            await self._receive_response()
+            try:
+                self._read_ok_packet()
+                error = None
+            except err.MySQLError as e:
+                error = e
+            # Responses of the pipelined commands start from sequence id 1.
+            self._next_seq_id = 1
+            await self._receive_response()
+            self._read_ok_packet()
+            if error is not None:
+                if error.args[0] != ER.UNKNOWN_COM_ERROR:
+                    raise error
+                self._reset_connection_supported = False
+        if not self._reset_connection_supported:
+            await self._change_user()
+            await self._command(COMMAND.COM_QUERY, query)
+            self._read_ok_packet()
+        self.statement_cache.clear()
+        await self._run_init_command()
+
+    async def change_user(self, user, password="", database=None):
+        """
+        Authenticate as another user on the same connection.
+
+        See :py:meth:`pymysql.connections.Connection.change_user`.
+        """
+        saved = self.user, self.password, self.db
+        self._set_user(user, password, database)
+        try:
+            await self._change_user()
+        except BaseException:
+            self.user, self.password, self.db = saved
+            raise
+        await self._command(COMMAND.COM_QUERY, self._session_state_query())
+        self._read_ok_packet()
+        await self._run_init_command()
+
+    async def _change_user(self):
+        self._execute_command(COMMAND.COM_CHANGE_USER, self._change_user_packet())
+        auth_packet = await self._run_auth_steps(self._auth_result_steps(None))
+        self._change_user_done(auth_packet)
+
+    async def _run_init_command(self):
+        if self.init_command is not None:
+            await self.query(self.init_command)
+            while self._result.has_next:
+                self.next_result()
+
+    async def set_charset(self, charset):
+        """Deprecated. Use set_character_set() instead."""
+        warnings.warn(
+            "'set_charset' is deprecated, use 'set_character_set' instead",
+            DeprecationWarning,
+            2,
+        )
+        await self.set_character_set(charset)
+
+    async def set_character_set(self, charset, collation=None):
+        """
+        Set charset (and collation)
+
+        Send "SET NAMES charset [COLLATE collation]" query.
+        Update Connection.encoding based on charset.
+        """
+        # Make sure charset is supported.
+        encoding = charset_by_name(charset).encoding
+
+        if collation:
+            query = f"SET NAMES {charset} COLLATE {collation}"
+        else:
+            query = f"SET NAMES {charset}"
+        await self._command(COMMAND.COM_QUERY, query)
+        self._read_packet()
+        self.charset = charset
+        self.encoding = encoding
+        self.collation = collation
+
+    async def connect(self):
+        self._closed = False
+        loop = asyncio.get_running_loop()
+        try:
+            if self.unix_socket:
+                connection = loop.create_unix_connection(
+                    lambda: _Protocol(loop), self.unix_socket
+                )
+                self.host_info = "Localhost via UNIX socket"
+                self._secure = True
+            else:
+                local_addr = None
+                if self.bind_address is not None:
+                    local_addr = (self.bind_address, 0)
+                connection = loop.create_connection(
+                    lambda: _Protocol(loop),
+                    self.host,
+                    self.port,
+                    local_addr=local_addr,
+                )
+                self.host_info = "socket %s:%d" % (self.host, self.port)
+            transport, protocol = await asyncio.wait_for(
+                connection, self.connect_timeout
+            )
+            if not self.unix_socket:
+                sock = transport.get_extra_info("socket")
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+            self._sock = transport
+            self._protocol = protocol
+            self._rfile = protocol.buffer
+            self._compressed = None
+            self._next_seq_id = 0
+            self.statement_cache.clear()
+
+            await self._receive_packet()
+            self._get_server_information()
+            await self._authenticate()
+
+            # See Connection.connect() for why "SET NAMES" is sent always.
+            if self._pipeline_init:
+                await self._init_session_pipelined()
+            else:
+                await self._init_session()
+        except BaseException as e:
+            self._force_close()
+
+            if isinstance(e, (OSError, asyncio.TimeoutError)):
+                exc = err.OperationalError(
+                    CR.CR_CONN_HOST_ERROR,
+                    f"Can't connect to MySQL server on {self.host!r} ({e!r})",
+                )
+                exc.original_exception = e
+                raise exc from e
+            raise
+
+    async def _authenticate(self):
+        client_flags, data_init, do_ssl = self._prepare_handshake()
+        if do_ssl:
+            self.write_packet(data_init)
+            await self._drain()
+            loop = asyncio.get_running_loop()
+            self._sock = await loop.start_tls(
+                self._sock,
+                self._protocol,
+                self.ctx,
+                server_hostname=self.host,
+                ssl_handshake_timeout=self.connect_timeout,
+            )
+            self._secure = True
+
+        await self._run_auth_steps(self._auth_steps(client_flags, data_init, do_ssl))
+
+    async def _run_auth_steps(self, steps):
+        """Async version of _auth.run_steps()."""
+        try:
+            data = next(steps)
+            while True:
+                if data is not None:
+                    self.write_packet(data)
+                    await self._drain()
+                await self._receive_packet()
+                pkt = self._read_packet()
+                pkt.check_error()
+                data = steps.send(pkt)
+        except StopIteration as e:
+            return e.value
+
+    async def _init_session(self):
+        if self._need_set_names():
+            await self.set_character_set(self.charset, self.collation)
+
+        if self.sql_mode is not None:
+            await self.query("SET sql_mode=%s" % self.escape(self.sql_mode))
+
+        await self._run_init_command()
+
+        if self.autocommit_mode is not None:
+            await self.autocommit(self.autocommit_mode)
+
+    async def _init_session_pipelined(self):
+        queries = self._init_queries()
+        for query in queries:
+            self._execute_command(COMMAND.COM_QUERY, query)
+        await self._drain()
+        for i in range(len(queries)):
+            if i:
+                self._next_seq_id = 1
+            await self._receive_response()
+            self._read_query_result()
+            while self._result.has_next:
+                self.next_result()
+
+    def _set_timeout(self, timeout):
+        # Responses are received by coroutines before they are read.
+        pass
+
+    def _write_bytes(self, data):
+        # The transport buffers data. _drain() waits until it is sent.
+        self._sock.write(data)
+
+    async def _wait(self, aw, timeout):
+        if timeout is None:
+            return await aw
+        return await asyncio.wait_for(aw, timeout)
+
+    async def _drain(self):
+        try:
+            await self._wait(self._protocol.drain(), self._write_timeout)
+        except (OSError, EOFError, asyncio.TimeoutError) as e:
+            self._force_close()
+            raise err.OperationalError(
+                CR.CR_SERVER_GONE_ERROR, f"MySQL server has gone away ({e!r})"
+            )
+        except BaseException:
+            # The connection is out of sync when the task is cancelled.
+            self._force_close()
+            raise
+
+    async def _receive(self):
+        """Receive more data into the input buffer."""
+        try:
+            await self._wait(self._protocol.receive(), self._read_timeout)
+        except EOFError:
+            self._force_close()
+            raise err.OperationalError(
+                CR.CR_SERVER_LOST, "Lost connection to MySQL server during query"
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            self._force_close()
+            raise err.OperationalError(
+                CR.CR_SERVER_LOST,
+                f"Lost connection to MySQL server during query ({e!r})",
+            )
+        except BaseException:
+            # The connection is out of sync when the task is cancelled.
+            self._force_close()
+            raise
+
+    async def _scan_packet(self, offset):
+        """Wait until the packet starting at offset is received.
+
+        Return the result of _next_packet().
+        """
+        data = self._rfile.data
+        packet = _next_packet(data, offset)
+        while packet is None:
+            await self._receive()
+            packet = _next_packet(data, offset)
+        return packet
+
+    async def _receive_packet(self):
+        """Receive one packet to be read by _read_packet()."""
+        buffer = self._rfile
+        buffer.compact()
+        _, _, buffer.end = await self._scan_packet(buffer.end)
+
+    async def _command(self, command, sql):
+        """Send the command and receive its whole response."""
+        self._execute_command(command, sql)
+        await self._drain()
+        await self._receive_response()
+
+    async def _receive_response(self):
+        """Receive the whole response of a command into the input buffer.
+
+        It includes all result sets of multiple statements.
+        """
+        buffer = self._rfile
+        buffer.compact()
+        data = buffer.data
+        offset = buffer.end
+        eof_limit = MAX_PACKET_LEN if self._deprecate_eof else 9
+        error = None
+        while True:
+            start = offset
+            payload, _, offset = await self._scan_packet(offset)
+            first = data[payload]
+            if first == 0xFF:  # error
+                break
+            if first == 0xFB:  # LOAD DATA LOCAL INFILE
+                error = await self._load_local_file(start, payload, offset)
+                offset = start
+                continue
+            if first == 0x00:  # OK
+                status = _ok_status(data, payload)
+            else:  # result set
+                field_count, _ = _read_lenenc(data, payload)
+                if not self._deprecate_eof:
+                    field_count += 1  # EOF packet
+                for _ in range(field_count):
+                    _, _, offset = await self._scan_packet(offset)
+                while True:
+                    packet = _next_packet(data, offset)
+                    if packet is None:
+                        await self._receive()
+                        continue
+                    payload, length, offset = packet
+                    first = data[payload]
+                    if first == 0xFF or (first == 0xFE and length < eof_limit):
+                        break
+                if first == 0xFF:
+                    break
+                if self._deprecate_eof:
+                    status = _ok_status(data, payload)
+                else:
+                    status = _UINT16.unpack_from(data, payload + 3)[0]
+            if not status & SERVER_STATUS.SERVER_MORE_RESULTS_EXISTS:
+                break
+        buffer.end = offset
+        if error is not None:
+            # Discard the response of the failed LOAD DATA LOCAL INFILE.
+            buffer.position = offset
+            raise error
+
+    async def _load_local_file(self, start, payload, end):
+        """Handle the LOAD DATA LOCAL INFILE request packet from start to end.
+
+        The request is removed from the input buffer so that the following
+        packet is read as the result of the query.
+        Return the exception to raise after the response is received.
+        """
+        data = self._rfile.data
+        filename = bytes(data[payload + 1 : end])
+        self._next_seq_id = (data[start + 3] + 1) % 256
+        del data[start:end]
+        error = None
+        if not self._local_infile:
+            error = RuntimeError(
+                "**WARN**: Received LOAD_LOCAL packet but local_infile option is false."
+            )
+        else:
+            source = self._load_data_source
+            try:
+                if source is not None and source[0] == filename:
+                    self._load_data_source = None
+                    for chunk in source[1]:
+                        self.write_packet(chunk)
+                        await self._drain()
+                else:
+                    await self._send_local_file(filename)
+            except Exception as e:
+                # Errors of the rows of load_data() are raised after the
+                # response too.
+                if self._sock is None:
+                    raise
+                error = e
+        # send the empty packet to signify we are done sending data
+        self.write_packet(b"")
+        await self._drain()
+        return error
+
+    async def _send_local_file(self, filename):
+        # Files are read in the default executor not to block the event loop.
+        loop = asyncio.get_running_loop()
+        packet_size = self._local_infile_chunk_size()
+        try:
+            file = await loop.run_in_executor(None, open, filename, "rb", 0)
+            with file:
+                size = os.fstat(file.fileno())
+                if self._compressed is None and stat.S_ISREG(size.st_mode):
+                    size = size.st_size
+                    offset = 0
+                    while offset < size:
+                        count = min(packet_size, size - offset)
+                        await self._sendfile_packet(file, offset, count)
+                        offset += count
+                    return
+                # The transport may keep the written chunks, so a buffer can't
+                # be reused like Connection.
+                while True:
+                    chunk = await loop.run_in_executor(None, file.read, packet_size)
+                    if not chunk:
+                        break
+                    self.write_packet(chunk)
+                    await self._drain()
+        except OSError as e:
+            raise err.OperationalError(
+                ER.FILE_NOT_FOUND,
+                f"Can't open file '{filename}': {e}",
+            )
+
+    async def _sendfile_packet(self, file, offset, count):
+        """Write a packet of count bytes of the file from offset by loop.sendfile()."""
+        self._write_bytes(_pack_int24(count) + bytes([self._next_seq_id]))
+        loop = asyncio.get_running_loop()
+        try:
+            sent = await self._wait(
+                loop.sendfile(self._sock, file, offset, count), self._write_timeout
+            )
+        except (OSError, RuntimeError, asyncio.TimeoutError) as e:
+            self._force_close()
+            raise err.OperationalError(
+                CR.CR_SERVER_GONE_ERROR, f"MySQL server has gone away ({e!r})"
+            )
+        except BaseException:
+            self._force_close()
+            raise
+        if sent < count:
+            self._force_close()
+            raise err.OperationalError(
+                CR.CR_SERVER_LOST, "The file was truncated while it was sent"
+            )
+        self._next_seq_id = (self._next_seq_id + 1) % 256
+
+
+class AsyncCursor(Cursor):
+    """
+    Cursor of :py:class:`AsyncConnection`.
+
+    :py:meth:`execute`, :py:meth:`executemany` and :py:meth:`callproc` are
+    coroutines. Results are buffered, so fetch methods are not.
+    """
+
+    async def execute(self, query, args=None):
+        """Execute a query.
+
+        See :py:meth:`pymysql.cursors.Cursor.execute`.
+        """
+        while self.nextset():
+            pass
+
+        query = self.mogrify(query, args)
+
+        result = await self._query(query)
+        self._executed = query
+        return result
+
+    async def executemany(self, query, args):
+        """Run several data against one query.
+
+        See :py:meth:`pymysql.cursors.Cursor.executemany`.
+        """
+        if not args:
+            return
+
+        statements = self._bulk_insert_statements(query, args)
+        batched = False
+        if statements is None:
+            statements = self._batch_statements(query, args)
+            batched = statements is not None
+        if statements is None:
+            statements = (self.mogrify(query, arg) for arg in args)
+        rows = 0
+        for sql in statements:
+            rows += await self.execute(sql)
+            while batched and self.nextset():
+                rows += self.rowcount
+        self.rowcount = rows
+        return rows
+
+    async def load_data(self, table, rows, columns=None, replace=False):
+        """Load rows into a table by LOAD DATA LOCAL INFILE.
+
+        See :py:meth:`pymysql.cursors.Cursor.load_data`.
+        """
+        query = self._load_data_query(table, rows, columns, replace)
+        try:
+            return await self.execute(query)
+        finally:
+            self._get_db()._load_data_source = None
+
+    async def callproc(self, procname, args=()):
+        """Execute stored procedure procname with args.
+
+        See :py:meth:`pymysql.cursors.Cursor.callproc`.
+        """
+        procname_escaped = _backquote_escape(procname)
+        conn = self._get_db()
+
+        if args:
+            fmt = f"@`_{procname_escaped}_%d`=%s"
+            await self._query(
+                "SET %s"
+                % ",".join(
+                    fmt % (index, conn.escape(arg)) for index, arg in enumerate(args)
+                )
+            )
+            self.nextset()
+
+        q = "CALL `{}`({})".format(
+            procname_escaped,
+            ",".join([f"@`_{procname_escaped}_{i}`" for i in range(len(args))]),
+        )
+        await self._query(q)
+        self._executed = q
+        return args
+
+    async def _query(self, q):
+        conn = self._get_db()
+        self._clear_result()
+        await conn.query(q)
+        self._do_get_result()
+        return self.rowcount
+
+
+class AsyncDictCursor(DictCursorMixin, AsyncCursor):
+    """An async cursor which returns results as a dictionary"""
+
+
+class AsyncPipeline(Pipeline):
+    """
+    :py:class:`~pymysql.pipeline.Pipeline` of :py:class:`AsyncConnection`.
+
+    :py:meth:`run` is a coroutine. Use ``async with`` instead of ``with``.
+    """
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' for AsyncPipeline")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, *exc_info):
+        del exc_info
+        if exc_type is None:
+            await self.run()
+        else:
+            self._queue.clear()
+
+    async def run(self):
+        """
+        Send the queries and read their results.
+
+        See :py:meth:`pymysql.pipeline.Pipeline.run`.
+        """
+        queue = self._queue
+        self._queue = []
+        conn = self.connection
+        # The transport buffers the queries, and results are received while
+        # they are sent. So all queries are sent at once.
+        for _, _, command, data in queue:
+            conn._execute_command(command, data)
+        await conn._drain()
+        error = None
+        try:
+            for cursor, query, _, _ in queue:
+                conn._next_seq_id = 1
+                try:
+                    await conn._receive_response()
+                    self._read_result(cursor, query)
+                except err.MySQLError as e:
+                    if conn._sock is None:
+                        raise
+                    if error is None:
+                        error = e
+        except BaseException:
+            # The responses of the remaining queries can't be read any more.
+            conn._force_close()
+            raise
+        if error is not None:
+            raise error
+        return [item[0] for item in queue]
+
+
+async def connect(**kwargs):
+    """
+    Connect to a MySQL server and return :py:class:`AsyncConnection`.
+
+    Arguments are same to :py:class:`~pymysql.connections.Connection`.
+    """
+    conn = AsyncConnection(**kwargs)
+    if not kwargs.get("defer_connect"):
+        await conn.connect()
+    return conn
@@ -35,9 +35,11 @@ class Charsets:
     def __init__(self):
         self._by_id = {}
         self._by_name = {}
+        self._by_collation = {}
 
     def add(self, c):
         self._by_id[c.id] = c
+        self._by_collation[c.collation] = c
         if c.is_default:
             self._by_name[c.name] = c
 
@@ -50,10 +52,14 @@ class Charsets:
             name = "utf8mb4"
         return self._by_name.get(name)
 
+    def by_collation(self, collation):
+        return self._by_collation.get(collation.lower())
+
 
 _charsets = Charsets()
 charset_by_name = _charsets.by_name
 charset_by_id = _charsets.by_id
+charset_by_collation = _charsets.by_collation
 
 """
 TODO: update this script.
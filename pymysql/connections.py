@@ -2,26 +2,49 @@
 # http://dev.mysql.com/doc/internals/en/client-server-protocol.html
 # Error codes:
 # https://dev.mysql.com/doc/refman/5.5/en/error-handling.html
+import array
+import collections
 import contextlib
+import datetime
 import errno
+import io
 import os
 import socket
+import stat
 import struct
 import sys
+import time
 import traceback
 import warnings
-
-from . import VERSION_STRING, _auth, converters, err
-from .charset import charset_by_id, charset_by_name
-from .constants import CLIENT, COMMAND, CR, ER, FIELD_TYPE, SERVER_STATUS
+from decimal import Decimal
+
+from . import VERSION_STRING, _auth, _compress, _socketio, converters, err
+from .charset import charset_by_collation, charset_by_id, charset_by_name
+from .constants import (
+    CLIENT,
+    COMMAND,
+    CR,
+    ER,
+    FIELD_TYPE,
+    FLAG,
+    SERVER_STATUS,
+    SESSION_TRACK,
+)
 from .cursors import Cursor
 from .optionfile import Parser
+from .pipeline import Pipeline
 from .protocol import (
+    NULL_COLUMN,
+    UNSIGNED_CHAR_COLUMN,
+    UNSIGNED_INT24_COLUMN,
+    UNSIGNED_SHORT_COLUMN,
     EOFPacketWrapper,
     FieldDescriptorPacket,
     LoadLocalPacketWrapper,
     MysqlPacket,
     OKPacketWrapper,
+    _has_long_data,
+    _is_long_data,
     dump_packet,
 )
 
@@ -64,6 +87,8 @@ DEFAULT_CHARSET = "utf8mb4"
 
 MAX_PACKET_LEN = 2**24 - 1
 
+_PACKET_HEADER = struct.Struct("<HBB")
+
 
 def _pack_int24(n):
     return struct.pack("<I", n)[:3]
@@ -89,6 +114,336 @@ def _lenenc_int(i):
         )
 
 
+# https://dev.mysql.com/doc/dev/mysql-server/latest/page_protocol_binary_resultset.html#sect_protocol_binary_resultset_row_value
+def _pack_binary_datetime(obj):
+    if obj.microsecond:
+        return struct.pack(
+            "<BHBBBBBI",
+            11,
+            obj.year,
+            obj.month,
+            obj.day,
+            obj.hour,
+            obj.minute,
+            obj.second,
+            obj.microsecond,
+        )
+    return struct.pack(
+        "<BHBBBBB", 7, obj.year, obj.month, obj.day, obj.hour, obj.minute, obj.second
+    )
+
+
+def _pack_binary_time(negative, days, hours, minutes, seconds, microseconds):
+    if microseconds:
+        return struct.pack(
+            "<BBIBBBI", 12, negative, days, hours, minutes, seconds, microseconds
+        )
+    return struct.pack("<BBIBBB", 8, negative, days, hours, minutes, seconds)
+
+
+def _pack_binary_timedelta(obj):
+    negative = obj.days < 0
+    if negative:
+        obj = -obj
+    minutes, seconds = divmod(obj.seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return _pack_binary_time(
+        negative, obj.days, hours, minutes, seconds, obj.microseconds
+    )
+
+
+def _pack_binary_param(value, encoding):
+    """Encode a parameter of COM_STMT_EXECUTE.
+
+    Returns a tuple of (type, flags, data).
+    """
+    if isinstance(value, bool):
+        return FIELD_TYPE.TINY, 0, struct.pack("<b", value)
+    if isinstance(value, int):
+        if -(1 << 63) <= value < (1 << 63):
+            return FIELD_TYPE.LONGLONG, 0, struct.pack("<q", value)
+        if 0 <= value < (1 << 64):
+            return FIELD_TYPE.LONGLONG, 0x80, struct.pack("<Q", value)
+        data = str(value).encode("ascii")
+        return FIELD_TYPE.NEWDECIMAL, 0, _lenenc_int(len(data)) + data
+    if isinstance(value, float):
+        converters.escape_float(value)  # reject inf and nan
+        return FIELD_TYPE.DOUBLE, 0, struct.pack("<d", value)
+    if isinstance(value, str):
+        data = value.encode(encoding, "surrogateescape")
+        return FIELD_TYPE.VAR_STRING, 0, _lenenc_int(len(data)) + data
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return FIELD_TYPE.BLOB, 0, _lenenc_int(len(value)) + bytes(value)
+    if isinstance(value, Decimal):
+        data = converters.Decimal2Literal(value, None).encode("ascii")
+        return FIELD_TYPE.NEWDECIMAL, 0, _lenenc_int(len(data)) + data
+    if isinstance(value, datetime.datetime):
+        return FIELD_TYPE.DATETIME, 0, _pack_binary_datetime(value)
+    if isinstance(value, datetime.date):
+        return (
+            FIELD_TYPE.DATE,
+            0,
+            struct.pack("<BHBB", 4, value.year, value.month, value.day),
+        )
+    if isinstance(value, datetime.timedelta):
+        return FIELD_TYPE.TIME, 0, _pack_binary_timedelta(value)
+    if isinstance(value, datetime.time):
+        return (
+            FIELD_TYPE.TIME,
+            0,
+            _pack_binary_time(
+                False, 0, value.hour, value.minute, value.second, value.microsecond
+            ),
+        )
+    if isinstance(value, time.struct_time):
+        return (
+            FIELD_TYPE.DATETIME,
+            0,
+            _pack_binary_datetime(datetime.datetime(*value[:6])),
+        )
+    raise TypeError(f"{type(value).__name__!r} can not be used as a parameter")
+
+
+def _pack_binary_params(args, encoding):
+    """Build the parameter block of COM_STMT_EXECUTE.
+
+    The block consists of the NULL bitmap, new-params-bound flag,
+    parameter types and the parameter values.
+    """
+    null_bitmap = bytearray((len(args) + 7) // 8)
+    types = bytearray()
+    values = bytearray()
+    for i, arg in enumerate(args):
+        if arg is None:
+            null_bitmap[i >> 3] |= 1 << (i & 7)
+            types += b"\x06\x00"  # FIELD_TYPE.NULL
+            continue
+        try:
+            type_code, flags, data = _pack_binary_param(arg, encoding)
+        except TypeError:
+            if not _is_long_data(arg):
+                raise
+            # The value is sent by COM_STMT_SEND_LONG_DATA before COM_STMT_EXECUTE.
+            type_code, flags, data = FIELD_TYPE.BLOB, 0, b""
+        types.append(type_code)
+        types.append(flags)
+        values += data
+    return bytes(null_bitmap) + b"\x01" + bytes(types) + bytes(values)
+
+
+def _check_param_count(statement, args):
+    if len(args) != statement.param_count:
+        raise err.ProgrammingError(
+            "Incorrect number of parameters: expected %d, got %d"
+            % (statement.param_count, len(args))
+        )
+
+
+def _long_data_chunks(value, size, encoding):
+    """Yield the data of a streamed parameter in chunks of at most size bytes."""
+    if hasattr(value, "read"):
+        chunks = _read_chunks(value, size)
+    else:
+        chunks = value
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode(encoding, "surrogateescape")
+        elif not isinstance(chunk, (bytes, bytearray, memoryview)):
+            raise TypeError(
+                f"{type(chunk).__name__!r} can not be streamed as a parameter"
+            )
+        if len(chunk) <= size:
+            yield chunk
+            continue
+        view = memoryview(chunk).cast("B")
+        for i in range(0, len(view), size):
+            yield view[i : i + size]
+
+
+def _read_chunks(file, size):
+    while True:
+        chunk = file.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _merge_param_types(types, row_types):
+    """Return the parameter types of both rows, or None if they differ.
+
+    The types are (type, flags) or None for NULL.
+    """
+    merged = []
+    for t, r in zip(types, row_types):
+        if t is None:
+            merged.append(r)
+        elif r is None or r == t:
+            merged.append(t)
+        else:
+            return None
+    return merged
+
+
+def _read_binary_datetime(packet):
+    length = packet.read_uint8()
+    year = month = day = hour = minute = second = microsecond = 0
+    if length >= 4:
+        year, month, day = packet.read_struct("<HBB")
+    if length >= 7:
+        hour, minute, second = packet.read_struct("<BBB")
+    if length >= 11:
+        microsecond = packet.read_uint32()
+    try:
+        return datetime.datetime(year, month, day, hour, minute, second, microsecond)
+    except ValueError:
+        # Zero or otherwise illegal values are returned as str like the text protocol.
+        if microsecond:
+            return "%04d-%02d-%02d %02d:%02d:%02d.%06d" % (
+                year,
+                month,
+                day,
+                hour,
+                minute,
+                second,
+                microsecond,
+            )
+        return "%04d-%02d-%02d %02d:%02d:%02d" % (
+            year,
+            month,
+            day,
+            hour,
+            minute,
+            second,
+        )
+
+
+def _read_binary_date(packet):
+    length = packet.read_uint8()
+    year = month = day = 0
+    if length >= 4:
+        year, month, day = packet.read_struct("<HBB")
+        if length > 4:
+            packet.advance(length - 4)
+    try:
+        return datetime.date(year, month, day)
+    except ValueError:
+        return "%04d-%02d-%02d" % (year, month, day)
+
+
+def _read_binary_time(packet):
+    length = packet.read_uint8()
+    if not length:
+        return datetime.timedelta()
+    negative, days, hours, minutes, seconds = packet.read_struct("<BIBBB")
+    microseconds = packet.read_uint32() if length >= 12 else 0
+    delta = datetime.timedelta(
+        days=days,
+        hours=hours,
+        minutes=minutes,
+        seconds=seconds,
+        microseconds=microseconds,
+    )
+    if negative:
+        return -delta
+    return delta
+
+
+def _binary_value_to_text(value):
+    """Format a binary protocol value like the text protocol would send it."""
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(" ")
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return converters.escape_timedelta(value)[1:-1]
+    return str(value)
+
+
+_BINARY_INTEGER_READERS = {
+    FIELD_TYPE.TINY: (MysqlPacket.read_int8, MysqlPacket.read_uint8),
+    FIELD_TYPE.SHORT: (MysqlPacket.read_int16, MysqlPacket.read_uint16),
+    FIELD_TYPE.YEAR: (MysqlPacket.read_int16, MysqlPacket.read_uint16),
+    FIELD_TYPE.INT24: (MysqlPacket.read_int32, MysqlPacket.read_uint32),
+    FIELD_TYPE.LONG: (MysqlPacket.read_int32, MysqlPacket.read_uint32),
+    FIELD_TYPE.LONGLONG: (MysqlPacket.read_int64, MysqlPacket.read_uint64),
+}
+
+_BINARY_VALUE_READERS = {
+    FIELD_TYPE.FLOAT: MysqlPacket.read_float,
+    FIELD_TYPE.DOUBLE: MysqlPacket.read_double,
+    FIELD_TYPE.DATE: _read_binary_date,
+    FIELD_TYPE.NEWDATE: _read_binary_date,
+    FIELD_TYPE.DATETIME: _read_binary_datetime,
+    FIELD_TYPE.TIMESTAMP: _read_binary_datetime,
+    FIELD_TYPE.TIME: _read_binary_time,
+}
+
+
+def _binary_column_reader(field, encoding, converter):
+    """Return a function reading the value of the column from a binary row."""
+    type_code = field.type_code
+    if type_code in _BINARY_INTEGER_READERS:
+        signed, unsigned = _BINARY_INTEGER_READERS[type_code]
+        read_value = unsigned if field.flags & FLAG.UNSIGNED else signed
+    elif type_code in _BINARY_VALUE_READERS:
+        read_value = _BINARY_VALUE_READERS[type_code]
+    else:
+        # Other types are sent as length coded string, like the text protocol.
+        def read_string(packet):
+            data = packet.read_length_coded_string()
+            if encoding is not None:
+                data = data.decode(encoding)
+            if converter is not None:
+                data = converter(data)
+            return data
+
+        return read_string
+
+    # Values are decoded already. Custom converters get the text representation.
+    if converter is None or converter is converters.decoders.get(type_code):
+        return read_value
+
+    def read_converted(packet):
+        return converter(_binary_value_to_text(read_value(packet)))
+
+    return read_converted
+
+
+#: array.array typecodes (signed, unsigned) and the default converter of
+#: the numeric types stored in array.array by columnar fetch.
+_COLUMN_ARRAY_TYPES = {
+    FIELD_TYPE.TINY: ("b", "B", int),
+    FIELD_TYPE.SHORT: ("h", "H", int),
+    FIELD_TYPE.INT24: ("l", "L", int),
+    FIELD_TYPE.LONG: ("l", "L", int),
+    FIELD_TYPE.LONGLONG: ("q", "Q", int),
+    FIELD_TYPE.YEAR: ("H", "H", int),
+    FIELD_TYPE.FLOAT: ("d", "d", float),
+    FIELD_TYPE.DOUBLE: ("d", "d", float),
+}
+
+
+def _new_column(field, converter):
+    """Return an empty column for the field.
+
+    Numbers converted by the default converter are stored in array.array.
+    Other values are stored in list.
+    """
+    array_type = _COLUMN_ARRAY_TYPES.get(field.type_code)
+    if array_type is None or converter is not array_type[2]:
+        return []
+    signed, unsigned, _ = array_type
+    return array.array(unsigned if field.flags & FLAG.UNSIGNED else signed)
+
+
+def _append_null(columns, i):
+    """Append None to the i-th column. array.array is converted to list."""
+    column = columns[i]
+    if type(column) is not list:
+        columns[i] = column = column.tolist()
+    column.append(None)
+
+
 class Connection:
     """
     Representation of a socket with a mysql server.
@@ -114,6 +469,10 @@ class Connection:
         (default: None - no timeout)
     :param str charset: Charset to use.
     :param str collation: Collation name to use.
+    :param force_set_names: Send "SET NAMES" on connect even when the collation
+        is set by the handshake. Use it for servers ignoring the collation in
+        the handshake (e.g. MySQL with skip-character-set-client-handshake).
+        (default: False)
     :param sql_mode: Default SQL_MODE to use.
     :param read_default_file:
         Specifies  my.cnf file to read these parameters from under the [client] section.
@@ -145,7 +504,10 @@ class Connection:
     :param autocommit: Autocommit mode. None means use server default. (default: False)
     :param local_infile: Boolean to enable the use of LOAD DATA LOCAL command. (default: False)
     :param max_allowed_packet: Max size of packet sent to server in bytes. (default: 16MB)
-        Only used to limit size of "LOAD LOCAL INFILE" data packet smaller than default (16KB).
+        Only used to limit size of "LOAD LOCAL INFILE" data packet.
+    :param local_infile_packet_size: Size of "LOAD LOCAL INFILE" data packets in bytes.
+        It is limited by max_allowed_packet and 16MB. Larger packets take fewer
+        system calls. (default: 1MB)
     :param defer_connect: Don't explicitly connect on construction - wait for connect call.
         (default: False)
     :param auth_plugin_map: A dict of plugin names to a class that processes that plugin.
@@ -155,7 +517,21 @@ class Connection:
         (if no authenticate method) for returning a string from the user. (experimental)
     :param server_public_key: SHA256 authentication plugin public key value. (default: None)
     :param binary_prefix: Add _binary prefix on bytes and bytearray. (default: False)
-    :param compress: Not supported.
+    :param statement_cache_size: Max number of prepared statements kept by
+        :py:class:`~pymysql.cursors.PreparedCursor` on the connection.
+        0 disables the cache. (default: 100)
+    :param compress: Compression algorithm of the protocol, "zlib" or "zstd".
+        True means "zlib". The connection is not compressed when the server doesn't
+        support the algorithm. "zstd" requires the zstandard package on Python < 3.14.
+        (default: None - no compression)
+    :param zstd_compression_level: Compression level used when compress="zstd".
+        (default: 3)
+    :param compress_threshold: Packets smaller than this are sent uncompressed
+        when compression is used. (default: 50)
+    :param pipeline_init: Send the queries initializing the session (SET NAMES,
+        sql_mode, init_command and autocommit) without waiting for the results
+        of the previous ones. They take one round trip instead of up to four.
+        (default: False)
     :param named_pipe: Not supported.
     :param db: **DEPRECATED** Alias for database.
     :param passwd: **DEPRECATED** Alias for password.
@@ -169,6 +545,17 @@ class Connection:
     _auth_plugin_name = ""
     _closed = False
     _secure = False
+    _deprecate_eof = False
+    _compressed = None
+    _sock_timeout = None
+    _reset_connection_supported = True
+    _session_track = False
+    _stmt_bulk = False
+    #: Max bytes of a streamed parameter sent in a COM_STMT_SEND_LONG_DATA packet.
+    long_data_packet_size = 1024 * 1024
+    #: (file name, iterator of chunks) sent instead of the file by
+    #: LOAD DATA LOCAL INFILE. See Cursor.load_data().
+    _load_data_source = None
 
     def __init__(
         self,
@@ -181,6 +568,7 @@ class Connection:
         port=0,
         charset="",
         collation=None,
+        force_set_names=False,
         sql_mode=None,
         read_default_file=None,
         conv=None,
@@ -193,6 +581,7 @@ class Connection:
         autocommit=False,
         local_infile=False,
         max_allowed_packet=16 * 1024 * 1024,
+        local_infile_packet_size=1024 * 1024,
         defer_connect=False,
         auth_plugin_map=None,
         read_timeout=None,
@@ -209,7 +598,11 @@ class Connection:
         ssl_key_password=None,
         ssl_verify_cert=None,
         ssl_verify_identity=None,
-        compress=None,  # not supported
+        statement_cache_size=100,
+        compress=None,
+        zstd_compression_level=3,
+        compress_threshold=50,
+        pipeline_init=False,
         named_pipe=None,  # not supported
         passwd=None,  # deprecated
         db=None,  # deprecated
@@ -223,10 +616,20 @@ class Connection:
             )
             password = passwd
 
-        if compress or named_pipe:
-            raise NotImplementedError(
-                "compress and named_pipe arguments are not supported"
-            )
+        if named_pipe:
+            raise NotImplementedError("named_pipe argument is not supported")
+
+        if compress is True:
+            compress = "zlib"
+        elif not compress:
+            compress = None
+        elif compress == "zstd":
+            _compress._init_zstd()
+        elif compress != "zlib":
+            raise ValueError(f"Unknown compression algorithm: {compress!r}")
+        self.compress = compress
+        self._zstd_compression_level = zstd_compression_level
+        self._compress_threshold = compress_threshold
 
         self._local_infile = bool(local_infile)
         if self._local_infile:
@@ -323,6 +726,7 @@ class Connection:
 
         self.charset = charset or DEFAULT_CHARSET
         self.collation = collation
+        self._force_set_names = force_set_names
         self.use_unicode = use_unicode
 
         self.encoding = charset_by_name(self.charset).encoding
@@ -350,10 +754,23 @@ class Connection:
         self.decoders = {k: v for (k, v) in conv.items() if type(k) is int}
         self.sql_mode = sql_mode
         self.init_command = init_command
+        self._pipeline_init = pipeline_init
         self.max_allowed_packet = max_allowed_packet
+        self.local_infile_packet_size = local_infile_packet_size
         self._auth_plugin_map = auth_plugin_map or {}
         self._binary_prefix = binary_prefix
         self.server_public_key = server_public_key
+        #: :py:class:`StatementCache` of the prepared statements.
+        self.statement_cache = StatementCache(statement_cache_size)
+        #: Current database. It is tracked when the server supports session
+        #: tracking, and updated by :py:meth:`select_db` otherwise.
+        self.current_db = None
+        #: Dict of the system variables changed in the session, reported by
+        #: the server (see session_track_system_variables of the server).
+        self.session_variables = {}
+        #: Transaction state reported by the server when
+        #: session_track_transaction_info is STATE or CHARACTERISTICS.
+        self.transaction_state = None
 
         self._connect_attrs = {
             "_client_name": "pymysql",
@@ -431,6 +848,8 @@ class Connection:
         if self._sock is None:
             return
         send_data = struct.pack("<iB", 1, COMMAND.COM_QUIT)
+        if self._compressed is not None:
+            self._compressed.sequence_id = 0
         try:
             with contextlib.suppress(Exception):
                 self._write_bytes(send_data)
@@ -453,6 +872,7 @@ class Connection:
                 pass
         self._sock = None
         self._rfile = None
+        self._compressed = None
 
     __del__ = _force_close
 
@@ -472,10 +892,30 @@ class Connection:
                 CR.CR_COMMANDS_OUT_OF_SYNC,
                 "Command Out of Sync",
             )
-        ok = OKPacketWrapper(pkt)
+        ok = OKPacketWrapper(pkt, self._session_track)
         self.server_status = ok.server_status
+        if ok.session_state_changes:
+            self._track_session_state(ok.session_state_changes)
         return ok
 
+    def _track_session_state(self, changes):
+        encoding = self.encoding
+        for type_, value in changes:
+            if type_ == SESSION_TRACK.SYSTEM_VARIABLES:
+                name, value = value
+                self.session_variables[name.decode(encoding)] = value.decode(encoding)
+            elif type_ == SESSION_TRACK.SCHEMA:
+                self.current_db = value.decode(encoding) or None
+            elif type_ == SESSION_TRACK.TRANSACTION_STATE:
+                self.transaction_state = value.decode(encoding)
+
+    def _reset_session_tracking(self, db):
+        if isinstance(db, bytes):
+            db = db.decode(self.encoding)
+        self.current_db = db
+        self.session_variables = {}
+        self.transaction_state = None
+
     def _send_autocommit_mode(self):
         """Set whether or not to commit after every execute()."""
         self._execute_command(
@@ -523,6 +963,7 @@ class Connection:
         """
         self._execute_command(COMMAND.COM_INIT_DB, db)
         self._read_ok_packet()
+        self.current_db = db
 
     def escape(self, obj, mapping=None):
         """Escape whatever value is passed.
@@ -545,6 +986,52 @@ class Connection:
         """
         return self.escape(obj, self.encoders)
 
+    def _literal_encoder(self, type_, binary_prefix=None):
+        """Return a function escaping values of type_ like :py:meth:`literal`.
+
+        The encoder is looked up once for many values of the same type, like
+        the columns of :py:meth:`Cursor.executemany() <pymysql.cursors.Cursor.executemany>`.
+        The values of a subclass of type_ must not be passed.
+        """
+        if issubclass(type_, str):
+            if self.server_status & SERVER_STATUS.SERVER_STATUS_NO_BACKSLASH_ESCAPES:
+                return lambda v: "'" + v.replace("'", "''") + "'"
+            table = converters._escape_table
+            return lambda v: "'" + v.translate(table) + "'"
+        if issubclass(type_, (bytes, bytearray)):
+            if binary_prefix is None:
+                binary_prefix = self._binary_prefix
+            quote_bytes = self._quote_bytes
+            if binary_prefix:
+                return lambda v: "_binary" + quote_bytes(v)
+            return quote_bytes
+        mapping = self.encoders
+        encoder = mapping.get(type_) or mapping.get(str)
+        if encoder is None:
+            # Raise the error of literal() for each value.
+            return self.literal
+        if encoder in (converters.escape_dict, converters.escape_sequence):
+            charset = self.charset
+            return lambda v: encoder(v, charset, mapping)
+        if encoder is converters.escape_int:
+            return str
+        if encoder is converters.escape_datetime and type_ is datetime.datetime:
+            # isoformat() is faster and the same as escape_datetime() unless
+            # the datetime is aware.
+            return lambda v: (
+                "'" + v.isoformat(" ") + "'" if v.tzinfo is None else encoder(v)
+            )
+        if encoder in (
+            converters.escape_float,
+            converters.escape_str,
+            converters.escape_None,
+            converters.escape_date,
+            converters.escape_datetime,
+        ):
+            # They don't use the mapping.
+            return encoder
+        return lambda v: encoder(v, mapping)
+
     def escape_string(self, s):
         if self.server_status & SERVER_STATUS.SERVER_STATUS_NO_BACKSLASH_ESCAPES:
             return s.replace("'", "''")
@@ -569,6 +1056,16 @@ class Connection:
             return cursor(self)
         return self.cursorclass(self)
 
+    def pipeline(self, cursor=None):
+        """
+        Create a :py:class:`~pymysql.pipeline.Pipeline` to send queries at once.
+
+        :param cursor: The type of cursors having the results.
+            None means the cursorclass of the connection.
+            Unbuffered cursors are not supported.
+        """
+        return Pipeline(self, cursor)
+
     # The following methods are INTERNAL USE ONLY (called from Cursor)
     def query(self, sql, unbuffered=False):
         # if DEBUG:
@@ -580,9 +1077,243 @@ class Connection:
         return self._affected_rows
 
     def next_result(self, unbuffered=False):
-        self._affected_rows = self._read_query_result(unbuffered=unbuffered)
+        # Following results of a prepared statement are sent in binary protocol too.
+        binary = isinstance(self._result, MySQLBinaryResult)
+        self._affected_rows = self._read_query_result(
+            unbuffered=unbuffered, binary=binary
+        )
+        return self._affected_rows
+
+    def prepare(self, query):
+        """
+        Prepare a statement on the server.
+
+        Most applications should use :py:class:`~pymysql.cursors.PreparedCursor`
+        instead of calling this method directly.
+
+        :param query: Query to prepare. Use ``?`` as placeholders of parameters.
+        :type query: str
+
+        :return: The prepared statement.
+        :rtype: PreparedStatement
+        """
+        if isinstance(query, str):
+            query = query.encode(self.encoding, "surrogateescape")
+        self._execute_command(COMMAND.COM_STMT_PREPARE, query)
+
+        # https://dev.mysql.com/doc/dev/mysql-server/latest/page_protocol_com_stmt_prepare.html#sect_protocol_com_stmt_prepare_response
+        packet = self._read_packet()
+        if packet.read_uint8() != 0:
+            raise err.OperationalError(
+                CR.CR_COMMANDS_OUT_OF_SYNC, "Command Out of Sync"
+            )
+        statement_id, field_count, param_count = packet.read_struct("<IHH")
+
+        params = []
+        if param_count:
+            for i in range(param_count):
+                params.append(self._read_packet(FieldDescriptorPacket))
+            if not self._deprecate_eof:
+                eof_packet = self._read_packet()
+                assert eof_packet.is_eof_packet(), "Protocol error, expecting EOF"
+        fields = []
+        if field_count:
+            for i in range(field_count):
+                fields.append(self._read_packet(FieldDescriptorPacket))
+            if not self._deprecate_eof:
+                eof_packet = self._read_packet()
+                assert eof_packet.is_eof_packet(), "Protocol error, expecting EOF"
+        return PreparedStatement(self, statement_id, params, fields)
+
+    def _execute_prepared(self, statement, args, unbuffered=False):
+        """Execute a prepared statement with args (a sequence of parameters)."""
+        data = self._stmt_execute_data(statement, args)
+        self._send_long_data(statement, args)
+        self._execute_command(COMMAND.COM_STMT_EXECUTE, data)
+        self._affected_rows = self._read_query_result(
+            unbuffered=unbuffered, binary=True
+        )
         return self._affected_rows
 
+    def _stmt_execute_data(self, statement, args):
+        """Return the payload of COM_STMT_EXECUTE."""
+        _check_param_count(statement, args)
+        # https://dev.mysql.com/doc/dev/mysql-server/latest/page_protocol_com_stmt_execute.html
+        # flags = CURSOR_TYPE_NO_CURSOR, iteration_count = 1
+        data = struct.pack("<IBI", statement.statement_id, 0, 1)
+        if args:
+            data += _pack_binary_params(args, self.encoding)
+        return data
+
+    def _send_long_data(self, statement, args):
+        """Stream the file-like and iterable parameters by COM_STMT_SEND_LONG_DATA.
+
+        The server keeps the data until the next COM_STMT_EXECUTE of the
+        statement, and sends no response. When reading a parameter fails,
+        the data sent so far is discarded by COM_STMT_RESET.
+        """
+        # The payload has the statement id and the parameter id before the data.
+        size = max(
+            1,
+            min(
+                self.long_data_packet_size,
+                self.max_allowed_packet - 7,
+                MAX_PACKET_LEN - 8,
+            ),
+        )
+        try:
+            for i, arg in enumerate(args):
+                if not _is_long_data(arg):
+                    continue
+                header = struct.pack("<IH", statement.statement_id, i)
+                sent = False
+                for chunk in _long_data_chunks(arg, size, self.encoding):
+                    self._execute_command(
+                        COMMAND.COM_STMT_SEND_LONG_DATA, header + chunk
+                    )
+                    sent = True
+                if not sent:
+                    # An empty value is bound by a packet without data.
+                    self._execute_command(COMMAND.COM_STMT_SEND_LONG_DATA, header)
+        except Exception:
+            if self._sock is not None:
+                self._execute_command(
+                    COMMAND.COM_STMT_RESET, struct.pack("<I", statement.statement_id)
+                )
+                self._read_ok_packet()
+            raise
+
+    def _execute_prepared_many(self, statement, rows):
+        """Execute a prepared statement with each parameters in rows.
+
+        Return the total number of affected rows.
+
+        MariaDB executes many rows by a COM_STMT_BULK_EXECUTE. For other
+        servers, COM_STMT_EXECUTE are sent without waiting for the results of
+        the previous ones. No more rows are sent after an error is received.
+        """
+        if self._stmt_bulk and not statement.fields:
+            return self._stmt_bulk_execute(statement, rows)
+
+        max_pending = Pipeline.max_pending_bytes
+        pending = collections.deque()
+        pending_bytes = 0
+        total = 0
+        error = None
+
+        def read_result():
+            nonlocal pending_bytes, total, error
+            pending_bytes -= pending.popleft()
+            # Responses of the pipelined commands start from sequence id 1.
+            self._next_seq_id = 1
+            try:
+                total += self._read_query_result(binary=True)
+            except err.MySQLError as e:
+                if self._sock is None:
+                    raise
+                if error is None:
+                    error = e
+            except BaseException:
+                # The responses of the remaining rows can't be read any more.
+                self._force_close()
+                raise
+
+        rows = iter(rows)
+        try:
+            while error is None:
+                try:
+                    params = next(rows)
+                except StopIteration:
+                    break
+                data = self._stmt_execute_data(statement, params)
+                if _has_long_data(params):
+                    # The response of COM_STMT_RESET discarding the streamed
+                    # data on an error can't be read after pending results.
+                    while pending and error is None:
+                        read_result()
+                    if error is not None:
+                        break
+                    self._send_long_data(statement, params)
+                self._execute_command(COMMAND.COM_STMT_EXECUTE, data)
+                pending.append(len(data))
+                pending_bytes += len(data)
+                while pending_bytes >= max_pending and error is None:
+                    read_result()
+        except Exception as e:
+            if self._sock is None:
+                raise
+            error = e
+        while pending:
+            read_result()
+        if error is not None:
+            raise error
+        self._affected_rows = total
+        return total
+
+    def _stmt_bulk_execute(self, statement, rows):
+        """Execute a prepared statement with rows by COM_STMT_BULK_EXECUTE.
+
+        The parameter types are sent once for many rows, so a row of which
+        types differ from the previous rows starts a new command.
+        """
+        # https://mariadb.com/kb/en/com_stmt_bulk_execute/
+        # flags = STMT_BULK_FLAG_SEND_TYPES_TO_SERVER
+        header = struct.pack("<IH", statement.statement_id, 128)
+        max_size = self.max_allowed_packet - len(header) - 2 * statement.param_count
+        encoding = self.encoding
+        types = None
+        values = bytearray()
+        total = 0
+        for params in rows:
+            _check_param_count(statement, params)
+            row_types = []
+            row = bytearray()
+            for value in params:
+                if value is None:
+                    row_types.append(None)
+                    row += b"\x01"  # STMT_INDICATOR_NULL
+                    continue
+                try:
+                    type_code, flags, data = _pack_binary_param(value, encoding)
+                except TypeError:
+                    if not _is_long_data(value):
+                        raise
+                    row = None
+                    break
+                row_types.append((type_code, flags))
+                row += b"\x00"  # STMT_INDICATOR_NONE
+                row += data
+            if row is None:
+                # Streamed parameters can't be bulk executed.
+                if types is not None:
+                    total += self._send_bulk(header, types, values)
+                    types = None
+                    values = bytearray()
+                total += self._execute_prepared(statement, params)
+                continue
+            if types is not None:
+                merged = _merge_param_types(types, row_types)
+                if merged is None or len(values) + len(row) > max_size:
+                    total += self._send_bulk(header, types, values)
+                    values = bytearray()
+                else:
+                    row_types = merged
+            types = row_types
+            values += row
+        if types is not None:
+            total += self._send_bulk(header, types, values)
+        self._affected_rows = total
+        return total
+
+    def _send_bulk(self, header, types, values):
+        data = bytearray(header)
+        for t in types:
+            # Columns of only NULL are sent as FIELD_TYPE.NULL.
+            data += bytes(t) if t is not None else b"\x06\x00"
+        data += values
+        self._execute_command(COMMAND.COM_STMT_BULK_EXECUTE, data)
+        return self._read_query_result(binary=True)
+
     def affected_rows(self):
         return self._affected_rows
 
@@ -625,6 +1356,202 @@ class Connection:
             else:
                 raise
 
+    def reset(self):
+        """
+        Reset the session state of the connection.
+
+        The transaction is rolled back, and temporary tables, user variables
+        and prepared statements are dropped. Then charset, collation, sql_mode
+        and autocommit of the connection are set again and init_command is
+        executed.
+
+        COM_RESET_CONNECTION and the query setting them are sent at once, so
+        it takes one round trip when init_command is not used.
+        For servers not supporting COM_RESET_CONNECTION (MySQL < 5.7.3 and
+        MariaDB < 10.2.4), the connection is authenticated again by
+        COM_CHANGE_USER.
+        """
+        query = self._session_state_query()
+        self._reset_session_tracking(self.current_db)
+        if self._reset_connection_supported:
+            self._execute_command(COMMAND.COM_RESET_CONNECTION, b"")
+            # Send the query without waiting the response of the reset.
+            self._execute_command(COMMAND.COM_QUERY, query)
+            try:
+                self._read_ok_packet()
+                error = None
+            except err.MySQLError as e:
+                if self._sock is None:
+                    raise
+                error = e
+            # Responses of the pipelined commands start from sequence id 1.
+            self._next_seq_id = 1
+            self._read_ok_packet()
+            if error is not None:
+                if error.args[0] != ER.UNKNOWN_COM_ERROR:
+                    raise error
+                self._reset_connection_supported = False
+        if not self._reset_connection_supported:
+            self._change_user()
+            self._execute_command(COMMAND.COM_QUERY, query)
+            self._read_ok_packet()
+        self.statement_cache.clear()
+        self._run_init_command()
+
+    def change_user(self, user, password="", database=None):
+        """
+        Authenticate as another user on the same connection.
+
+        The session state is reset like :py:meth:`reset`, and the current
+        database is changed to database.
+        Charset, collation, sql_mode, autocommit and init_command of the
+        connection are applied to the new session.
+
+        :param user: Username to log in as.
+        :param password: Password to use.
+        :param database: Database to use, None to not use a database.
+
+        :raise OperationalError: If the authentication fails. The user of the
+            connection is not changed.
+        """
+        saved = self.user, self.password, self.db
+        self._set_user(user, password, database)
+        try:
+            self._change_user()
+        except BaseException:
+            self.user, self.password, self.db = saved
+            raise
+        self._execute_command(COMMAND.COM_QUERY, self._session_state_query())
+        self._read_ok_packet()
+        self._run_init_command()
+
+    def _run_init_command(self):
+        if self.init_command is not None:
+            c = self.cursor()
+            c.execute(self.init_command)
+            c.close()
+
+    def _set_user(self, user, password, database):
+        self.user = user
+        self.password = password or b""
+        if isinstance(self.password, str):
+            self.password = self.password.encode("latin1")
+        self.db = database
+
+    def _session_state_query(self, autocommit=True, names=True):
+        """Return the SET statement of the session state kept by the connection.
+
+        Return None when there is nothing to set.
+        """
+        assignments = []
+        if names:
+            names = f"NAMES {self.charset}"
+            if self.collation:
+                names += f" COLLATE {self.collation}"
+            assignments.append(names)
+        if self.sql_mode is not None:
+            assignments.append("sql_mode=%s" % self.escape(self.sql_mode))
+        if autocommit and self.autocommit_mode is not None:
+            assignments.append("autocommit=%s" % self.escape(self.autocommit_mode))
+        if not assignments:
+            return None
+        return "SET " + ", ".join(assignments)
+
+    def _handshake_charset(self):
+        """Return the Charset whose id is sent in the handshake response."""
+        charset = charset_by_name(self.charset)
+        if self.collation:
+            collation = charset_by_collation(self.collation)
+            # Collations of other charsets are errors of "SET NAMES".
+            if collation is not None and collation.name == charset.name:
+                return collation
+        return charset
+
+    def _need_set_names(self):
+        """Return True if the handshake may not set the charset and collation."""
+        # Without collation, "SET NAMES charset" sets the default collation
+        # of the server which may differ from the one sent in the handshake.
+        return (
+            self._force_set_names
+            or not self.collation
+            or self._handshake_charset().collation != self.collation.lower()
+        )
+
+    def _init_queries(self):
+        """Return the queries initializing the session for pipeline_init."""
+        names = self._need_set_names()
+        if self.init_command is None:
+            query = self._session_state_query(names=names)
+            return [] if query is None else [query]
+        # autocommit is set after init_command like the non-pipelined connect.
+        query = self._session_state_query(autocommit=False, names=names)
+        queries = [] if query is None else [query]
+        queries.append(self.init_command)
+        if self.autocommit_mode is not None:
+            queries.append("SET autocommit=%s" % self.escape(self.autocommit_mode))
+        return queries
+
+    def _init_session(self):
+        if self._need_set_names():
+            self.set_character_set(self.charset, self.collation)
+
+        if self.sql_mode is not None:
+            c = self.cursor()
+            c.execute("SET sql_mode=%s", (self.sql_mode,))
+            c.close()
+
+        self._run_init_command()
+
+        if self.autocommit_mode is not None:
+            self.autocommit(self.autocommit_mode)
+
+    def _init_session_pipelined(self):
+        queries = self._init_queries()
+        for query in queries:
+            self._execute_command(COMMAND.COM_QUERY, query)
+        for i in range(len(queries)):
+            if i:
+                # Responses of the pipelined commands start from sequence id 1.
+                self._next_seq_id = 1
+            self._read_query_result()
+            while self._result.has_next:
+                self.next_result()
+
+    def _change_user(self):
+        """Authenticate again as user to database with COM_CHANGE_USER."""
+        self._execute_command(COMMAND.COM_CHANGE_USER, self._change_user_packet())
+        auth_packet = _auth.run_steps(self, self._auth_result_steps(None))
+        self._change_user_done(auth_packet)
+
+    def _change_user_packet(self):
+        # https://dev.mysql.com/doc/dev/mysql-server/latest/page_protocol_com_change_user.html
+        if isinstance(self.user, str):
+            self.user = self.user.encode(self.encoding)
+        if isinstance(self.db, str):
+            self.db = self.db.encode(self.encoding)
+
+        data = self.user + b"\0"
+        plugin_name, authresp = self._auth_response(self._secure)
+        if self.server_capabilities & CLIENT.SECURE_CONNECTION:
+            data += struct.pack("B", len(authresp)) + authresp
+        else:  # pragma: no cover - not testing against servers without secure auth (>=5.0)
+            data += authresp + b"\0"
+        data += (self.db or b"") + b"\0"
+        data += struct.pack("<H", self._handshake_charset().id)
+        if self.server_capabilities & CLIENT.PLUGIN_AUTH:
+            data += (plugin_name or b"") + b"\0"
+        if self.server_capabilities & CLIENT.CONNECT_ATTRS:
+            data += self._pack_connect_attrs()
+        return data
+
+    def _change_user_done(self, auth_packet):
+        ok = OKPacketWrapper(auth_packet, self._session_track)
+        self.server_status = ok.server_status
+        self._reset_session_tracking(self.db)
+        self._track_session_state(ok.session_state_changes)
+        # The server has deallocated the statements.
+        self.statement_cache.clear()
+
     def set_charset(self, charset):
         """Deprecated. Use set_character_set() instead."""
         warnings.warn(
@@ -692,15 +1619,21 @@ class Connection:
                 sock.settimeout(None)
 
             self._sock = sock
-            self._rfile = sock.makefile("rb")
+            self._sock_timeout = sock.gettimeout()
+            self._rfile = _socketio.SocketReader(sock)
+            self._compressed = None
             self._next_seq_id = 0
+            # Statements prepared on the previous connection are gone.
+            self.statement_cache.clear()
 
             self._get_server_information()
             self._request_authentication()
 
-            # Send "SET NAMES" query on init for:
+            # Send "SET NAMES" query on init unless the collation is sent in
+            # the handshake (see _need_set_names()):
             # - Ensure charset (and collation) is set to the server.
-            #   - collation_id in handshake packet may be ignored.
+            #   - collation_id in handshake packet may be ignored. Use
+            #     force_set_names=True for such servers.
             # - If collation is not specified, we don't know what is server's
             #   default collation for the charset. For example, default collation
             #   of utf8mb4 is:
@@ -711,20 +1644,10 @@ class Connection:
             # - https://github.com/PyMySQL/PyMySQL/issues/1092
             # - https://github.com/wagtail/wagtail/issues/9477
             # - https://zenn.dev/methane/articles/2023-mysql-collation (Japanese)
-            self.set_character_set(self.charset, self.collation)
-
-            if self.sql_mode is not None:
-                c = self.cursor()
-                c.execute("SET sql_mode=%s", (self.sql_mode,))
-                c.close()
-
-            if self.init_command is not None:
-                c = self.cursor()
-                c.execute(self.init_command)
-                c.close()
-
-            if self.autocommit_mode is not None:
-                self.autocommit(self.autocommit_mode)
+            if self._pipeline_init:
+                self._init_session_pipelined()
+            else:
+                self._init_session()
         except BaseException as e:
             self._force_close()
 
@@ -757,6 +1680,67 @@ class Connection:
         self._write_bytes(data)
         self._next_seq_id = (self._next_seq_id + 1) % 256
 
+    def _write_packet_buffer(self, payload):
+        """Write a packet like :py:meth:`write_packet` from a bytes-like payload.
+
+        The header and the payload are sent by sendmsg() without concatenating
+        them when the connection is neither compressed nor encrypted.
+        """
+        header = _pack_int24(len(payload)) + bytes([self._next_seq_id])
+        if DEBUG:
+            dump_packet(header + payload)
+        if self._compressed is not None or not _can_sendmsg(self._sock):
+            self._write_bytes(header + payload)
+        else:
+            self._set_timeout(self._write_timeout)
+            buffers = [header, memoryview(payload)]
+            try:
+                while buffers:
+                    sent = self._sock.sendmsg(buffers)
+                    while buffers and sent >= len(buffers[0]):
+                        sent -= len(buffers.pop(0))
+                    if buffers:
+                        buffers[0] = buffers[0][sent:]
+            except OSError as e:
+                self._force_close()
+                raise err.OperationalError(
+                    CR.CR_SERVER_GONE_ERROR, f"MySQL server has gone away ({e!r})"
+                )
+        self._next_seq_id = (self._next_seq_id + 1) % 256
+
+    def _sendfile_packet(self, file, offset, count):
+        """Write a packet of count bytes of the file from offset by socket.sendfile().
+
+        The kernel copies the file to the socket. TLS sockets fall back to
+        reading and sending it.
+        """
+        self._write_bytes(_pack_int24(count) + bytes([self._next_seq_id]))
+        try:
+            sent = self._sock.sendfile(file, offset, count)
+        except OSError as e:
+            self._force_close()
+            raise err.OperationalError(
+                CR.CR_SERVER_GONE_ERROR, f"MySQL server has gone away ({e!r})"
+            )
+        if sent < count:
+            # The packet can't be completed when the file is truncated.
+            self._force_close()
+            raise err.OperationalError(
+                CR.CR_SERVER_LOST, "The file was truncated while it was sent"
+            )
+        self._next_seq_id = (self._next_seq_id + 1) % 256
+
+    def _local_infile_chunk_size(self):
+        # A payload of MAX_PACKET_LEN bytes would be continued by the next packet.
+        return max(
+            1,
+            min(
+                self.local_infile_packet_size,
+                self.max_allowed_packet,
+                MAX_PACKET_LEN - 1,
+            ),
+        )
+
     def _read_packet(self, packet_type=MysqlPacket):
         """Read an entire "mysql packet" in its entirety from the network
         and return a MysqlPacket type that represents the results.
@@ -764,12 +1748,9 @@ class Connection:
         :raise OperationalError: If the connection to the MySQL server is lost.
         :raise InternalError: If the packet sequence number is wrong.
         """
-        buff = bytearray()
+        buff = None
         while True:
-            packet_header = self._read_bytes(4)
-            # if DEBUG: dump_packet(packet_header)
-
-            btrl, btrh, packet_number = struct.unpack("<HBB", packet_header)
+            btrl, btrh, packet_number = self._read_header()
             bytes_to_read = btrl + (btrh << 16)
             if packet_number != self._next_seq_id:
                 self._force_close()
@@ -788,24 +1769,62 @@ class Connection:
             recv_data = self._read_bytes(bytes_to_read)
             if DEBUG:
                 dump_packet(recv_data)
-            buff += recv_data
             # https://dev.mysql.com/doc/internals/en/sending-more-than-16mbyte.html
             if bytes_to_read < MAX_PACKET_LEN:
+                if buff is not None:
+                    buff += recv_data
+                    recv_data = bytes(buff)
                 break
+            if buff is None:
+                buff = bytearray()
+            buff += recv_data
 
-        packet = packet_type(bytes(buff), self.encoding)
+        packet = packet_type(recv_data, self.encoding)
         if packet.is_error_packet():
             if self._result is not None and self._result.unbuffered_active is True:
                 self._result.unbuffered_active = False
             packet.raise_for_error()
         return packet
 
+    def _read_header(self):
+        """Read a packet header and return (length low, length high, sequence id)."""
+        return self._read_from_server(self._rfile.unpack, _PACKET_HEADER)
+
+    def _read_packet_length(self):
+        """Read a packet header and return the payload length.
+
+        Used to read a payload in pieces instead of :meth:`_read_packet`.
+        """
+        btrl, btrh, packet_number = self._read_header()
+        if packet_number != self._next_seq_id:
+            self._force_close()
+            raise err.InternalError(
+                "Packet sequence number wrong - got %d expected %d"
+                % (packet_number, self._next_seq_id)
+            )
+        self._next_seq_id = (self._next_seq_id + 1) % 256
+        return btrl + (btrh << 16)
+
     def _read_bytes(self, num_bytes):
-        self._sock.settimeout(self._read_timeout)
+        data = self._read_from_server(self._rfile.read, num_bytes)
+        if len(data) < num_bytes:
+            self._force_close()
+            raise err.OperationalError(
+                CR.CR_SERVER_LOST, "Lost connection to MySQL server during query"
+            )
+        return data
+
+    def _set_timeout(self, timeout):
+        # settimeout() is a syscall. Skip it when the timeout is not changed.
+        if timeout != self._sock_timeout:
+            self._sock.settimeout(timeout)
+            self._sock_timeout = timeout
+
+    def _read_from_server(self, read, arg):
+        self._set_timeout(self._read_timeout)
         while True:
             try:
-                data = self._rfile.read(num_bytes)
-                break
+                return read(arg)
             except OSError as e:
                 if e.errno == errno.EINTR:
                     continue
@@ -814,19 +1833,20 @@ class Connection:
                     CR.CR_SERVER_LOST,
                     f"Lost connection to MySQL server during query ({e})",
                 )
+            except EOFError:
+                self._force_close()
+                raise err.OperationalError(
+                    CR.CR_SERVER_LOST, "Lost connection to MySQL server during query"
+                )
             except BaseException:
                 # Don't convert unknown exception to MySQLError.
                 self._force_close()
                 raise
-        if len(data) < num_bytes:
-            self._force_close()
-            raise err.OperationalError(
-                CR.CR_SERVER_LOST, "Lost connection to MySQL server during query"
-            )
-        return data
 
     def _write_bytes(self, data):
-        self._sock.settimeout(self._write_timeout)
+        if self._compressed is not None:
+            data = self._compressed.pack(data)
+        self._set_timeout(self._write_timeout)
         try:
             self._sock.sendall(data)
         except OSError as e:
@@ -835,9 +1855,12 @@ class Connection:
                 CR.CR_SERVER_GONE_ERROR, f"MySQL server has gone away ({e!r})"
             )
 
-    def _read_query_result(self, unbuffered=False):
+    def _read_query_result(self, unbuffered=False, binary=False):
         self._result = None
-        result = MySQLResult(self)
+        if binary:
+            result = MySQLBinaryResult(self)
+        else:
+            result = MySQLResult(self)
         if unbuffered:
             result.init_unbuffered_query()
         else:
@@ -845,6 +1868,8 @@ class Connection:
         self._result = result
         if result.server_status is not None:
             self.server_status = result.server_status
+        if result.session_state_changes:
+            self._track_session_state(result.session_state_changes)
         return result.affected_rows
 
     def insert_id(self):
@@ -879,6 +1904,8 @@ class Connection:
         # tiny optimization: build first packet manually instead of
         # calling self..write_packet()
         prelude = struct.pack("<iB", packet_size, command)
+        if self._compressed is not None:
+            self._compressed.sequence_id = 0
         packet = prelude + sql[: packet_size - 1]
         self._write_bytes(packet)
         if DEBUG:
@@ -896,7 +1923,12 @@ class Connection:
             if not sql and packet_size < MAX_PACKET_LEN:
                 break
 
-    def _request_authentication(self):
+    def _prepare_handshake(self):
+        """Return (client_flags, data_init, do_ssl) of the handshake response.
+
+        data_init is the first part of the handshake response. It is sent
+        alone as the SSL request when do_ssl is true.
+        """
         # https://dev.mysql.com/doc/internals/en/connection-phase-packets.html#packet-Protocol::HandshakeResponse
         if int(self.server_version.split(".", 1)[0]) >= 5:
             self.client_flag |= CLIENT.MULTI_RESULTS
@@ -904,7 +1936,7 @@ class Connection:
         if self.user is None:
             raise ValueError("Did not specify a username")
 
-        charset_id = charset_by_name(self.charset).id
+        charset_id = self._handshake_charset().id
         if isinstance(self.user, str):
             self.user = self.user.encode(self.encoding)
 
@@ -912,8 +1944,22 @@ class Connection:
         # CLIENT.SSL is added conditionally: for REQUIRED mode it is already set in
         # self.client_flag, but for PREFERRED mode it is only added when the server
         # also advertises SSL support.
-        # _do_ssl is set here and checked below for sha256_password auth.
+        # _do_ssl is set here and checked in _auth_steps() for sha256_password auth.
         client_flags = self.client_flag
+        if not self.server_capabilities & CLIENT.DEPRECATE_EOF:
+            client_flags &= ~CLIENT.DEPRECATE_EOF
+        self._deprecate_eof = bool(client_flags & CLIENT.DEPRECATE_EOF)
+        if not self.server_capabilities & CLIENT.SESSION_TRACK:
+            client_flags &= ~CLIENT.SESSION_TRACK
+        self._session_track = bool(client_flags & CLIENT.SESSION_TRACK)
+        self._reset_session_tracking(self.db)
+        if self.compress == "zlib" and self.server_capabilities & CLIENT.COMPRESS:
+            client_flags |= CLIENT.COMPRESS
+        elif (
+            self.compress == "zstd"
+            and self.server_capabilities & CLIENT.ZSTD_COMPRESSION_ALGORITHM
+        ):
+            client_flags |= CLIENT.ZSTD_COMPRESSION_ALGORITHM
         if self.ssl:
             if self.server_capabilities & CLIENT.SSL:
                 # SSL upgrade: include CLIENT.SSL flag and wrap the socket.
@@ -930,18 +1976,76 @@ class Connection:
         else:
             _do_ssl = False
 
+        # MariaDB extended capabilities are read when CLIENT_MYSQL is not set.
+        client_flags &= 0xFFFFFFFF | self.server_capabilities
+        if client_flags >> 32:
+            client_flags &= ~CLIENT.LONG_PASSWORD
+        self._stmt_bulk = bool(
+            client_flags & CLIENT.MARIADB_CLIENT_STMT_BULK_OPERATIONS
+        )
+
         data_init = struct.pack(
-            "<iIB23s", client_flags, MAX_PACKET_LEN, charset_id, b""
+            "<IIB19sI",
+            client_flags & 0xFFFFFFFF,
+            MAX_PACKET_LEN,
+            charset_id,
+            b"",
+            client_flags >> 32,
         )
+        return client_flags, data_init, _do_ssl
 
-        if _do_ssl:
+    def _request_authentication(self):
+        client_flags, data_init, do_ssl = self._prepare_handshake()
+        if do_ssl:
             self.write_packet(data_init)
             self._sock = self.ctx.wrap_socket(self._sock, server_hostname=self.host)
-            self._rfile = self._sock.makefile("rb")
+            self._sock_timeout = self._sock.gettimeout()
+            self._rfile = _socketio.SocketReader(self._sock)
             self._secure = True
 
+        _auth.run_steps(self, self._auth_steps(client_flags, data_init, do_ssl))
+        if DEBUG:
+            print("Succeed to auth")
+
+        # Packets are compressed after authentication.
+        if client_flags & CLIENT.COMPRESS:
+            self._start_compression("zlib")
+        elif client_flags & CLIENT.ZSTD_COMPRESSION_ALGORITHM:
+            self._start_compression("zstd")
+
+    def _auth_steps(self, client_flags, data_init, do_ssl):
+        """Send the handshake response and authenticate.
+
+        This is a generator of authentication steps. See _auth.run_steps().
+        """
         data = data_init + self.user + b"\0"
 
+        plugin_name, authresp = self._auth_response(do_ssl)
+        if self.server_capabilities & CLIENT.PLUGIN_AUTH_LENENC_CLIENT_DATA:
+            data += _lenenc_int(len(authresp)) + authresp
+        elif self.server_capabilities & CLIENT.SECURE_CONNECTION:
+            data += struct.pack("B", len(authresp)) + authresp
+        else:  # pragma: no cover - not testing against servers without secure auth (>=5.0)
+            data += authresp + b"\0"
+
+        if self.db and self.server_capabilities & CLIENT.CONNECT_WITH_DB:
+            if isinstance(self.db, str):
+                self.db = self.db.encode(self.encoding)
+            data += self.db + b"\0"
+
+        if self.server_capabilities & CLIENT.PLUGIN_AUTH:
+            data += (plugin_name or b"") + b"\0"
+
+        if self.server_capabilities & CLIENT.CONNECT_ATTRS:
+            data += self._pack_connect_attrs()
+
+        if client_flags & CLIENT.ZSTD_COMPRESSION_ALGORITHM:
+            data += struct.pack("B", self._zstd_compression_level)
+
+        return (yield from self._auth_result_steps(data))
+
+    def _auth_response(self, secure):
+        """Return (plugin name, auth response) for the auth method of the server."""
         authresp = b""
         plugin_name = None
 
@@ -962,39 +2066,30 @@ class Connection:
                     print("caching_sha2: empty password")
         elif self._auth_plugin_name == "sha256_password":
             plugin_name = b"sha256_password"
-            if _do_ssl:
+            if secure:
                 authresp = self.password + b"\0"
             elif self.password:
                 authresp = b"\1"  # request public key
             else:
                 authresp = b"\0"  # empty password
-
-        if self.server_capabilities & CLIENT.PLUGIN_AUTH_LENENC_CLIENT_DATA:
-            data += _lenenc_int(len(authresp)) + authresp
-        elif self.server_capabilities & CLIENT.SECURE_CONNECTION:
-            data += struct.pack("B", len(authresp)) + authresp
-        else:  # pragma: no cover - not testing against servers without secure auth (>=5.0)
-            data += authresp + b"\0"
-
-        if self.db and self.server_capabilities & CLIENT.CONNECT_WITH_DB:
-            if isinstance(self.db, str):
-                self.db = self.db.encode(self.encoding)
-            data += self.db + b"\0"
-
-        if self.server_capabilities & CLIENT.PLUGIN_AUTH:
-            data += (plugin_name or b"") + b"\0"
-
-        if self.server_capabilities & CLIENT.CONNECT_ATTRS:
-            connect_attrs = b""
-            for k, v in self._connect_attrs.items():
-                k = k.encode("utf-8")
-                connect_attrs += _lenenc_int(len(k)) + k
-                v = v.encode("utf-8")
-                connect_attrs += _lenenc_int(len(v)) + v
-            data += _lenenc_int(len(connect_attrs)) + connect_attrs
-
-        self.write_packet(data)
-        auth_packet = self._read_packet()
+        return plugin_name, authresp
+
+    def _pack_connect_attrs(self):
+        connect_attrs = b""
+        for k, v in self._connect_attrs.items():
+            k = k.encode("utf-8")
+            connect_attrs += _lenenc_int(len(k)) + k
+            v = v.encode("utf-8")
+            connect_attrs += _lenenc_int(len(v)) + v
+        return _lenenc_int(len(connect_attrs)) + connect_attrs
+
+    def _auth_result_steps(self, data):
+        """Send data and handle the result of authentication.
+
+        The result may switch the auth method or request more data.
+        This is a generator of authentication steps. See _auth.run_steps().
+        """
+        auth_packet = yield data
 
         # if authentication method isn't accepted the first byte
         # will have the octet 254
@@ -1008,7 +2103,9 @@ class Connection:
                 self.server_capabilities & CLIENT.PLUGIN_AUTH
                 and plugin_name is not None
             ):
-                auth_packet = self._process_auth(plugin_name, auth_packet)
+                auth_packet = yield from self._process_auth_steps(
+                    plugin_name, auth_packet
+                )
             else:
                 raise err.OperationalError("received unknown auth switch request")
         elif auth_packet.is_extra_auth_data():
@@ -1016,18 +2113,29 @@ class Connection:
                 print("received extra data")
             # https://dev.mysql.com/doc/internals/en/successful-authentication.html
             if self._auth_plugin_name == "caching_sha2_password":
-                auth_packet = _auth.caching_sha2_password_auth(self, auth_packet)
+                auth_packet = yield from _auth.caching_sha2_password_steps(
+                    self, auth_packet
+                )
             elif self._auth_plugin_name == "sha256_password":
-                auth_packet = _auth.sha256_password_auth(self, auth_packet)
+                auth_packet = yield from _auth.sha256_password_steps(self, auth_packet)
             else:
                 raise err.OperationalError(
                     "Received extra packet for auth method %r", self._auth_plugin_name
                 )
-
-        if DEBUG:
-            print("Succeed to auth")
+        return auth_packet
+
+    def _start_compression(self, algorithm):
+        self._rfile = self._compressed = _compress.CompressedIO(
+            self._rfile,
+            algorithm,
+            self._zstd_compression_level,
+            self._compress_threshold,
+        )
 
     def _process_auth(self, plugin_name, auth_packet):
+        return _auth.run_steps(self, self._process_auth_steps(plugin_name, auth_packet))
+
+    def _process_auth_steps(self, plugin_name, auth_packet):
         handler = self._get_auth_plugin_handler(plugin_name)
         if handler:
             try:
@@ -1040,9 +2148,9 @@ class Connection:
                         f" not loaded: - {type(handler)!r} missing authenticate method",
                     )
         if plugin_name == b"caching_sha2_password":
-            return _auth.caching_sha2_password_auth(self, auth_packet)
+            return (yield from _auth.caching_sha2_password_steps(self, auth_packet))
         elif plugin_name == b"sha256_password":
-            return _auth.sha256_password_auth(self, auth_packet)
+            return (yield from _auth.sha256_password_steps(self, auth_packet))
         elif plugin_name == b"mysql_native_password":
             data = _auth.scramble_native_password(self.password, auth_packet.read_all())
         elif plugin_name == b"client_ed25519":
@@ -1064,12 +2172,12 @@ class Connection:
                 prompt = pkt.read_all()
 
                 if prompt == b"Password: ":
-                    self.write_packet(self.password + b"\0")
+                    data = self.password + b"\0"
                 elif handler:
                     resp = "no response - TypeError within plugin.prompt method"
                     try:
                         resp = handler.prompt(echo, prompt)
-                        self.write_packet(resp + b"\0")
+                        data = resp + b"\0"
                     except AttributeError:
                         raise err.OperationalError(
                             CR.CR_AUTH_PLUGIN_CANNOT_LOAD,
@@ -1087,8 +2195,7 @@ class Connection:
                         CR.CR_AUTH_PLUGIN_CANNOT_LOAD,
                         f"Authentication plugin '{plugin_name}' not configured",
                     )
-                pkt = self._read_packet()
-                pkt.check_error()
+                pkt = yield data
                 if pkt.is_ok_packet() or last:
                     break
             return pkt
@@ -1098,10 +2205,7 @@ class Connection:
                 "Authentication plugin '%s' not configured" % plugin_name,
             )
 
-        self.write_packet(data)
-        pkt = self._read_packet()
-        pkt.check_error()
-        return pkt
+        return (yield data)
 
     def _get_auth_plugin_handler(self, plugin_name):
         plugin_class = self._auth_plugin_map.get(plugin_name)
@@ -1176,6 +2280,11 @@ class Connection:
             salt_len = max(12, salt_len - 9)
 
         # reserved
+        if not self.server_capabilities & CLIENT.LONG_PASSWORD and len(data) >= i + 10:
+            # MariaDB sends the extended capabilities instead of CLIENT_MYSQL.
+            self.server_capabilities |= (
+                struct.unpack("<I", data[i + 6 : i + 10])[0] << 32
+            )
         i += 10
 
         if len(data) >= i + salt_len:
@@ -1216,6 +2325,61 @@ class Connection:
     NotSupportedError = err.NotSupportedError
 
 
+def _text_row_decoder(column_converters):
+    """Return a function decoding a row of the text protocol.
+
+    column_converters is the list of (encoding, converter) of the columns.
+    The function parses the row packet data in one pass and returns the tuple
+    of values.
+    """
+    # int() and float() accept ASCII bytes. Skip decoding numeric columns,
+    # but not strings which custom converters may convert by int().
+    column_converters = tuple(
+        (None, converter)
+        if encoding == "ascii" and converter in (int, float)
+        else (encoding, converter)
+        for encoding, converter in column_converters
+    )
+    unpack_from = struct.unpack_from
+
+    def decode_row(data):
+        row = []
+        append = row.append
+        pos = 0
+        end = len(data)
+        for encoding, converter in column_converters:
+            if pos >= end:
+                # No more columns in this row
+                # See https://github.com/PyMySQL/PyMySQL/pull/434
+                break
+            # Length coded string
+            length = data[pos]
+            pos += 1
+            if length >= UNSIGNED_CHAR_COLUMN:
+                if length == NULL_COLUMN:
+                    append(None)
+                    continue
+                if length == UNSIGNED_SHORT_COLUMN:
+                    length = data[pos] | data[pos + 1] << 8
+                    pos += 2
+                elif length == UNSIGNED_INT24_COLUMN:
+                    length = data[pos] | data[pos + 1] << 8 | data[pos + 2] << 16
+                    pos += 3
+                else:
+                    length = unpack_from("<Q", data, pos)[0]
+                    pos += 8
+            value = data[pos : pos + length]
+            pos += length
+            if encoding is not None:
+                value = value.decode(encoding)
+            if converter is not None:
+                value = converter(value)
+            append(value)
+        return tuple(row)
+
+    return decode_row
+
+
 class MySQLResult:
     def __init__(self, connection):
         """
@@ -1227,11 +2391,17 @@ class MySQLResult:
         self.server_status = None
         self.warning_count = 0
         self.message = None
+        #: Session state changes in the OK packet. See OKPacketWrapper.
+        self.session_state_changes = ()
         self.field_count = 0
         self.description = None
         self.rows = None
         self.has_next = None
         self.unbuffered_active = False
+        #: ColumnStream of the last row read by _read_rowdata_stream().
+        self._stream = None
+        self._deprecate_eof = connection._deprecate_eof
+        self._session_track = connection._session_track
 
     def __del__(self):
         if self.unbuffered_active:
@@ -1276,12 +2446,13 @@ class MySQLResult:
             self.unbuffered_active = True
 
     def _read_ok_packet(self, packet):
-        ok_packet = OKPacketWrapper(packet)
+        ok_packet = OKPacketWrapper(packet, self._session_track)
         self.affected_rows = ok_packet.affected_rows
         self.insert_id = ok_packet.insert_id
         self.server_status = ok_packet.server_status
         self.warning_count = ok_packet.warning_count
         self.message = ok_packet.message
+        self.session_state_changes = ok_packet.session_state_changes
         self.has_next = ok_packet.has_next
 
     def _read_load_local_packet(self, first_packet):
@@ -1291,8 +2462,14 @@ class MySQLResult:
                 "**WARN**: Received LOAD_LOCAL packet but local_infile option is false."
             )
         load_packet = LoadLocalPacketWrapper(first_packet)
+        source = conn._load_data_source
         try:
-            _send_local_file(load_packet.filename, conn)
+            if source is not None and source[0] == load_packet.filename:
+                conn._load_data_source = None
+                for chunk in source[1]:
+                    conn._write_packet_buffer(chunk)
+            else:
+                _send_local_file(load_packet.filename, conn)
         finally:
             # send the empty packet to signify we are done sending data
             conn.write_packet(b"")
@@ -1307,16 +2484,25 @@ class MySQLResult:
         self._read_ok_packet(ok_packet)
 
     def _check_packet_is_eof(self, packet):
-        if not packet.is_eof_packet():
+        if self._deprecate_eof:
+            if not packet.is_eof_ok_packet():
+                return False
+            wp = OKPacketWrapper(packet, self._session_track)
+            # e.g. SELECT ... FOR UPDATE starting a transaction.
+            self.session_state_changes = wp.session_state_changes
+        elif not packet.is_eof_packet():
             return False
-        # TODO: Support CLIENT.DEPRECATE_EOF
-        # 1) Add DEPRECATE_EOF to CAPABILITIES
-        # 2) Mask CAPABILITIES with server_capabilities
-        # 3) if server_capabilities & CLIENT.DEPRECATE_EOF:
-        #    use OKPacketWrapper instead of EOFPacketWrapper
-        wp = EOFPacketWrapper(packet)
+        else:
+            wp = EOFPacketWrapper(packet)
         self.warning_count = wp.warning_count
+        self.server_status = wp.server_status
         self.has_next = wp.has_next
+        if self.unbuffered_active:
+            # Connection._read_query_result() returned before the end of rows.
+            conn = self.connection
+            conn.server_status = wp.server_status
+            if self.session_state_changes:
+                conn._track_session_state(self.session_state_changes)
         return True
 
     def _read_result_packet(self, first_packet):
@@ -1325,6 +2511,7 @@ class MySQLResult:
         self._read_rowdata_packet()
 
     def _read_rowdata_packet_unbuffered(self):
+        self._close_stream()
         # Check if in an active query
         if not self.unbuffered_active:
             return
@@ -1342,10 +2529,95 @@ class MySQLResult:
         self.rows = (row,)  # rows should tuple of row for MySQL-python compatibility.
         return row
 
+    def _read_rowdata_stream(self):
+        """Read the next row of the unbuffered result.
+
+        The value of the last column is returned as a ColumnStream reading
+        it from the connection, or None for NULL.
+        """
+        self._close_stream()
+        if not self.unbuffered_active:
+            return None
+        conn = self.connection
+        # The row is received in pieces until the columns before the last one
+        # are parsed. The rest is read by the stream.
+        chunk_size = _socketio.DEFAULT_BUFFER_SIZE
+        length = conn._read_packet_length()
+        data = conn._read_bytes(min(length, chunk_size))
+        packet_remaining = length - len(data)
+        more = length == MAX_PACKET_LEN
+        if not more and not packet_remaining:
+            packet = MysqlPacket(data, conn.encoding)
+            if packet.is_error_packet():
+                self.unbuffered_active = False
+                packet.raise_for_error()
+            if self._check_packet_is_eof(packet):
+                self.unbuffered_active = False
+                self.connection = None
+                self.rows = None
+                return None
+        while True:
+            packet = MysqlPacket(data, conn.encoding)
+            try:
+                row, value_length = self._read_stream_prefix(packet)
+                break
+            except (AssertionError, IndexError, struct.error):
+                if not more and not packet_remaining:
+                    raise
+            if not packet_remaining:
+                length = conn._read_packet_length()
+                packet_remaining = length
+                more = length == MAX_PACKET_LEN
+            # Double the received data not to parse it too many times.
+            size = min(packet_remaining, max(len(data), chunk_size))
+            data += conn._read_bytes(size)
+            packet_remaining -= size
+        stream = ColumnStream(
+            conn,
+            memoryview(data)[packet.position :],
+            value_length or 0,
+            packet_remaining,
+            more,
+        )
+        if value_length is None:
+            stream.close()
+            row.append(None)
+        else:
+            self._stream = stream
+            row.append(stream)
+        row = tuple(row)
+        self.affected_rows = 1
+        self.rows = (row,)
+        return row
+
+    def _read_stream_prefix(self, packet):
+        """Read the values of the columns but the last one from the row packet.
+
+        Return the list of the values and the length of the last value, or None
+        for NULL. The packet is positioned at the data of the last value.
+        """
+        for _ in range(self.field_count - 1):
+            packet.read_length_coded_string()
+        end = packet.position
+        length = packet.read_length_encoded_integer()
+        decode_prefix = self._decode_prefix
+        if decode_prefix is None:
+            decode_prefix = self._decode_prefix = _text_row_decoder(
+                self.converters[:-1]
+            )
+        return list(decode_prefix(packet.get_all_data()[:end])), length
+
+    def _close_stream(self):
+        stream = self._stream
+        if stream is not None:
+            self._stream = None
+            stream.close()
+
     def _finish_unbuffered_query(self):
         # After much reading on the MySQL protocol, it appears that there is,
         # in fact, no way to stop MySQL from sending all the data after
         # executing a query, so we just spin, and wait for an EOF packet.
+        self._close_stream()
         while self.unbuffered_active:
             try:
                 packet = self.connection._read_packet()
@@ -1378,24 +2650,63 @@ class MySQLResult:
         self.affected_rows = len(rows)
         self.rows = tuple(rows)
 
-    def _read_row_from_packet(self, packet):
-        row = []
-        for encoding, converter in self.converters:
-            try:
-                data = packet.read_length_coded_string()
-            except IndexError:
-                # No more columns in this row
-                # See https://github.com/PyMySQL/PyMySQL/pull/434
+    def _read_rowdata_columns(self, size=None, raw=()):
+        """Read rows of the unbuffered result into columns.
+
+        Values are appended to per-column lists or array.array (see
+        :func:`_new_column`) without building a tuple for each row.
+        Read at most size rows when size is not None.
+
+        Columns whose index is in raw are stored in lists without decoding and
+        converting. They contain bytes of the text protocol, or the values
+        decoded from the binary protocol.
+
+        :return: The columns and the number of rows read.
+        """
+        columns = []
+        self._column_converters = column_converters = []
+        for i, (field, (encoding, converter)) in enumerate(
+            zip(self.fields, self.converters)
+        ):
+            if i in raw:
+                column = []
+                encoding = converter = None
+            else:
+                column = _new_column(field, converter)
+                if type(column) is not list:
+                    # int() and float() accept ASCII bytes. Skip decoding.
+                    encoding = None
+            columns.append(column)
+            column_converters.append((encoding, converter))
+        self._close_stream()
+        count = 0
+        read_values = self._read_values_from_packet
+        while self.unbuffered_active and count != size:
+            packet = self.connection._read_packet()
+            if self._check_packet_is_eof(packet):
+                self.unbuffered_active = False
+                self.connection = None
                 break
-            if data is not None:
-                if encoding is not None:
-                    data = data.decode(encoding)
-                if DEBUG:
-                    print("DEBUG: DATA = ", data)
-                if converter is not None:
-                    data = converter(data)
-            row.append(data)
-        return tuple(row)
+            read_values(packet, columns)
+            count += 1
+        self.rows = None
+        return columns, count
+
+    def _read_values_from_packet(self, packet, columns):
+        """Append the values of the row to columns."""
+        for i, (encoding, converter) in enumerate(self._column_converters):
+            data = packet.read_length_coded_string()
+            if data is None:
+                _append_null(columns, i)
+                continue
+            if encoding is not None:
+                data = data.decode(encoding)
+            if converter is not None:
+                data = converter(data)
+            columns[i].append(data)
+
+    def _read_row_from_packet(self, packet):
+        return self._decode_row(packet.get_all_data())
 
     def _get_descriptions(self):
         """Read a column descriptor packet for each column in the result."""
@@ -1436,23 +2747,324 @@ class MySQLResult:
                 print(f"DEBUG: field={field}, converter={converter}")
             self.converters.append((encoding, converter))
 
-        eof_packet = self.connection._read_packet()
-        assert eof_packet.is_eof_packet(), "Protocol error, expecting EOF"
+        self._decode_row = _text_row_decoder(self.converters)
+        self._decode_prefix = None
+
+        if not self._deprecate_eof:
+            eof_packet = self.connection._read_packet()
+            assert eof_packet.is_eof_packet(), "Protocol error, expecting EOF"
         self.description = tuple(description)
 
 
+class MySQLBinaryResult(MySQLResult):
+    """Result of a prepared statement. Rows are sent in the binary protocol."""
+
+    def _get_descriptions(self):
+        super()._get_descriptions()
+        # https://dev.mysql.com/doc/dev/mysql-server/latest/page_protocol_binary_resultset.html#sect_protocol_binary_resultset_row
+        # NULL bitmap of the binary row has 2 bits offset.
+        self._null_bitmap_length = (self.field_count + 7 + 2) // 8
+        self._column_readers = [
+            _binary_column_reader(field, encoding, converter)
+            for field, (encoding, converter) in zip(self.fields, self.converters)
+        ]
+
+    def _read_values_from_packet(self, packet, columns):
+        packet.advance(1)  # 0x00 header
+        null_bitmap = packet.read(self._null_bitmap_length)
+        for i, read_value in enumerate(self._column_readers):
+            bit = i + 2
+            if null_bitmap[bit >> 3] & (1 << (bit & 7)):
+                _append_null(columns, i)
+            else:
+                columns[i].append(read_value(packet))
+
+    def _read_row_from_packet(self, packet):
+        packet.advance(1)  # 0x00 header
+        null_bitmap = packet.read(self._null_bitmap_length)
+        row = []
+        for i, read_value in enumerate(self._column_readers, 2):
+            if null_bitmap[i >> 3] & (1 << (i & 7)):
+                row.append(None)
+            else:
+                row.append(read_value(packet))
+        return tuple(row)
+
+    def _read_rowdata_stream(self):
+        if self.unbuffered_active:
+            type_code = self.fields[-1].type_code
+            if (
+                type_code in _BINARY_INTEGER_READERS
+                or type_code in _BINARY_VALUE_READERS
+            ):
+                raise err.NotSupportedError(
+                    "Only string columns can be streamed from prepared statements"
+                )
+        return super()._read_rowdata_stream()
+
+    def _read_stream_prefix(self, packet):
+        packet.advance(1)  # 0x00 header
+        null_bitmap = packet.read(self._null_bitmap_length)
+        row = []
+        for i, read_value in enumerate(self._column_readers[:-1], 2):
+            if null_bitmap[i >> 3] & (1 << (i & 7)):
+                row.append(None)
+            else:
+                row.append(read_value(packet))
+        i = self.field_count + 1
+        if null_bitmap[i >> 3] & (1 << (i & 7)):
+            return row, None
+        return row, packet.read_length_encoded_integer()
+
+
+class ColumnStream(io.RawIOBase):
+    """
+    Readable binary stream of a column value, returned by
+    :meth:`SSCursor.fetchone_stream() <pymysql.cursors.SSCursor.fetchone_stream>`.
+
+    The value is read from the connection in pieces as the stream is read,
+    so a large value is never held in memory as a whole. The stream can be
+    read until the next row is fetched or the next query is executed; the
+    data which is not read yet is skipped then.
+    """
+
+    def __init__(self, connection, data, length, packet_remaining, more):
+        """
+        :param data: Received data of the value.
+        :param length: Length of the value.
+        :param packet_remaining: Bytes of the current packet not received yet.
+        :param more: Whether the current packet is followed by another packet
+            of the row.
+        """
+        super().__init__()
+        self._connection = connection
+        self._data = data
+        self._position = 0
+        #: Bytes of the value which are not read yet.
+        self._remaining = length
+        self._packet_remaining = packet_remaining
+        self._more = more
+        #: Length of the value.
+        self.length = length
+        if not length:
+            self._finish()
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        """Read size bytes, or less at the end of the value."""
+        if size is None or size < 0:
+            return self.readall()
+        data = self._read_chunk(size)
+        if len(data) < size and self._remaining:
+            # The data continues in the next packet.
+            chunks = [data]
+            size -= len(data)
+            while size and self._remaining:
+                data = self._read_chunk(size)
+                chunks.append(data)
+                size -= len(data)
+            data = b"".join(chunks)
+        return data
+
+    def readinto(self, b):
+        data = self._read_chunk(len(b))
+        n = len(data)
+        b[:n] = data
+        return n
+
+    def readall(self):
+        return self.read(self._remaining)
+
+    def _read_chunk(self, size):
+        """Read at most size bytes in the received data or the current packet."""
+        if self.closed:
+            raise ValueError("I/O operation on closed stream")
+        size = min(size, self._remaining)
+        if not size:
+            return b""
+        position = self._position
+        if position < len(self._data):
+            data = bytes(self._data[position : position + size])
+            self._position = position + len(data)
+        else:
+            conn = self._connection
+            if not self._packet_remaining:
+                if not self._more:
+                    conn._force_close()
+                    raise err.InternalError("The column value is truncated")
+                length = conn._read_packet_length()
+                self._packet_remaining = length
+                self._more = length == MAX_PACKET_LEN
+            data = conn._read_bytes(min(size, self._packet_remaining))
+            self._packet_remaining -= len(data)
+        self._remaining -= len(data)
+        if not self._remaining:
+            self._finish()
+        return data
+
+    def _finish(self):
+        self._data = b""
+        if self._more and not self._packet_remaining:
+            # The row ends with an empty packet when the last packet is full.
+            if self._connection._read_packet_length():
+                self._connection._force_close()
+                raise err.InternalError("The row continues after the column value")
+            self._more = False
+        self._connection = None
+
+    def close(self):
+        """Skip the rest of the value and close the stream."""
+        try:
+            conn = self._connection
+            while self._remaining and conn is not None and conn._sock is not None:
+                self._read_chunk(_socketio.DEFAULT_BUFFER_SIZE * 16)
+        finally:
+            self._connection = None
+            super().close()
+
+
+class PreparedStatement:
+    """
+    A statement prepared on the server by :meth:`Connection.prepare`.
+
+    The statement is bound to the connection which prepared it.
+    Call :meth:`close` to deallocate it on the server.
+    """
+
+    def __init__(self, connection, statement_id, params, fields):
+        self.connection = connection
+        self.statement_id = statement_id
+        #: Column descriptors of the parameters.
+        self.params = params
+        #: Column descriptors of the result set.
+        self.fields = fields
+        # Number of the pipelines in which the statement is queued.
+        self._pins = 0
+        self._close_pending = False
+
+    @property
+    def param_count(self):
+        return len(self.params)
+
+    def close(self):
+        """Deallocate the statement on the server.
+
+        A statement queued in a pipeline is deallocated after the pipeline runs.
+        """
+        conn = self.connection
+        if conn is None:
+            return
+        if self._pins:
+            self._close_pending = True
+            return
+        self.connection = None
+        if conn._sock is None:
+            # Statements are deallocated with the connection.
+            return
+        # There is no response to COM_STMT_CLOSE.
+        conn._execute_command(
+            COMMAND.COM_STMT_CLOSE, struct.pack("<I", self.statement_id)
+        )
+
+    def _pin(self):
+        self._pins += 1
+
+    def _unpin(self):
+        self._pins -= 1
+        if not self._pins and self._close_pending:
+            self._close_pending = False
+            self.close()
+
+
+class StatementCache:
+    """
+    LRU cache of the statements prepared on a connection, keyed by the query.
+
+    When the cache is full, the least recently used statement is closed
+    on the server.
+    """
+
+    def __init__(self, maxsize):
+        #: Max number of statements in the cache.
+        self.maxsize = maxsize
+        #: Number of lookups which found the statement.
+        self.hits = 0
+        #: Number of lookups which didn't find the statement.
+        self.misses = 0
+        #: Number of statements closed to make room for new one.
+        self.evictions = 0
+        self._statements = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._statements)
+
+    def get(self, query):
+        """Return the statement prepared for the query, or None."""
+        statement = self._statements.get(query)
+        if statement is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._statements.move_to_end(query)
+        return statement
+
+    def put(self, query, statement):
+        """Add the statement to the cache.
+
+        Returns False when the cache is disabled and the statement is not
+        added. The caller is responsible to close it then.
+        """
+        if self.maxsize <= 0:
+            return False
+        statements = self._statements
+        while len(statements) >= self.maxsize:
+            _, evicted = statements.popitem(last=False)
+            self.evictions += 1
+            evicted.close()
+        statements[query] = statement
+        return True
+
+    def clear(self):
+        """Forget all statements without closing them on the server.
+
+        This is used when the server has deallocated them already.
+        """
+        for statement in self._statements.values():
+            statement.connection = None
+        self._statements.clear()
+
+
+def _can_sendmsg(sock):
+    return hasattr(sock, "sendmsg") and not (
+        SSL_ENABLED and isinstance(sock, ssl.SSLSocket)
+    )
+
+
 def _send_local_file(filename: str, conn: Connection):
     """Send data packets from the local file to the server"""
-    packet_size = min(conn.max_allowed_packet, 16 * 1024)
+    packet_size = conn._local_infile_chunk_size()
 
     try:
-        with open(filename, "rb") as file:
-            # 16KB is efficient enough
+        with open(filename, "rb", buffering=0) as file:
+            size = os.fstat(file.fileno())
+            if conn._compressed is None and stat.S_ISREG(size.st_mode):
+                size = size.st_size
+                offset = 0
+                while offset < size:
+                    count = min(packet_size, size - offset)
+                    conn._sendfile_packet(file, offset, count)
+                    offset += count
+                return
+            # Pipes and compressed connections. The buffer is reused.
+            buffer = bytearray(packet_size)
+            view = memoryview(buffer)
             while True:
-                chunk = file.read(packet_size)
-                if not chunk:
+                n = file.readinto(buffer)
+                if not n:
                     break
-                conn.write_packet(chunk)
+                conn._write_packet_buffer(view[:n])
     except OSError as e:
         raise err.OperationalError(
             ER.FILE_NOT_FOUND,
@@ -20,6 +20,14 @@ PS_MULTI_RESULTS = 1 << 18
 PLUGIN_AUTH = 1 << 19
 CONNECT_ATTRS = 1 << 20
 PLUGIN_AUTH_LENENC_CLIENT_DATA = 1 << 21
+SESSION_TRACK = 1 << 23
+DEPRECATE_EOF = 1 << 24
+
+# MariaDB extended capabilities. They are sent in the reserved bytes of the
+# handshake packets when LONG_PASSWORD (CLIENT_MYSQL) is not set.
+# https://mariadb.com/kb/en/connection/#capabilities
+MARIADB_CLIENT_STMT_BULK_OPERATIONS = 1 << 34
+
 CAPABILITIES = (
     LONG_PASSWORD
     | LONG_FLAG
@@ -27,12 +35,15 @@ CAPABILITIES = (
     | TRANSACTIONS
     | SECURE_CONNECTION
     | MULTI_RESULTS
+    | PS_MULTI_RESULTS
     | PLUGIN_AUTH
     | PLUGIN_AUTH_LENENC_CLIENT_DATA
     | CONNECT_ATTRS
+    | SESSION_TRACK
+    | DEPRECATE_EOF
+    | MARIADB_CLIENT_STMT_BULK_OPERATIONS
 )
 
 # Not done yet
 HANDLE_EXPIRED_PASSWORDS = 1 << 22
-SESSION_TRACK = 1 << 23
-DEPRECATE_EOF = 1 << 24
+ZSTD_COMPRESSION_ALGORITHM = 1 << 26
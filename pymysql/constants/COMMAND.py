@@ -29,4 +29,8 @@ COM_SET_OPTION = 0x1B
 COM_STMT_FETCH = 0x1C
 COM_DAEMON = 0x1D
 COM_BINLOG_DUMP_GTID = 0x1E
+COM_RESET_CONNECTION = 0x1F
 COM_END = 0x1F
+
+# MariaDB
+COM_STMT_BULK_EXECUTE = 0xFA
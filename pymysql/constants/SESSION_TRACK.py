@@ -0,0 +1,7 @@
+# https://dev.mysql.com/doc/dev/mysql-server/latest/page_protocol_basic_ok_packet.html
+SYSTEM_VARIABLES = 0
+SCHEMA = 1
+STATE_CHANGE = 2
+GTIDS = 3
+TRANSACTION_CHARACTERISTICS = 4
+TRANSACTION_STATE = 5
@@ -1,6 +1,8 @@
 import re
 
 from . import err
+from .charset import charset_by_name
+from .constants import CLIENT, SERVER_STATUS
 
 #: Regular expression for :meth:`Cursor.executemany`.
 #: executemany only supports simple bulk insert.
@@ -16,10 +18,39 @@ RE_INSERT_VALUES = re.compile(
 )
 
 
+#: Regular expression for the statements which :meth:`Cursor.executemany`
+#: batches into multiple statements when :attr:`Cursor.batch_statements` is true.
+RE_BATCH_STATEMENT = re.compile(r"\s*(?:UPDATE|DELETE|INSERT|REPLACE)\b", re.IGNORECASE)
+
+#: File name of LOAD DATA LOCAL INFILE used by :meth:`Cursor.load_data`.
+#: The rows are sent when the server requests this file.
+LOAD_DATA_FILENAME = "pymysql-load-data"
+
+#: Regular expression for placeholders converted by :class:`PreparedCursor`.
+RE_PLACEHOLDER = re.compile(r"%(?:\(([^)]*)\))?s|%%")
+
+
 def _backquote_escape(s):
     return s.replace("`", "``")
 
 
+def _convert_placeholders(query):
+    """Convert pyformat placeholders to ``?`` used by prepared statements.
+
+    Returns the converted query and the list of the placeholder names.
+    The name is None for ``%s``.
+    """
+    names = []
+
+    def repl(m):
+        if m.group(0) == "%%":
+            return "%"
+        names.append(m.group(1))
+        return "?"
+
+    return RE_PLACEHOLDER.sub(repl, query), names
+
+
 class Cursor:
     """
     This is the object used to interact with the database.
@@ -37,6 +68,13 @@ class Cursor:
     #: Default value of max_allowed_packet is 1048576.
     max_stmt_length = 1024000
 
+    #: If true, :meth:`executemany` sends UPDATE, DELETE, and INSERT or
+    #: REPLACE which can't be a multiple-row INSERT as multiple statements
+    #: separated by ``;\n`` up to :attr:`max_stmt_length`, when the connection
+    #: is created with ``client_flag=CLIENT.MULTI_STATEMENTS``.
+    #: Otherwise they are executed one by one.
+    batch_statements = False
+
     def __init__(self, connection):
         self.connection = connection
         self.warning_count = 0
@@ -173,31 +211,85 @@ class Cursor:
         :rtype: int or None
 
         This method improves performance on multiple-row INSERT and
-        REPLACE. Otherwise it is equivalent to looping over args with
-        execute().
+        REPLACE, and on other statements batched by :attr:`batch_statements`.
+        Otherwise it is equivalent to looping over args with execute().
         """
         if not args:
             return
 
-        m = RE_INSERT_VALUES.match(query)
-        if m:
-            q_prefix = m.group(1) % ()
-            q_values = m.group(2).rstrip()
-            q_postfix = m.group(3) or ""
-            assert q_values[0] == "(" and q_values[-1] == ")"
-            return self._do_execute_many(
-                q_prefix,
-                q_values,
-                q_postfix,
-                args,
-                self.max_stmt_length,
-                self._get_db().encoding,
-            )
+        statements = self._bulk_insert_statements(query, args)
+        if statements is not None:
+            self.rowcount = sum(self.execute(sql) for sql in statements)
+            return self.rowcount
+
+        statements = self._batch_statements(query, args)
+        if statements is not None:
+            rowcount = 0
+            for sql in statements:
+                rowcount += self.execute(sql)
+                while self.nextset():
+                    rowcount += self.rowcount
+            self.rowcount = rowcount
+            return rowcount
 
         self.rowcount = sum(self.execute(query, arg) for arg in args)
         return self.rowcount
 
-    def _do_execute_many(
+    def _bulk_insert_statements(self, query, args):
+        """Return the iterator of multiple-row statements executing query with args.
+
+        Return None if query is not INSERT or REPLACE.
+        """
+        m = RE_INSERT_VALUES.match(query)
+        if not m:
+            return None
+        q_prefix = m.group(1) % ()
+        q_values = m.group(2).rstrip()
+        q_postfix = m.group(3) or ""
+        assert q_values[0] == "(" and q_values[-1] == ")"
+        return self._build_insert_statements(
+            q_prefix,
+            q_values,
+            q_postfix,
+            args,
+            self.max_stmt_length,
+            self._get_db().encoding,
+        )
+
+    def _batch_statements(self, query, args):
+        """Return the iterator of multiple statements executing query with args.
+
+        Return None unless the query is batched by :attr:`batch_statements`.
+        """
+        conn = self._get_db()
+        if not (
+            self.batch_statements
+            and conn.client_flag & CLIENT.MULTI_STATEMENTS
+            and RE_BATCH_STATEMENT.match(query)
+        ):
+            return None
+        return self._build_batch_statements(
+            query.rstrip().rstrip(";"), args, self.max_stmt_length, conn.encoding
+        )
+
+    def _build_batch_statements(self, query, args, max_stmt_length, encoding):
+        conn = self._get_db()
+        args = iter(args)
+        first = next(args)
+        format_query = _query_formatter(conn, query, first, self._escape_args)
+        sql = bytearray(format_query(first).encode(encoding, "surrogateescape"))
+        for arg in args:
+            q = format_query(arg).encode(encoding, "surrogateescape")
+            if len(sql) + len(q) + 2 > max_stmt_length:
+                yield sql
+                sql = bytearray(q)
+            else:
+                # The newline ends a trailing "--" or "#" comment of the query.
+                sql += b";\n"
+                sql += q
+        yield sql
+
+    def _build_insert_statements(
         self, prefix, values, postfix, args, max_stmt_length, encoding
     ):
         conn = self._get_db()
@@ -208,24 +300,79 @@ class Cursor:
             postfix = postfix.encode(encoding)
         sql = bytearray(prefix)
         args = iter(args)
-        v = values % escape(next(args), conn)
-        if isinstance(v, str):
-            v = v.encode(encoding, "surrogateescape")
-        sql += v
-        rows = 0
+        first = next(args)
+        format_values = _query_formatter(conn, values, first, escape)
+        sql += format_values(first).encode(encoding, "surrogateescape")
         for arg in args:
-            v = values % escape(arg, conn)
-            if isinstance(v, str):
-                v = v.encode(encoding, "surrogateescape")
+            v = format_values(arg).encode(encoding, "surrogateescape")
             if len(sql) + len(v) + len(postfix) + 1 > max_stmt_length:
-                rows += self.execute(sql + postfix)
+                yield sql + postfix
                 sql = bytearray(prefix)
             else:
                 sql += b","
             sql += v
-        rows += self.execute(sql + postfix)
-        self.rowcount = rows
-        return rows
+        yield sql + postfix
+
+    def load_data(self, table, rows, columns=None, replace=False):
+        """Load rows into a table by LOAD DATA LOCAL INFILE.
+
+        The rows are encoded into CSV while they are sent as the content of a
+        virtual file, so they are not stored in memory nor in a file. It is
+        much faster than :meth:`executemany` for many rows.
+        The connection must be created with ``local_infile=True``.
+
+        :param table: Name of the table.
+        :type table: str
+
+        :param rows: Iterable of sequences of the values of a row.
+
+        :param columns: Names of the columns of the values. None means all
+            columns of the table in order. (optional)
+        :type columns: list of str
+
+        :param replace: Replace the rows having the same unique key instead of
+            skipping them. (default: False)
+        :type replace: bool
+
+        :return: Number of loaded rows.
+        :rtype: int
+
+        Values are escaped like :meth:`execute`. Since the server can't abort
+        LOAD DATA LOCAL INFILE, rows sent before an error raised by the
+        iterable or the escaping may be loaded.
+        """
+        query = self._load_data_query(table, rows, columns, replace)
+        try:
+            return self.execute(query)
+        finally:
+            self._get_db()._load_data_source = None
+
+    def _load_data_query(self, table, rows, columns, replace):
+        """Register the rows to the connection and return the LOAD DATA query."""
+        conn = self._get_db()
+        if not conn._local_infile:
+            raise err.ProgrammingError("load_data() requires local_infile=True")
+        if conn.server_status & SERVER_STATUS.SERVER_STATUS_NO_BACKSLASH_ESCAPES:
+            escaped_by = "''"
+        else:
+            escaped_by = "'\\\\'"
+        query = (
+            f"LOAD DATA LOCAL INFILE '{LOAD_DATA_FILENAME}'"
+            f"{' REPLACE' if replace else ''}"
+            f" INTO TABLE `{_backquote_escape(table)}`"
+            f" CHARACTER SET {charset_by_name(conn.charset).name}"
+            f" FIELDS TERMINATED BY ',' ENCLOSED BY '''' ESCAPED BY {escaped_by}"
+        )
+        if columns:
+            query += " ({})".format(
+                ",".join(f"`{_backquote_escape(c)}`" for c in columns)
+            )
+        packet_size = conn._local_infile_chunk_size()
+        conn._load_data_source = (
+            LOAD_DATA_FILENAME.encode(),
+            _encode_load_data(conn, rows, packet_size),
+        )
+        return query
 
     def callproc(self, procname, args=()):
         """Execute stored procedure procname with args.
@@ -362,6 +509,112 @@ class Cursor:
         return row
 
 
+def _column_encoders(conn, row, binary_prefix=None):
+    """Return the escaping functions of the columns and the fallback function.
+
+    The escaping function of a column is looked up by the type of the value
+    in the first row, instead of dispatching each value by Connection.literal().
+    Values of the other types are escaped by the fallback function.
+    """
+    encoders = {}
+
+    def lookup(type_):
+        encoder = encoders.get(type_)
+        if encoder is None:
+            encoder = encoders[type_] = conn._literal_encoder(type_, binary_prefix)
+        return encoder
+
+    def fallback(v):
+        return lookup(type(v))(v)
+
+    types = [type(v) for v in row]
+    return types, [lookup(t) for t in types], fallback
+
+
+def _query_formatter(conn, query, row, escape_args):
+    """Return a function formatting a row like ``query % escape_args(row, conn)``.
+
+    query is a statement or the ``VALUES (...)`` part of the INSERT statement
+    of :meth:`Cursor.executemany`, and row is the first row.
+    """
+    names = []
+
+    def repl(m):
+        if m.group(0) == "%%":
+            return "%%"
+        names.append(m.group(1))
+        return "%s"
+
+    fmt = RE_PLACEHOLDER.sub(repl, query)
+
+    def format_escaped(row):
+        return query % escape_args(row, conn)
+
+    if "%" in RE_PLACEHOLDER.sub("", query):
+        # Other conversions like %d
+        return format_escaped
+    if isinstance(row, dict):
+        if None in names:
+            return format_escaped
+        columns = names
+        row = [row.get(name) for name in names]
+    elif isinstance(row, (tuple, list)) and len(row) == len(names):
+        if any(names):
+            return format_escaped
+        columns = None
+    else:
+        return format_escaped
+
+    types, encoders, fallback = _column_encoders(conn, row)
+
+    def format_row(row):
+        if columns is None:
+            if not isinstance(row, (tuple, list)) or len(row) != len(types):
+                return format_escaped(row)
+        else:
+            if not isinstance(row, dict):
+                return format_escaped(row)
+            try:
+                row = [row[name] for name in columns]
+            except KeyError:
+                return format_escaped(row)
+        return fmt % tuple(
+            [
+                e(v) if type(v) is t else fallback(v)
+                for v, t, e in zip(row, types, encoders)
+            ]
+        )
+
+    return format_row
+
+
+def _encode_load_data(conn, rows, packet_size):
+    """Encode rows into CSV for LOAD DATA and yield chunks of packet_size."""
+    encoding = conn.encoding
+    types = encoders = fallback = None
+    buf = bytearray()
+    for row in rows:
+        if not isinstance(row, (tuple, list)):
+            row = tuple(row)
+        if types is None:
+            types, encoders, fallback = _column_encoders(conn, row, False)
+        if len(row) == len(types):
+            values = [
+                e(v) if type(v) is t else fallback(v)
+                for v, t, e in zip(row, types, encoders)
+            ]
+        else:
+            values = [fallback(v) for v in row]
+        line = ",".join(values)
+        buf += line.encode(encoding, "surrogateescape")
+        buf += b"\n"
+        while len(buf) >= packet_size:
+            yield bytes(buf[:packet_size])
+            del buf[:packet_size]
+    if buf:
+        yield bytes(buf)
+
+
 class DictCursorMixin:
     # You can override this to use OrderedDict or other dict-like types.
     dict_type = dict
@@ -449,6 +702,32 @@ class SSCursor(Cursor):
         self.rownumber += 1
         return row
 
+    def fetchone_stream(self):
+        """Fetch next row with the value of the last column as a stream.
+
+        The value of the last column is returned as a readable
+        :class:`~pymysql.connections.ColumnStream` of its raw bytes, or None
+        for NULL. It is read from the connection as the stream is read, so
+        large values like LONGBLOB can be copied to files without holding
+        them in memory::
+
+            cur.execute("SELECT name, data FROM files")
+            for name, data in iter(cur.fetchone_stream, None):
+                with open(name, "wb") as f:
+                    shutil.copyfileobj(data, f)
+
+        The stream can be read until the next row is fetched. Other columns
+        are converted like :meth:`fetchone`. The last column must be a string
+        type, like BLOB or TEXT, for :class:`SSPreparedCursor`.
+        """
+        self._check_executed()
+        row = self._result._read_rowdata_stream()
+        if row is None:
+            self.warning_count = self._result.warning_count
+            return None
+        self.rownumber += 1
+        return self._conv_row(row)
+
     def fetchall(self):
         """
         Fetch all, as per MySQLdb. Pretty useless for large queries, as
@@ -465,6 +744,52 @@ class SSCursor(Cursor):
         """
         return iter(self.fetchone, None)
 
+    def fetch_columns(self, size=None):
+        """Fetch the remaining rows, or at most size rows, as columns.
+
+        Returns a list with one sequence per column, in the order of
+        :attr:`description`. Integers and floats are returned in
+        :class:`array.array`, unless the column contains NULL or a custom
+        converter is used. Other values are returned in lists.
+        Empty columns are returned when no rows remain.
+        """
+        self._check_executed()
+        if not self.description:
+            return []
+        columns, count = self._result._read_rowdata_columns(size)
+        self.rownumber += count
+        if not self._result.unbuffered_active:
+            self.warning_count = self._result.warning_count
+        return columns
+
+    def fetch_arrow_batches(self, batch_size=65536):
+        """Fetch the remaining rows as :class:`pyarrow.RecordBatch`.
+
+        Returns an iterator of RecordBatches of at most batch_size rows.
+        All batches have the same schema, which is built from the column
+        types, charsets and flags. Types of columns using custom converters
+        are inferred from the first batch.
+
+        Requires the pyarrow package.
+        """
+        try:
+            from . import _arrow
+        except ImportError:
+            raise RuntimeError("'pyarrow' package is required for fetch_arrow_batches")
+        self._check_executed()
+        if not self.description:
+            return iter(())
+        return self._fetch_arrow_batches(
+            _arrow.BatchConverter(self._result), batch_size
+        )
+
+    def _fetch_arrow_batches(self, converter, batch_size):
+        while True:
+            columns = self.fetch_columns(batch_size)
+            if not len(columns[0]):
+                return
+            yield converter.convert(columns)
+
     def fetchmany(self, size=None):
         """Fetch many."""
         self._check_executed()
@@ -513,3 +838,279 @@ class SSCursor(Cursor):
 
 class SSDictCursor(DictCursorMixin, SSCursor):
     """An unbuffered cursor, which returns results as a dictionary"""
+
+
+class _ColumnarRows:
+    """Read-only sequence of the row tuples of columns."""
+
+    def __init__(self, columns, length):
+        self._columns = columns
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(zip(*[column[index] for column in self._columns]))
+        return tuple(column[index] for column in self._columns)
+
+
+class ColumnarCursor(Cursor):
+    """
+    A buffered cursor which stores results in columns instead of rows.
+
+    Rows are decoded directly into per-column lists or :class:`array.array`
+    without building a tuple for each row. Use :meth:`fetch_columns` to get
+    them. Other fetch methods build the row tuples on demand.
+    """
+
+    _columns = None
+
+    def _query(self, q):
+        conn = self._get_db()
+        self._clear_result()
+        conn.query(q, unbuffered=True)
+        self._do_get_result()
+        return self.rowcount
+
+    def nextset(self):
+        return self._nextset(unbuffered=True)
+
+    def _clear_result(self):
+        super()._clear_result()
+        self._columns = None
+
+    def _do_get_result(self):
+        super()._do_get_result()
+        result = self._result
+        if result.unbuffered_active:
+            self._columns, count = self._read_columns(result)
+            self.rowcount = result.affected_rows = count
+            self.warning_count = result.warning_count
+            self._rows = _ColumnarRows(self._columns, count)
+
+    def _read_columns(self, result):
+        return result._read_rowdata_columns()
+
+    def fetch_columns(self):
+        """Fetch the remaining rows as columns.
+
+        Returns a list with one sequence per column, in the order of
+        :attr:`description`. Integers and floats are returned in
+        :class:`array.array`, unless the column contains NULL or a custom
+        converter is used. Other values are returned in lists.
+        """
+        self._check_executed()
+        columns = self._columns
+        if columns is None:
+            return []
+        if self.rownumber:
+            columns = [column[self.rownumber :] for column in columns]
+        self.rownumber = self.rowcount
+        return columns
+
+    def fetchall(self):
+        """Fetch all the rows."""
+        self._check_executed()
+        if self._rows is None:
+            return []
+        result = self._rows[self.rownumber :]
+        self.rownumber = len(self._rows)
+        return result
+
+
+class NumpyCursor(ColumnarCursor):
+    """
+    A buffered cursor which stores results in NumPy arrays.
+
+    :meth:`fetch_columns` returns an ndarray per column. Integers are
+    int64 (uint64 for BIGINT UNSIGNED), floats are float64, DATETIME and
+    TIMESTAMP are datetime64[us] and DATE is datetime64[D]. They are parsed
+    by NumPy instead of the Python converters. Columns containing NULL are
+    :class:`numpy.ma.MaskedArray`. Other types and columns using custom
+    converters are object arrays.
+
+    Requires the numpy package.
+    """
+
+    def __init__(self, connection):
+        try:
+            from . import _numpy
+        except ImportError:
+            raise RuntimeError("'numpy' package is required for NumpyCursor")
+        self._numpy = _numpy
+        super().__init__(connection)
+
+    def _read_columns(self, result):
+        column_dtype = self._numpy.column_dtype
+        to_ndarray = self._numpy.to_ndarray
+        dtypes = [
+            column_dtype(field, converter)
+            for field, (_, converter) in zip(result.fields, result.converters)
+        ]
+        raw = {i for i, dtype in enumerate(dtypes) if dtype is not None}
+        columns, count = result._read_rowdata_columns(raw=raw)
+        columns = [
+            to_ndarray(column, dtype, converter)
+            for column, dtype, (_, converter) in zip(columns, dtypes, result.converters)
+        ]
+        return columns, count
+
+
+class PreparedCursorMixin:
+    """
+    Execute queries as server-side prepared statements.
+
+    Parameters are sent in the binary protocol instead of being escaped
+    into the query, and rows are received in the binary protocol.
+    The placeholders are the same as :class:`Cursor`; ``%s`` and
+    ``%(name)s`` are converted to ``?`` before preparing the query.
+
+    Statements are kept prepared in :attr:`Connection.statement_cache
+    <pymysql.connections.Connection.statement_cache>`, so executing the
+    same query again costs one round trip.
+
+    A file-like object or an iterator of bytes can be used as a parameter
+    of a large value. It is streamed to the server in chunks of
+    :attr:`Connection.long_data_packet_size
+    <pymysql.connections.Connection.long_data_packet_size>` bytes by
+    COM_STMT_SEND_LONG_DATA, so the whole value is never kept in memory::
+
+        with open("image.png", "rb") as f:
+            cur.execute("INSERT INTO images (data) VALUES (%s)", (f,))
+    """
+
+    #: Statement which is not in the statement cache. It is closed on next execute.
+    _statement = None
+    _statement_key = None
+    _statement_query = None
+    _statement_names = None
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._close_statement()
+
+    def _close_statement(self):
+        statement = self._statement
+        if statement is not None:
+            self._statement = None
+            statement.close()
+
+    def _prepare(self, query, convert):
+        conn = self._get_db()
+        self._close_statement()
+
+        key = (query, convert)
+        if self._statement_key != key:
+            if isinstance(query, (bytes, bytearray)):
+                query = query.decode(conn.encoding, "surrogateescape")
+            names = None
+            if convert:
+                query, names = _convert_placeholders(query)
+            self._statement_key = key
+            self._statement_query = query
+            self._statement_names = names
+
+        query = self._statement_query
+        cache = conn.statement_cache
+        statement = cache.get(query)
+        if statement is None:
+            statement = conn.prepare(query)
+            if not cache.put(query, statement):
+                self._statement = statement
+        return statement
+
+    def _bind_args(self, args):
+        names = self._statement_names
+        if isinstance(args, dict):
+            if None in names:
+                raise TypeError("format requires a mapping")
+            return [args[name] for name in names]
+        if isinstance(args, (tuple, list)):
+            return args
+        return (args,)
+
+    def execute(self, query, args=None):
+        """Execute a query as a prepared statement.
+
+        :param query: Query to execute.
+        :type query: str
+
+        :param args: Parameters used with query. (optional)
+        :type args: tuple, list or dict
+
+        :return: Number of affected rows.
+        :rtype: int
+
+        If args is a list or tuple, %s can be used as a placeholder in the query.
+        If args is a dict, %(name)s can be used as a placeholder in the query.
+        """
+        while self.nextset():
+            pass
+
+        statement = self._prepare(query, args is not None)
+        params = () if args is None else self._bind_args(args)
+        result = self._execute_prepared(statement, params)
+        self._executed = query
+        return result
+
+    def executemany(self, query, args):
+        """Run several data against one query.
+
+        The query is prepared once and executed for each parameters.
+        MariaDB executes many parameters by a command (COM_STMT_BULK_EXECUTE).
+        For other servers, the executions are sent without waiting for
+        the results of the previous ones, except for unbuffered cursors.
+        The parameters are sent in the binary protocol, so they are not
+        limited by :attr:`max_stmt_length`.
+
+        :param query: Query to execute.
+        :type query: str
+
+        :param args: Sequence of sequences or mappings. It is used as parameter.
+        :type args: tuple or list
+
+        :return: Number of rows affected, if any.
+        :rtype: int or None
+        """
+        if not args:
+            return
+
+        if isinstance(self, SSCursor):
+            self.rowcount = sum(self.execute(query, arg) for arg in args)
+            return self.rowcount
+
+        while self.nextset():
+            pass
+
+        conn = self._get_db()
+        statement = self._prepare(query, True)
+        self._clear_result()
+        rowcount = conn._execute_prepared_many(
+            statement, (self._bind_args(arg) for arg in args)
+        )
+        self._do_get_result()
+        self._executed = query
+        self.rowcount = rowcount
+        return rowcount
+
+    def _execute_prepared(self, statement, args, unbuffered=False):
+        conn = self._get_db()
+        self._clear_result()
+        conn._execute_prepared(statement, args, unbuffered=unbuffered)
+        self._do_get_result()
+        return self.rowcount
+
+
+class PreparedCursor(PreparedCursorMixin, Cursor):
+    """A cursor which executes queries as server-side prepared statements"""
+
+
+class SSPreparedCursor(PreparedCursorMixin, SSCursor):
+    """An unbuffered cursor which executes queries as server-side prepared statements"""
+
+    def _execute_prepared(self, statement, args):
+        return super()._execute_prepared(statement, args, unbuffered=True)
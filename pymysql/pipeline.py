@@ -0,0 +1,155 @@
+"""
+Queries sent without waiting for the results of the previous ones
+"""
+
+from . import err
+from .constants import COMMAND
+from .cursors import ColumnarCursor, PreparedCursorMixin, SSCursor
+from .protocol import _has_long_data
+
+
+class Pipeline:
+    """
+    Queries sent at once and read in order.
+
+    Do not create an instance of a Pipeline yourself. Call
+    :py:meth:`Connection.pipeline() <pymysql.connections.Connection.pipeline>`.
+
+    :py:meth:`execute` returns a cursor without executing the query.
+    :py:meth:`run` sends the queries and reads their results into the cursors,
+    so a batch of independent queries takes about one round trip.
+
+    Each query is executed even when the previous queries fail. Only the first
+    result of each query is kept; the results of the following statements
+    of multiple statements are discarded.
+    LOAD DATA LOCAL INFILE and streamed parameters of prepared statements
+    can't be used in a pipeline.
+
+    Example::
+
+        with conn.pipeline() as pipe:
+            users = pipe.execute("SELECT * FROM users WHERE id=%s", (1,))
+            orders = pipe.execute("SELECT * FROM orders WHERE user_id=%s", (1,))
+        print(users.fetchall(), orders.fetchall())
+    """
+
+    #: Max bytes of the queries sent before their results are read.
+    #:
+    #: The server doesn't read queries while it is blocked in sending results.
+    #: Sending too many queries at once may block both of the client and
+    #: the server when the socket buffers are full.
+    max_pending_bytes = 65536
+
+    def __init__(self, connection, cursor=None):
+        if cursor is None:
+            cursor = connection.cursorclass
+        if issubclass(cursor, SSCursor):
+            raise err.NotSupportedError("Unbuffered cursors can't be pipelined")
+        self.connection = connection
+        self.cursorclass = cursor
+        # (cursor, query, command, data)
+        self._queue = []
+        # Prepared statements of the queue. They are pinned not to be closed
+        # by the eviction from the statement cache until the queue is sent.
+        self._statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        del exc_info
+        if exc_type is None:
+            self.run()
+        else:
+            self._queue.clear()
+            self._release_statements()
+
+    def execute(self, query, args=None):
+        """
+        Add a query to the pipeline.
+
+        :param query: Query to execute.
+        :type query: str
+
+        :param args: Parameters used with query. (optional)
+        :type args: tuple, list or dict
+
+        :return: Cursor which has the result after :py:meth:`run`.
+        """
+        conn = self.connection
+        cursor = conn.cursor(self.cursorclass)
+        if isinstance(cursor, PreparedCursorMixin):
+            if args is not None and _has_long_data(args):
+                raise err.NotSupportedError("Streamed parameters can't be pipelined")
+            # The statement may be prepared here. It takes a round trip
+            # unless the statement is in the statement cache.
+            statement = cursor._prepare(query, args is not None)
+            params = () if args is None else cursor._bind_args(args)
+            command = COMMAND.COM_STMT_EXECUTE
+            data = conn._stmt_execute_data(statement, params)
+            statement._pin()
+            self._statements.append(statement)
+        else:
+            command = COMMAND.COM_QUERY
+            data = cursor.mogrify(query, args).encode(conn.encoding, "surrogateescape")
+        self._queue.append((cursor, query, command, data))
+        return cursor
+
+    def run(self):
+        """
+        Send the queries and read their results.
+
+        :return: List of the cursors in order of :py:meth:`execute`.
+
+        :raise Error: The first error of the queries, after all results are read.
+        """
+        queue = self._queue
+        self._queue = []
+        conn = self.connection
+        max_pending = self.max_pending_bytes
+        error = None
+        sent = pending = 0
+        try:
+            for received, (cursor, query, _, data) in enumerate(queue):
+                while sent < len(queue) and (sent == received or pending < max_pending):
+                    _, _, command, next_data = queue[sent]
+                    conn._execute_command(command, next_data)
+                    pending += len(next_data)
+                    sent += 1
+                # Responses of the pipelined commands start from sequence id 1.
+                conn._next_seq_id = 1
+                try:
+                    self._read_result(cursor, query)
+                except err.MySQLError as e:
+                    if conn._sock is None:
+                        raise
+                    if error is None:
+                        error = e
+                pending -= len(data)
+        except BaseException:
+            # The responses of the remaining queries can't be read any more.
+            conn._force_close()
+            raise
+        finally:
+            self._release_statements()
+        if error is not None:
+            raise error
+        return [item[0] for item in queue]
+
+    def _release_statements(self):
+        statements = self._statements
+        self._statements = []
+        for statement in statements:
+            statement._unpin()
+
+    def _read_result(self, cursor, query):
+        conn = self.connection
+        cursor._clear_result()
+        conn._affected_rows = conn._read_query_result(
+            unbuffered=isinstance(cursor, ColumnarCursor),
+            binary=isinstance(cursor, PreparedCursorMixin),
+        )
+        cursor._do_get_result()
+        cursor._executed = query
+        while conn._result.has_next:
+            conn.next_result()
@@ -0,0 +1,301 @@
+"""
+Thread-safe connection pool
+"""
+
+import collections
+import contextlib
+import threading
+import time
+
+from . import err
+from .connections import Connection
+from .constants import SERVER_STATUS
+
+_DEFAULT = object()
+
+
+class PoolTimeoutError(err.OperationalError):
+    """Raised when no connection is available within the timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of :py:class:`~pymysql.connections.Connection`.
+
+    :param min_size: Number of connections opened when the pool is created.
+        Idle connections are not closed by ``max_idle_time`` below this number.
+    :param max_size: Max number of connections, both in use and idle.
+    :param timeout: Default seconds to wait for a connection in
+        :py:meth:`get_connection` when ``max_size`` connections are in use.
+        None waits forever.
+    :param max_idle_time: Seconds after which idle connections are closed.
+        None keeps them.
+    :param max_lifetime: Seconds after which connections are closed instead of
+        reused. None keeps them.
+    :param ping_interval: Connections idle longer than this seconds are checked
+        by :py:meth:`~pymysql.connections.Connection.ping` before they are
+        returned by :py:meth:`get_connection`. 0 checks always and None never.
+    :param reset_session: If true, :py:meth:`release` resets the session state
+        by :py:meth:`~pymysql.connections.Connection.reset` instead of rolling
+        back the transaction.
+    :param kwargs: Arguments of :py:class:`~pymysql.connections.Connection`.
+
+    Idle and expired connections are closed when connections are got or
+    released. The pool has no background thread.
+
+    Example::
+
+        pool = ConnectionPool(max_size=20, host="localhost", user="user")
+        with pool.connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT 1")
+    """
+
+    def __init__(
+        self,
+        *,
+        min_size=0,
+        max_size=10,
+        timeout=None,
+        max_idle_time=600,
+        max_lifetime=None,
+        ping_interval=1,
+        reset_session=False,
+        **kwargs,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size should be >= 1")
+        if not (0 <= min_size <= max_size):
+            raise ValueError("min_size should be >= 0 and <= max_size")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+        self.reset_session = reset_session
+        self._kwargs = kwargs
+
+        self._cond = threading.Condition()
+        # (connection, released time) in order of release.
+        self._idle = collections.deque()
+        # Connected time of the connections of the pool.
+        self._created = {}
+        # Connections returned by get_connection() and not released yet.
+        self._in_use = set()
+        # Number of connections including the ones being connected.
+        self._size = 0
+        self._closed = False
+
+        try:
+            for _ in range(min_size):
+                with self._cond:
+                    self._size += 1
+                conn = self._connect()
+                with self._cond:
+                    self._idle.append((conn, time.monotonic()))
+        except BaseException:
+            # The caller has no pool to close the opened connections.
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        del exc_info
+        self.close()
+
+    @property
+    def size(self):
+        """Number of connections, both in use and idle."""
+        return self._size
+
+    @property
+    def idle(self):
+        """Number of idle connections."""
+        return len(self._idle)
+
+    def _connect(self):
+        try:
+            conn = Connection(**self._kwargs)
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created[conn] = time.monotonic()
+        return conn
+
+    def _expired(self, conn, now):
+        return (
+            self.max_lifetime is not None
+            and now - self._created[conn] > self.max_lifetime
+        )
+
+    def _discard(self, conn):
+        # Must be called with the lock.
+        del self._created[conn]
+        self._size -= 1
+        self._cond.notify()
+
+    def _evict(self, now):
+        """Remove idle connections to close. Must be called with the lock."""
+        evicted = []
+        kept = []
+        # All connections are checked because they are in order of release,
+        # while max_lifetime is measured from their creation.
+        # The oldest released connections are at the left.
+        for conn, released in self._idle:
+            if self._expired(conn, now) or (
+                self.max_idle_time is not None
+                and now - released > self.max_idle_time
+                and self._size > self.min_size
+            ):
+                self._discard(conn)
+                evicted.append(conn)
+            else:
+                kept.append((conn, released))
+        if evicted:
+            self._idle.clear()
+            self._idle.extend(kept)
+        return evicted
+
+    def get_connection(self, timeout=_DEFAULT):
+        """
+        Get a connection from the pool.
+
+        A new connection is opened when no connection is idle and the pool has
+        less than ``max_size`` connections.
+
+        :param timeout: Seconds to wait for a connection. Defaults to the
+            ``timeout`` of the pool.
+
+        :raise PoolTimeoutError: If no connection is available within timeout.
+        """
+        if timeout is _DEFAULT:
+            timeout = self.timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                evicted = self._evict(time.monotonic())
+            for c in evicted:
+                _close(c)
+
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise err.Error("Pool is closed")
+                    if self._idle or self._size < self.max_size:
+                        break
+                    if deadline is None:
+                        self._cond.wait()
+                        continue
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"No connection is available in {timeout} seconds"
+                        )
+                    self._cond.wait(remaining)
+                if not self._idle:
+                    self._size += 1
+                    conn = None
+                else:
+                    conn, released = self._idle.pop()
+
+            if conn is None:
+                conn = self._connect()
+            elif not self._is_alive(conn, released):
+                with self._cond:
+                    self._discard(conn)
+                _close(conn)
+                continue
+            with self._cond:
+                self._in_use.add(conn)
+            return conn
+
+    def _is_alive(self, conn, released):
+        now = time.monotonic()
+        if self._expired(conn, now):
+            return False
+        if self.ping_interval is None or now - released < self.ping_interval:
+            return conn.open
+        try:
+            conn.ping(reconnect=False)
+        except err.Error:
+            return False
+        return True
+
+    def release(self, conn):
+        """
+        Return the connection to the pool.
+
+        The transaction in progress is rolled back, or the session is reset
+        when ``reset_session`` is true. The connection is closed
+        when it is broken or expired, or the pool is closed.
+
+        :raise ValueError: If the connection is not in use, e.g. released twice.
+        """
+        now = time.monotonic()
+        with self._cond:
+            if conn not in self._created:
+                raise ValueError("The connection is not of this pool")
+            if conn not in self._in_use:
+                raise ValueError("The connection is already released")
+            self._in_use.remove(conn)
+            keep = conn.open and not self._closed and not self._expired(conn, now)
+        try:
+            if keep and self.reset_session:
+                conn.reset()
+            elif keep and conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+                conn.rollback()
+        except err.Error:
+            keep = False
+        with self._cond:
+            if keep:
+                self._idle.append((conn, now))
+                self._cond.notify()
+            else:
+                self._discard(conn)
+            evicted = self._evict(now)
+        if not keep:
+            _close(conn)
+        for c in evicted:
+            _close(c)
+
+    @contextlib.contextmanager
+    def connection(self, timeout=_DEFAULT):
+        """
+        Context manager getting a connection and releasing it at the end.
+
+        See :py:meth:`get_connection`.
+        """
+        conn = self.get_connection(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """
+        Close the idle connections.
+
+        Connections in use are closed when they are released.
+        """
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            for conn in idle:
+                self._discard(conn)
+            self._cond.notify_all()
+        for conn in idle:
+            _close(conn)
+
+
+def _close(conn):
+    if conn.open:
+        try:
+            conn.close()
+        except err.Error:
+            pass
@@ -3,10 +3,11 @@
 
 import struct
 import sys
+from collections.abc import Iterator
 
 from . import err
 from .charset import MBLENGTH
-from .constants import FIELD_TYPE, SERVER_STATUS
+from .constants import FIELD_TYPE, SERVER_STATUS, SESSION_TRACK
 
 DEBUG = False
 
@@ -43,6 +44,27 @@ def dump_packet(data):  # pragma: no cover
     print()
 
 
+def _is_long_data(value):
+    """Return True if the parameter is streamed by COM_STMT_SEND_LONG_DATA.
+
+    File-like objects and iterators of bytes are streamed. Containers like
+    list are not, so they are rejected like other unsupported types.
+    """
+    return hasattr(value, "read") or isinstance(value, Iterator)
+
+
+def _has_long_data(args):
+    """Return True if the parameters of a query have a streamed one.
+
+    args may be a sequence or a dict of parameters, or a single parameter.
+    """
+    if isinstance(args, dict):
+        args = args.values()
+    elif not isinstance(args, (tuple, list)):
+        args = (args,)
+    return any(_is_long_data(arg) for arg in args)
+
+
 class MysqlPacket:
     """Representation of a MySQL response packet.
 
@@ -58,6 +80,11 @@ class MysqlPacket:
     def get_all_data(self):
         return self._data
 
+    @property
+    def position(self):
+        """Position of the cursor in the data buffer."""
+        return self._position
+
     def read(self, size):
         """Read the first 'size' bytes in packet and advance cursor past them."""
         result = self._data[self._position : (self._position + size)]
@@ -82,6 +109,9 @@ class MysqlPacket:
         self._position = None  # ensure no subsequent read()
         return result
 
+    def has_remaining_data(self):
+        return self._position < len(self._data)
+
     def advance(self, length):
         """Advance the cursor in data buffer 'length' bytes."""
         new_position = self._position + length
@@ -133,6 +163,36 @@ class MysqlPacket:
         self._position += 8
         return result
 
+    def read_int8(self):
+        result = struct.unpack_from("<b", self._data, self._position)[0]
+        self._position += 1
+        return result
+
+    def read_int16(self):
+        result = struct.unpack_from("<h", self._data, self._position)[0]
+        self._position += 2
+        return result
+
+    def read_int32(self):
+        result = struct.unpack_from("<i", self._data, self._position)[0]
+        self._position += 4
+        return result
+
+    def read_int64(self):
+        result = struct.unpack_from("<q", self._data, self._position)[0]
+        self._position += 8
+        return result
+
+    def read_float(self):
+        result = struct.unpack_from("<f", self._data, self._position)[0]
+        self._position += 4
+        return result
+
+    def read_double(self):
+        result = struct.unpack_from("<d", self._data, self._position)[0]
+        self._position += 8
+        return result
+
     def read_string(self):
         end_pos = self._data.find(b"\0", self._position)
         if end_pos < 0:
@@ -187,6 +247,12 @@ class MysqlPacket:
         # If \xFE is LengthEncodedInteger header, 8bytes followed.
         return self._data[0] == 0xFE and len(self._data) < 9
 
+    def is_eof_ok_packet(self):
+        # https://dev.mysql.com/doc/dev/mysql-server/latest/page_protocol_basic_ok_packet.html
+        # With CLIENT_DEPRECATE_EOF, OK packet with 0xFE header terminates result set.
+        # \xFE header of a row means a string longer than 16MB follows.
+        return self._data[0] == 0xFE and len(self._data) < 0xFFFFFF
+
     def is_auth_switch_request(self):
         # http://dev.mysql.com/doc/internals/en/connection-phase-packets.html#packet-Protocol::AuthSwitchRequest
         return self._data[0] == 0xFE
@@ -275,6 +341,31 @@ class FieldDescriptorPacket(MysqlPacket):
         return f"{self.__class__} {self.db!r}.{self.table_name!r}.{self.name!r}, type={self.type_code}, flags={self.flags:x}"
 
 
+def parse_session_state(data):
+    """Parse the session state information of an OK packet.
+
+    Return a list of (type, value). Type is one of constants.SESSION_TRACK.
+    Value is (name, value) for SYSTEM_VARIABLES, the raw data for unknown
+    types, and a bytes string for the others.
+    """
+    changes = []
+    packet = MysqlPacket(data, None)
+    while packet.has_remaining_data():
+        type_ = packet.read_uint8()
+        item = MysqlPacket(packet.read_length_coded_string(), None)
+        if type_ == SESSION_TRACK.SYSTEM_VARIABLES:
+            value = (item.read_length_coded_string(), item.read_length_coded_string())
+        elif type_ == SESSION_TRACK.GTIDS:
+            item.advance(1)  # encoding specification
+            value = item.read_length_coded_string()
+        elif type_ <= SESSION_TRACK.TRANSACTION_STATE:
+            value = item.read_length_coded_string()
+        else:
+            value = item.read_all()
+        changes.append((type_, value))
+    return changes
+
+
 class OKPacketWrapper:
     """
     OK Packet Wrapper. It uses an existing packet object, and wraps
@@ -282,8 +373,8 @@ class OKPacketWrapper:
     to the original packet objects variables and methods.
     """
 
-    def __init__(self, from_packet):
-        if not from_packet.is_ok_packet():
+    def __init__(self, from_packet, session_track=False):
+        if not (from_packet.is_ok_packet() or from_packet.is_eof_ok_packet()):
             raise ValueError(
                 "Cannot create "
                 + str(self.__class__.__name__)
@@ -296,7 +387,21 @@ class OKPacketWrapper:
         self.affected_rows = self.packet.read_length_encoded_integer()
         self.insert_id = self.packet.read_length_encoded_integer()
         self.server_status, self.warning_count = self.read_struct("<HH")
-        self.message = self.packet.read_all()
+        #: List of (type, value) of the session state changes.
+        #: See :py:func:`parse_session_state` for values.
+        self.session_state_changes = []
+        if not session_track:
+            self.message = self.packet.read_all()
+        else:
+            # With CLIENT_SESSION_TRACK, the message is a length coded string
+            # omitted when it is empty and no session state follows.
+            self.message = b""
+            if self.packet.has_remaining_data():
+                self.message = self.packet.read_length_coded_string()
+            if self.server_status & SERVER_STATUS.SERVER_SESSION_STATE_CHANGED:
+                self.session_state_changes = parse_session_state(
+                    self.packet.read_length_coded_string()
+                )
         self.has_next = self.server_status & SERVER_STATUS.SERVER_MORE_RESULTS_EXISTS
 
     def __getattr__(self, key):
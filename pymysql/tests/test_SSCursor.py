@@ -227,6 +227,35 @@ class TestSSCursor(base.PyMySQLTestCase):
         self.assertEqual(len(rows), 1)
         self.assertEqual(cur.warning_count, 1)
 
+    def test_fetchone_stream(self):
+        con = self.connect()
+        for cursor_type in (pymysql.cursors.SSCursor, pymysql.cursors.SSPreparedCursor):
+            cur = con.cursor(cursor_type)
+            cur.execute(
+                "SELECT 1, REPEAT('ab', 1024 * 1024) UNION ALL"
+                " SELECT 2, NULL UNION ALL SELECT 3, 'foo' UNION ALL SELECT 4, ''"
+            )
+            i, data = cur.fetchone_stream()
+            self.assertEqual((1, 2 * 1024 * 1024), (i, data.length))
+            self.assertEqual(b"ab" * 50000, data.read(100000))
+            self.assertEqual(b"ab" * (1024 * 1024 - 50000), data.read())
+            self.assertEqual(b"", data.read())
+            self.assertEqual((2, None), cur.fetchone_stream())
+            i, data = cur.fetchone_stream()
+            self.assertEqual(b"f", data.read(1))
+            # The rest of the value is skipped.
+            self.assertEqual((4, ""), cur.fetchone())
+            with self.assertRaises(ValueError):
+                data.read()
+            self.assertIsNone(cur.fetchone_stream())
+
+            cur.execute("SELECT REPEAT('x', 100000) UNION ALL SELECT 'y'")
+            self.assertEqual(b"x" * 100, cur.fetchone_stream()[0].read(100))
+            with pytest.warns(UserWarning):
+                cur.execute("SELECT 1")
+            self.assertEqual((1,), cur.fetchone())
+            cur.close()
+
 
 __all__ = ["TestSSCursor"]
 
@@ -0,0 +1,85 @@
+import array
+import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+import pymysql.cursors
+from pymysql.constants import FIELD_TYPE, FLAG
+from pymysql.converters import convert_datetime
+from pymysql.tests import base
+
+pyarrow = pytest.importorskip("pyarrow")
+
+from pymysql import _arrow
+
+
+def _field(name, type_code, flags=0, length=0, scale=0):
+    return SimpleNamespace(
+        name=name, type_code=type_code, flags=flags, length=length, scale=scale
+    )
+
+
+def test_batch_converter():
+    result = SimpleNamespace(
+        fields=[
+            _field("i", FIELD_TYPE.LONG, FLAG.NOT_NULL),
+            _field("u", FIELD_TYPE.LONGLONG, FLAG.UNSIGNED),
+            _field("d", FIELD_TYPE.NEWDECIMAL, length=12, scale=2),
+            _field("dt", FIELD_TYPE.DATETIME),
+            _field("s", FIELD_TYPE.VAR_STRING),
+            _field("b", FIELD_TYPE.BLOB),
+        ],
+        converters=[
+            ("ascii", int),
+            ("ascii", int),
+            ("ascii", Decimal),
+            ("ascii", convert_datetime),
+            ("utf-8", None),
+            (None, None),
+        ],
+    )
+    converter = _arrow.BatchConverter(result)
+    batch = converter.convert(
+        [
+            array.array("l", [1, 2]),
+            [2**64 - 1, None],
+            [Decimal("12345678.12"), None],
+            [datetime.datetime(2024, 1, 2), "0000-00-00 00:00:00"],
+            ["a", None],
+            [b"\x00", None],
+        ]
+    )
+    schema = batch.schema
+    assert schema.field("i").type == pyarrow.int32()
+    assert not schema.field("i").nullable
+    assert schema.field("u").type == pyarrow.uint64()
+    assert schema.field("d").type == pyarrow.decimal128(10, 2)
+    assert schema.field("dt").type == pyarrow.timestamp("us")
+    assert schema.field("s").type == pyarrow.string()
+    assert schema.field("b").type == pyarrow.binary()
+    assert batch.to_pylist()[1] == {
+        "i": 2,
+        "u": None,
+        "d": None,
+        "dt": None,
+        "s": None,
+        "b": None,
+    }
+    assert converter.convert([array.array("l"), [], [], [], [], []]).schema == schema
+
+
+class TestArrowBatches(base.PyMySQLTestCase):
+    def test_fetch_arrow_batches(self):
+        conn = self.connect()
+        for cursor_type in (pymysql.cursors.SSCursor, pymysql.cursors.SSPreparedCursor):
+            cur = conn.cursor(cursor_type)
+            cur.execute("SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3")
+            batches = list(cur.fetch_arrow_batches(2))
+            self.assertEqual([2, 1], [batch.num_rows for batch in batches])
+            self.assertEqual(batches[0].schema, batches[1].schema)
+            self.assertEqual(
+                [1, 2, 3], pyarrow.Table.from_batches(batches).column(0).to_pylist()
+            )
+            cur.close()
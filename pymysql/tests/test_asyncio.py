@@ -0,0 +1,197 @@
+import asyncio
+import os
+import struct
+
+import pytest
+
+import pymysql
+from pymysql.asyncio import (
+    AsyncConnection,
+    AsyncDictCursor,
+    _InputBuffer,
+    _next_packet,
+    connect,
+)
+from pymysql.constants import CLIENT
+from pymysql.tests import base
+
+
+def _packet(payload, seq=0):
+    return struct.pack("<I", len(payload))[:3] + bytes([seq]) + payload
+
+
+def test_next_packet():
+    data = bytearray(_packet(b"\x00\x00\x00\x02\x00\x00\x00") + _packet(b"abc", 1))
+    assert _next_packet(data, 0) == (4, 7, 11)
+    assert _next_packet(data, 11) == (15, 3, 18)
+    assert _next_packet(data, 18) is None
+    assert _next_packet(data[:-1], 11) is None
+
+
+def test_next_packet_large():
+    large = b"\xfe" * 0xFFFFFF
+    data = bytearray(_packet(large) + _packet(b"\xff", 1))
+    assert _next_packet(data, 0) == (4, 0xFFFFFF, len(data))
+    assert _next_packet(data[:-1], 0) is None
+
+
+def test_input_buffer():
+    buffer = _InputBuffer()
+    buffer.data += _packet(b"hello")
+    assert buffer.unpack(struct.Struct("<HBB")) == (5, 0, 0)
+    assert buffer.read(5) == b"hello"
+    with pytest.raises(EOFError):
+        buffer.read(1)
+    with pytest.raises(EOFError):
+        buffer.unpack(struct.Struct("<HBB"))
+    buffer.end = len(buffer.data)
+    buffer.data += b"rest"
+    buffer.compact()
+    assert (buffer.data, buffer.position, buffer.end) == (b"rest", 0, 0)
+    buffer.close()
+    assert buffer.closed
+
+
+def test_sync_with():
+    conn = AsyncConnection()
+    with pytest.raises(TypeError):
+        conn.__enter__()
+    assert not conn.open
+
+
+class TestAsyncConnection(base.PyMySQLTestCase):
+    def run_async(self, func, **params):
+        p = self.databases[0].copy()
+        p.update(params)
+
+        async def run():
+            async with await connect(**p) as conn:
+                await func(conn)
+
+        asyncio.run(run())
+
+    def test_execute(self):
+        async def func(conn):
+            cur = conn.cursor()
+            await cur.execute("SELECT %s, %s", (1, "foo"))
+            self.assertEqual(((1, "foo"),), cur.fetchall())
+            with self.assertRaises(pymysql.ProgrammingError):
+                await cur.execute("SELEKT 1")
+            await cur.execute("SELECT 2")
+            self.assertEqual((2,), cur.fetchone())
+
+            cur = conn.cursor(AsyncDictCursor)
+            await cur.execute("SELECT 1 AS a")
+            self.assertEqual([{"a": 1}], cur.fetchall())
+
+        self.run_async(func)
+
+    def test_multi_statements(self):
+        async def func(conn):
+            cur = conn.cursor()
+            await cur.execute("SELECT 1; SELECT 2, 3; DO 4")
+            self.assertEqual(((1,),), cur.fetchall())
+            self.assertTrue(cur.nextset())
+            self.assertEqual(((2, 3),), cur.fetchall())
+            self.assertTrue(cur.nextset())
+            self.assertFalse(cur.nextset())
+
+        self.run_async(func, client_flag=CLIENT.MULTI_STATEMENTS)
+
+    def test_transaction(self):
+        async def func(conn):
+            cur = conn.cursor()
+            await cur.execute("DROP TABLE IF EXISTS test_asyncio")
+            await cur.execute("CREATE TABLE test_asyncio (a INT, b VARCHAR(10))")
+            try:
+                await conn.begin()
+                await cur.executemany(
+                    "INSERT INTO test_asyncio VALUES (%s, %s)", [(1, "a"), (2, "b")]
+                )
+                self.assertEqual(2, cur.rowcount)
+                await conn.rollback()
+                await cur.executemany(
+                    "INSERT INTO test_asyncio VALUES (%s, %s)", [(3, "c"), (4, "d")]
+                )
+                await conn.commit()
+                await cur.execute("SELECT a FROM test_asyncio ORDER BY a")
+                self.assertEqual(((3,), (4,)), cur.fetchall())
+            finally:
+                await cur.execute("DROP TABLE test_asyncio")
+
+        self.run_async(func)
+
+    def test_load_local(self):
+        filename = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)), "data", "load_local_data.txt"
+        )
+
+        async def func(conn):
+            cur = conn.cursor()
+            await cur.execute("DROP TABLE IF EXISTS test_asyncio")
+            await cur.execute("CREATE TABLE test_asyncio (a INTEGER, b INTEGER)")
+            try:
+                await cur.execute(
+                    f"LOAD DATA LOCAL INFILE '{filename}' INTO TABLE test_asyncio"
+                    " FIELDS TERMINATED BY ','"
+                )
+                await cur.execute("SELECT COUNT(*) FROM test_asyncio")
+                self.assertEqual(22749, cur.fetchone()[0])
+                with self.assertRaises(pymysql.OperationalError):
+                    await cur.execute(
+                        "LOAD DATA LOCAL INFILE 'no_data.txt' INTO TABLE test_asyncio"
+                    )
+                await conn.ping()
+            finally:
+                await cur.execute("DROP TABLE test_asyncio")
+
+        self.run_async(func, local_infile=True)
+
+    def test_reset_and_change_user(self):
+        params = self.databases[0]
+
+        async def func(conn):
+            cur = conn.cursor()
+            await cur.execute("SET @a = 1")
+            await conn.reset()
+            await cur.execute("SELECT @a, DATABASE()")
+            self.assertEqual((None, params["database"]), cur.fetchone())
+
+            password = params.get("password", params.get("passwd", ""))
+            await conn.change_user(params["user"], password, None)
+            await cur.execute("SELECT DATABASE()")
+            self.assertEqual((None,), cur.fetchone())
+
+        self.run_async(func)
+
+    def test_pipeline(self):
+        async def func(conn):
+            async with conn.pipeline() as pipe:
+                cur = pipe.execute("SELECT %s", (1,))
+            self.assertEqual(((1,),), cur.fetchall())
+
+            pipe = conn.pipeline()
+            cur1 = pipe.execute("SELECT %s", (1,))
+            cur2 = pipe.execute("SELEKT 2")
+            cur3 = pipe.execute("SELECT 3")
+            with self.assertRaises(pymysql.ProgrammingError):
+                await pipe.run()
+            self.assertEqual(((1,),), cur1.fetchall())
+            self.assertIsNone(cur2.description)
+            self.assertEqual(((3,),), cur3.fetchall())
+
+        self.run_async(func)
+
+    def test_concurrent_queries(self):
+        p = self.databases[0].copy()
+
+        async def query(i):
+            async with await connect(**p) as conn:
+                cur = conn.cursor()
+                await cur.execute("SELECT SLEEP(0.1), %s", (i,))
+                return cur.fetchone()[1]
+
+        async def run():
+            return await asyncio.gather(*(query(i) for i in range(10)))
+
+        self.assertEqual(list(range(10)), asyncio.run(run()))
@@ -454,3 +454,20 @@ age = values(age)"""
         )
         cursor.execute("commit")
         self._verify_records(data)
+
+
+def test_text_row_decoder():
+    decode_row = pymysql.connections._text_row_decoder(
+        [("ascii", int), ("utf-8", None), (None, None), ("ascii", float), (None, None)]
+    )
+    data = b"\x0242\x03\xe3\x81\x82\xfb\x03" + b"1.5" + b"\xfc\x00\x01" + b"x" * 256
+    assert decode_row(data) == (42, "あ", None, 1.5, b"x" * 256)
+    # Rows may have fewer columns. See https://github.com/PyMySQL/PyMySQL/pull/434
+    assert decode_row(b"\x0242") == (42,)
+
+    # Strings converted by int() are decoded first.
+    decode_row = pymysql.connections._text_row_decoder(
+        [("utf-16-be", int), ("utf-8", int)]
+    )
+    data = b"\x04" + "42".encode("utf-16-be") + b"\x04" + "٤٢".encode()
+    assert decode_row(data) == (42, 42)
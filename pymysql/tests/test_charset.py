@@ -1,4 +1,5 @@
 import pymysql.charset
+import pymysql.connections
 
 
 def test_utf8():
@@ -42,3 +43,23 @@ def test_case_sensitivity():
     # lowercase and mixed case should resolve to the same charset
     mixedcase_latin1 = pymysql.charset.charset_by_name("LaTiN1")
     assert mixedcase_latin1 == lowercase_latin1
+
+
+def test_collation():
+    utf8mb4_bin = pymysql.charset.charset_by_collation("UTF8MB4_BIN")
+    assert (utf8mb4_bin.id, utf8mb4_bin.name) == (46, "utf8mb4")
+    assert pymysql.charset.charset_by_collation("utf8mb4_unknown") is None
+
+
+def test_need_set_names():
+    def conn(**kwargs):
+        return pymysql.connections.Connection(user="root", defer_connect=True, **kwargs)
+
+    assert conn()._need_set_names()
+    c = conn(collation="utf8mb4_bin")
+    assert c._handshake_charset().id == 46
+    assert not c._need_set_names()
+    assert conn(collation="utf8mb4_bin", force_set_names=True)._need_set_names()
+    c = conn(charset="latin1", collation="utf8mb4_bin")
+    assert c._handshake_charset().id == 8
+    assert c._need_set_names()
@@ -0,0 +1,75 @@
+import array
+
+import pymysql.cursors
+from pymysql.tests import base
+
+
+def test_columnar_rows():
+    rows = pymysql.cursors._ColumnarRows([array.array("q", [1, 2, 3]), "abc"], 3)
+    assert len(rows) == 3
+    assert rows[1] == (2, "b")
+    assert rows[1:] == [(2, "b"), (3, "c")]
+
+
+class TestColumnarCursor(base.PyMySQLTestCase):
+    def setUp(self):
+        super().setUp()
+        self.conn = conn = self.connect()
+        self.safe_create_table(
+            conn,
+            "test_columnar",
+            """CREATE TABLE test_columnar (
+                i INT, u BIGINT UNSIGNED, t TINYINT, f DOUBLE, s VARCHAR(32)
+            )""",
+        )
+        cur = conn.cursor()
+        cur.executemany(
+            "INSERT INTO test_columnar VALUES (%s, %s, %s, %s, %s)",
+            [(i, 2**64 - 1 - i, -i, i / 2, str(i)) for i in range(10)],
+        )
+        cur.close()
+
+    def test_fetch_columns(self):
+        cur = self.conn.cursor(pymysql.cursors.ColumnarCursor)
+        cur.execute("SELECT * FROM test_columnar ORDER BY i")
+        self.assertEqual(10, cur.rowcount)
+        i, u, t, f, s = cur.fetch_columns()
+        self.assertEqual(array.array("l", range(10)), i)
+        self.assertEqual(array.array("Q", [2**64 - 1 - i for i in range(10)]), u)
+        self.assertEqual(array.array("b", range(0, -10, -1)), t)
+        self.assertEqual(array.array("d", [i / 2 for i in range(10)]), f)
+        self.assertEqual([str(i) for i in range(10)], s)
+        self.assertEqual([[], []], cur.fetch_columns()[3:])
+
+    def test_rows(self):
+        cur = self.conn.cursor(pymysql.cursors.ColumnarCursor)
+        cur.execute("SELECT i, s FROM test_columnar ORDER BY i")
+        self.assertEqual((0, "0"), cur.fetchone())
+        self.assertEqual([(1, "1"), (2, "2")], cur.fetchmany(2))
+        self.assertEqual([array.array("l", range(3, 10))], cur.fetch_columns()[:1])
+        self.assertIsNone(cur.fetchone())
+
+    def test_null(self):
+        cur = self.conn.cursor(pymysql.cursors.ColumnarCursor)
+        cur.execute("SELECT IF(i = 5, NULL, i) FROM test_columnar ORDER BY i")
+        self.assertEqual([[0, 1, 2, 3, 4, None, 6, 7, 8, 9]], cur.fetch_columns())
+
+    def test_ok_packet(self):
+        cur = self.conn.cursor(pymysql.cursors.ColumnarCursor)
+        self.assertEqual(1, cur.execute("DELETE FROM test_columnar WHERE i = 0"))
+        self.assertEqual([], cur.fetch_columns())
+
+    def test_sscursor(self):
+        for cursor_type in (pymysql.cursors.SSCursor, pymysql.cursors.SSPreparedCursor):
+            cur = self.conn.cursor(cursor_type)
+            cur.execute("SELECT i, s FROM test_columnar ORDER BY i")
+            self.assertEqual(
+                [array.array("l", [0, 1, 2]), ["0", "1", "2"]], cur.fetch_columns(3)
+            )
+            self.assertEqual((3, "3"), cur.fetchone())
+            i, s = cur.fetch_columns()
+            self.assertEqual(array.array("l", range(4, 10)), i)
+            self.assertEqual([str(i) for i in range(4, 10)], s)
+            self.assertEqual([array.array("l"), []], cur.fetch_columns())
+            self.assertEqual(10, cur.rownumber)
+            cur.close()
@@ -0,0 +1,65 @@
+import io
+
+import pytest
+
+import pymysql
+from pymysql import _compress
+from pymysql.tests import base
+
+
+def _roundtrip(algorithm, data, threshold=50):
+    writer = _compress.CompressedIO(io.BytesIO(), algorithm, 3, threshold)
+    packed = writer.pack(data)
+    reader = _compress.CompressedIO(io.BytesIO(packed), algorithm, 3, threshold)
+    return packed, reader
+
+
+@pytest.mark.parametrize("algorithm", ["zlib", "zstd"])
+def test_roundtrip(algorithm):
+    if algorithm == "zstd":
+        pytest.importorskip("zstandard")
+    data = b"SELECT " + b"1, " * 10000 + b"1"
+    packed, reader = _roundtrip(algorithm, data)
+    assert len(packed) < len(data)
+    assert reader.read(7) == b"SELECT "
+    assert reader.read(len(data)) == data[7:]
+    assert reader.read(1) == b""
+    assert reader.sequence_id == 1
+
+
+def test_small_packet_is_not_compressed():
+    data = b"\x01\x00\x00\x00\x0e"
+    packed, reader = _roundtrip("zlib", data)
+    # compressed length, sequence id, uncompressed length == 0 (not compressed)
+    assert packed == b"\x05\x00\x00\x00\x00\x00\x00" + data
+    assert reader.read(5) == data
+
+
+def test_large_packet():
+    data = bytes(range(256)) * 0x10001  # larger than 16MB
+    packed, reader = _roundtrip("zlib", data, threshold=len(data) + 1)
+    assert packed[3] == 0 and packed[7 + 0xFFFFFF + 3] == 1
+    assert reader.read(len(data)) == data
+
+
+def test_unknown_algorithm():
+    with pytest.raises(ValueError):
+        _compress.get_codec("lz4")
+
+
+class TestCompression(base.PyMySQLTestCase):
+    def test_compress(self):
+        conn = self.connect(compress=True, compress_threshold=0)
+        if conn._compressed is None:
+            pytest.skip("Server doesn't support compression")
+        cur = conn.cursor()
+        data = "x" * 100000
+        cur.execute("SELECT %s, 1", (data,))
+        self.assertEqual((data, 1), cur.fetchone())
+        conn.ping()
+        cur.execute("SELECT 2")
+        self.assertEqual((2,), cur.fetchone())
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            pymysql.connect(compress="lz4", defer_connect=True)
@@ -458,6 +458,34 @@ class TestConnection(base.PyMySQLTestCase):
         self.assertEqual(cur.fetchone(), ("utf8mb4", "utf8mb4_general_ci"))
         self.assertEqual(con.encoding, "utf8")
 
+    def test_handshake_collation(self):
+        for force_set_names in (False, True):
+            con = self.connect(
+                charset="utf8mb4",
+                collation="utf8mb4_bin",
+                force_set_names=force_set_names,
+            )
+            cur = con.cursor()
+            cur.execute(
+                "SELECT @@character_set_client, @@character_set_results,"
+                " @@collation_connection"
+            )
+            self.assertEqual(("utf8mb4", "utf8mb4", "utf8mb4_bin"), cur.fetchone())
+
+    def test_session_track(self):
+        con = self.connect()
+        if not con._session_track:
+            pytest.skip("The server doesn't support session tracking")
+        self.assertEqual(self.databases[0]["database"], con.current_db)
+        cur = con.cursor()
+        cur.execute("SET SESSION session_track_system_variables = 'time_zone'")
+        cur.execute("SET time_zone = '+01:00'")
+        self.assertEqual("+01:00", con.session_variables["time_zone"])
+        cur.execute(f"USE {self.databases[1]['database']}")
+        self.assertEqual(self.databases[1]["database"], con.current_db)
+        con.select_db(self.databases[0]["database"])
+        self.assertEqual(self.databases[0]["database"], con.current_db)
+
     def test_largedata(self):
         """Large query and response (>=16MB)"""
         cur = self.connect().cursor()
@@ -469,6 +497,18 @@ class TestConnection(base.PyMySQLTestCase):
         cur.execute("SELECT '" + t + "'")
         assert cur.fetchone()[0] == t
 
+    def test_deprecate_eof(self):
+        con = self.connect(client_flag=CLIENT.MULTI_STATEMENTS)
+        self.assertTrue(con._deprecate_eof)
+
+        cur = con.cursor()
+        cur.execute("SELECT 1, 2; SELECT CAST('x' AS SIGNED)")
+        self.assertEqual(cur.fetchall(), ((1, 2),))
+        self.assertTrue(cur.nextset())
+        self.assertEqual(cur.fetchall(), ((0,),))
+        self.assertEqual(cur.warning_count, 1)
+        self.assertIsNone(cur.nextset())
+
     def test_autocommit(self):
         con = self.connect()
         self.assertFalse(con.get_autocommit())
@@ -495,6 +535,60 @@ class TestConnection(base.PyMySQLTestCase):
         cur.execute("SELECT database()")
         self.assertEqual(cur.fetchone()[0], other_db)
 
+    def test_reset(self):
+        con = self.connect(sql_mode="ANSI_QUOTES", init_command="SET @init = 1")
+        con.autocommit(True)
+        cur = con.cursor()
+        cur.execute("SET @a = 1, time_zone = '+01:00'")
+        cur.execute("CREATE TEMPORARY TABLE test_reset (a INT)")
+        con.set_character_set("utf8mb4", "utf8mb4_bin")
+        thread_id = con.thread_id()
+
+        con.reset()
+        self.assertEqual(thread_id, con.thread_id())
+        self.assertTrue(con.get_autocommit())
+        cur.execute(
+            "SELECT @a, @init, @@time_zone, @@sql_mode, @@autocommit,"
+            " @@collation_connection"
+        )
+        a, init, time_zone, sql_mode, autocommit, collation = cur.fetchone()
+        self.assertIsNone(a)
+        self.assertEqual(1, init)
+        self.assertNotEqual("+01:00", time_zone)
+        self.assertEqual("ANSI_QUOTES", sql_mode)
+        self.assertEqual(1, autocommit)
+        self.assertEqual("utf8mb4_bin", collation)
+        with self.assertRaises(pymysql.ProgrammingError):
+            cur.execute("SELECT * FROM test_reset")
+
+    def test_reset_change_user(self):
+        con = self.connect()
+        con._reset_connection_supported = False
+        cur = con.cursor()
+        cur.execute("SET @a = 1")
+        con.reset()
+        cur.execute("SELECT @a, DATABASE()")
+        self.assertEqual((None, self.databases[0]["database"]), cur.fetchone())
+
+    def test_change_user(self):
+        con = self.connect(sql_mode="ANSI_QUOTES")
+        params = self.databases[1]
+        user = params["user"]
+        password = params.get("password", params.get("passwd", ""))
+        cur = con.cursor()
+        cur.execute("SET @a = 1")
+        con.change_user(user, password, params["database"])
+        cur.execute(
+            "SELECT @a, SUBSTRING_INDEX(USER(), '@', 1), DATABASE(), @@sql_mode"
+        )
+        self.assertEqual(
+            (None, user, params["database"], "ANSI_QUOTES"), cur.fetchone()
+        )
+
+        with self.assertRaises(pymysql.OperationalError):
+            con.change_user(user, password + "x", None)
+        self.assertEqual(user, con.user.decode())
+
     def test_connection_gone_away(self):
         """
         http://dev.mysql.com/doc/refman/5.0/en/gone-away.html
@@ -522,6 +616,22 @@ class TestConnection(base.PyMySQLTestCase):
         with self.assertRaises(pymysql.err.Error):
             conn.ping(reconnect=False)
 
+    def test_pipeline_init(self):
+        conn = self.connect(
+            pipeline_init=True,
+            sql_mode="ANSI_QUOTES",
+            init_command='SELECT "bar"; SET @a = @@autocommit',
+            client_flag=CLIENT.MULTI_STATEMENTS,
+            autocommit=False,
+        )
+        c = conn.cursor()
+        c.execute("SELECT @@sql_mode, @a, @@autocommit, @@character_set_client")
+        self.assertEqual(("ANSI_QUOTES", 1, 0, "utf8mb4"), c.fetchone())
+        self.assertFalse(conn.get_autocommit())
+
+        with self.assertRaises(pymysql.ProgrammingError):
+            self.connect(pipeline_init=True, init_command="SELEKT 1")
+
     def test_read_default_group(self):
         conn = self.connect(
             read_default_group="client",
@@ -1,7 +1,11 @@
+import collections
+import datetime
+import decimal
+
 import pytest
 
 import pymysql.cursors
-from pymysql.constants import ER
+from pymysql.constants import CLIENT, ER, SERVER_STATUS
 from pymysql.tests import base
 
 
@@ -30,6 +34,45 @@ def test_re_insert_values_with_on_duplicate_key_alias():
     assert m.group(3) == " ON DUPLICATE KEY UPDATE c=VALUES(a)+VALUES(b)"
 
 
+@pytest.mark.parametrize("no_backslash_escapes", [False, True])
+def test_bulk_insert_statements(no_backslash_escapes):
+    conn = pymysql.connect(user="root", defer_connect=True, binary_prefix=True)
+    conn.server_status = 0
+    if no_backslash_escapes:
+        conn.server_status = SERVER_STATUS.SERVER_STATUS_NO_BACKSLASH_ESCAPES
+    cursor = conn.cursor()
+    row = collections.namedtuple("row", "a b c")
+    rows = [
+        (None, "a'b\\", datetime.datetime(2024, 1, 2, 3, 4, 5)),
+        [1, b"\x00'", datetime.datetime(2024, 1, 2, 3, 4, 5, 6)],
+        row(2**64, 1.5, datetime.datetime(1, 2, 3, tzinfo=datetime.timezone.utc)),
+        (True, decimal.Decimal("1.50"), None),
+    ]
+    query = "INSERT INTO t (a, b, c) VALUES (%s, %s,%s)"
+    expected = "INSERT INTO t (a, b, c) VALUES " + ",".join(
+        "(%s, %s,%s)" % cursor._escape_args(r, conn) for r in rows
+    )
+    assert [expected.encode()] == list(cursor._bulk_insert_statements(query, rows))
+
+    query = "INSERT INTO t (a, b, c) VALUES (%(a)s, %(b)s,%(c)s)"
+    dicts = [r._asdict() if isinstance(r, row) else dict(zip("abc", r)) for r in rows]
+    assert [expected.encode()] == list(cursor._bulk_insert_statements(query, dicts))
+
+    # The errors of the rows not matching the placeholders are not changed.
+    with pytest.raises(TypeError):
+        list(
+            cursor._bulk_insert_statements(
+                "INSERT INTO t VALUES (%s, %s)", [(1, 2), (3,)]
+            )
+        )
+    with pytest.raises(KeyError):
+        list(
+            cursor._bulk_insert_statements(
+                "INSERT INTO t VALUES (%(a)s)", [{"a": 1}, {"b": 2}]
+            )
+        )
+
+
 class CursorTest(base.PyMySQLTestCase):
     def setUp(self):
         super().setUp()
@@ -165,6 +208,48 @@ class CursorTest(base.PyMySQLTestCase):
         finally:
             cursor.execute("DROP TABLE IF EXISTS percent_test")
 
+    def test_executemany_batch_statements(self):
+        conn = self.connect(client_flag=CLIENT.MULTI_STATEMENTS)
+        cursor = conn.cursor()
+        cursor.batch_statements = True
+        cursor.max_stmt_length = 100
+        q = "UPDATE test SET data = %s WHERE data = %s;"
+        args = [(f"new{i}", f"row{i}") for i in range(1, 6)] + [("x", "none")]
+        self.assertEqual(5, cursor.executemany(q, args))
+        self.assertTrue(cursor._executed.startswith(b"UPDATE test SET data = 'new"))
+        self.assertIn(b";", cursor._executed)
+        self.assertLessEqual(len(cursor._executed), 100)
+        self.assertEqual(
+            3,
+            cursor.executemany(
+                "DELETE FROM test WHERE data LIKE 'new%%' AND data = %(data)s",
+                [{"data": "new3"}, {"data": "new4"}, {"data": "new5"}],
+            ),
+        )
+        cursor.execute("SELECT data FROM test ORDER BY data")
+        self.assertEqual((("new1",), ("new2",)), cursor.fetchall())
+        # Trailing comments don't hide the following statements.
+        for q in (
+            "UPDATE test SET data = %s WHERE data = %s -- rename",
+            "UPDATE test SET data = %s WHERE data = %s # rename",
+        ):
+            self.assertEqual(2, cursor.executemany(q, [("x1", "new1"), ("x2", "new2")]))
+            cursor.execute("SELECT data FROM test ORDER BY data")
+            self.assertEqual((("x1",), ("x2",)), cursor.fetchall())
+            cursor.executemany(
+                "UPDATE test SET data = %s WHERE data = %s",
+                [("new1", "x1"), ("new2", "x2")],
+            )
+        conn.commit()
+
+        # The statements are executed one by one without MULTI_STATEMENTS.
+        cursor = self.test_connection.cursor()
+        cursor.batch_statements = True
+        self.assertEqual(2, cursor.executemany(q, [("a", "new1"), ("b", "new2")]))
+        self.assertEqual(
+            "UPDATE test SET data = 'b' WHERE data = 'new2';", cursor._executed
+        )
+
     def test_execution_time_limit(self):
         # this method is similarly implemented in test_SScursor
 
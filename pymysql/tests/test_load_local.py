@@ -1,4 +1,6 @@
+import datetime
 import os
+import unittest
 
 from pymysql import OperationalError, cursors
 from pymysql.constants import ER
@@ -44,6 +46,43 @@ class TestLoadLocal(base.PyMySQLTestCase):
         finally:
             c.execute("DROP TABLE test_load_local")
 
+    def test_load_file_packet_size(self):
+        """Test load local infile with small packets"""
+        conn = self.connect(local_infile_packet_size=1000)
+        c = conn.cursor()
+        c.execute("CREATE TABLE test_load_local (a INTEGER, b INTEGER)")
+        filename = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)), "data", "load_local_data.txt"
+        )
+        try:
+            c.execute(
+                f"LOAD DATA LOCAL INFILE '{filename}' INTO TABLE test_load_local"
+                + " FIELDS TERMINATED BY ','"
+            )
+            c.execute("SELECT COUNT(*) FROM test_load_local")
+            self.assertEqual(22749, c.fetchone()[0])
+        finally:
+            c.execute("DROP TABLE test_load_local")
+
+    @unittest.skipUnless(os.path.isdir("/dev/fd"), "requires /dev/fd")
+    def test_load_pipe(self):
+        """Test load local infile from a pipe, which is not a regular file"""
+        conn = self.connect()
+        c = conn.cursor()
+        c.execute("CREATE TABLE test_load_local (a INTEGER, b INTEGER)")
+        read_fd, write_fd = os.pipe()
+        try:
+            os.write(write_fd, b"1,2\n3,4\n")
+            os.close(write_fd)
+            c.execute(
+                f"LOAD DATA LOCAL INFILE '/dev/fd/{read_fd}' INTO TABLE test_load_local"
+                + " FIELDS TERMINATED BY ','"
+            )
+            self.assertEqual(2, c.rowcount)
+        finally:
+            os.close(read_fd)
+            c.execute("DROP TABLE test_load_local")
+
     def test_unbuffered_load_file(self):
         """Test unbuffered load local infile with a valid file"""
         conn = self.connect()
@@ -97,6 +136,43 @@ class TestLoadLocal(base.PyMySQLTestCase):
             c.execute("DROP TABLE test_load_local")
             c.close()
 
+    def test_load_data(self):
+        """Test loading rows from an iterable"""
+        conn = self.connect()
+        c = conn.cursor()
+        c.execute(
+            "CREATE TABLE test_load_local"
+            " (a INTEGER PRIMARY KEY, b VARCHAR(20), c BLOB, d DATETIME)"
+        )
+        rows = [
+            (1, "a,b'c\n\\", b"\x00\xff'\n", datetime.datetime(2024, 1, 2, 3, 4, 5)),
+            (2, "", None, None),
+            (3, "NULL", b"", datetime.datetime(2024, 1, 2)),
+        ]
+        try:
+            self.assertEqual(3, c.load_data("test_load_local", iter(rows)))
+            c.execute("SELECT * FROM test_load_local ORDER BY a")
+            self.assertEqual(tuple(rows), c.fetchall())
+
+            c.load_data(
+                "test_load_local",
+                [(1, "x"), (4, "y")],
+                columns=["a", "b"],
+                replace=True,
+            )
+            c.execute("SELECT a, b FROM test_load_local ORDER BY a")
+            self.assertEqual(((1, "x"), (2, ""), (3, "NULL"), (4, "y")), c.fetchall())
+
+            c.execute("TRUNCATE TABLE test_load_local")
+            c.load_data(
+                "test_load_local", ((i, str(i)) for i in range(20000)), ["a", "b"]
+            )
+            c.execute("SELECT COUNT(*), SUM(a) FROM test_load_local")
+            self.assertEqual((20000, sum(range(20000))), c.fetchone())
+        finally:
+            c.execute("DROP TABLE test_load_local")
+            c.close()
+
 
 if __name__ == "__main__":
     import unittest
@@ -0,0 +1,72 @@
+import datetime
+
+import pytest
+
+import pymysql.cursors
+from pymysql.converters import convert_datetime
+from pymysql.tests import base
+
+numpy = pytest.importorskip("numpy")
+
+from pymysql import _numpy
+
+
+def test_to_ndarray():
+    int64 = numpy.dtype("int64")
+    data = _numpy.to_ndarray([b"1", b"-2", b"3"], int64, int)
+    assert data.dtype == int64
+    assert data.tolist() == [1, -2, 3]
+
+    data = _numpy.to_ndarray([b"1.5", None], numpy.dtype("float64"), float)
+    assert isinstance(data, numpy.ma.MaskedArray)
+    assert data.mask.tolist() == [False, True]
+    assert data[0] == 1.5
+
+
+def test_to_ndarray_datetime():
+    dtype = numpy.dtype("datetime64[us]")
+    values = [b"2024-01-02 03:04:05.000006", b"0000-00-00 00:00:00", None]
+    data = _numpy.to_ndarray(values, dtype, convert_datetime)
+    assert data.mask.tolist() == [False, True, True]
+    assert data[0] == numpy.datetime64("2024-01-02T03:04:05.000006")
+
+    values = [datetime.datetime(2024, 1, 2), "0000-00-00 00:00:00"]
+    data = _numpy.to_ndarray(values, dtype, convert_datetime)
+    assert data.mask.tolist() == [False, True]
+
+
+def test_to_ndarray_object():
+    data = _numpy.to_ndarray(["a", None], None, None)
+    assert data.dtype == object
+    assert data.tolist() == ["a", None]
+
+
+class TestNumpyCursor(base.PyMySQLTestCase):
+    def test_fetch_columns(self):
+        conn = self.connect()
+        self.safe_create_table(
+            conn,
+            "test_numpy",
+            """CREATE TABLE test_numpy (
+                i INT, u BIGINT UNSIGNED, f DOUBLE, dt DATETIME(6), s VARCHAR(32)
+            )""",
+        )
+        cur = conn.cursor()
+        cur.executemany(
+            "INSERT INTO test_numpy VALUES (%s, %s, %s, %s, %s)",
+            [
+                (1, 2**64 - 1, 0.5, datetime.datetime(2024, 1, 2, 3, 4, 5, 6), "a"),
+                (None, 0, None, None, None),
+            ],
+        )
+        cur = conn.cursor(pymysql.cursors.NumpyCursor)
+        cur.execute("SELECT * FROM test_numpy ORDER BY u DESC")
+        i, u, f, dt, s = cur.fetch_columns()
+        self.assertEqual(numpy.dtype("int64"), i.dtype)
+        self.assertEqual([1, None], i.tolist())
+        self.assertEqual(numpy.dtype("uint64"), u.dtype)
+        self.assertEqual([2**64 - 1, 0], u.tolist())
+        self.assertEqual([0.5, None], f.tolist())
+        self.assertEqual(numpy.dtype("datetime64[us]"), dt.dtype)
+        self.assertEqual([datetime.datetime(2024, 1, 2, 3, 4, 5, 6), None], dt.tolist())
+        self.assertEqual(["a", None], s.tolist())
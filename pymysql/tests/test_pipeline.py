@@ -0,0 +1,76 @@
+import pymysql
+from pymysql.constants import FIELD_TYPE
+from pymysql.cursors import DictCursor, PreparedCursor, SSCursor
+from pymysql.tests import base
+
+
+class TestPipeline(base.PyMySQLTestCase):
+    def test_pipeline(self):
+        conn = self.connect()
+        with conn.pipeline() as pipe:
+            cur1 = pipe.execute("SELECT %s", (1,))
+            cur2 = pipe.execute("SELECT %s, %s", ("a", 2))
+            cur3 = pipe.execute("DO 1")
+        self.assertEqual(((1,),), cur1.fetchall())
+        self.assertEqual((("a", 2),), cur2.fetchall())
+        self.assertIsNone(cur3.description)
+
+        pipe = conn.pipeline(DictCursor)
+        pipe.max_pending_bytes = 100
+        cursors = [pipe.execute("SELECT %s AS a", (i,)) for i in range(100)]
+        self.assertEqual(cursors, pipe.run())
+        self.assertEqual(
+            [[{"a": i}] for i in range(100)], [c.fetchall() for c in cursors]
+        )
+
+    def test_prepared(self):
+        conn = self.connect()
+        pipe = conn.pipeline(PreparedCursor)
+        cursors = [pipe.execute("SELECT %s + 1", (i,)) for i in range(3)]
+        pipe.run()
+        self.assertEqual([((1,),), ((2,),), ((3,),)], [c.fetchall() for c in cursors])
+
+    def test_prepared_evicted(self):
+        conn = self.connect(statement_cache_size=1)
+        pipe = conn.pipeline(PreparedCursor)
+        # The queued statements are evicted from the cache by the next query.
+        cursors = [pipe.execute(f"SELECT %s + {i}", (i,)) for i in range(3)]
+        pipe.run()
+        self.assertEqual([((0,),), ((2,),), ((4,),)], [c.fetchall() for c in cursors])
+        self.assertEqual(2, conn.statement_cache.evictions)
+        cur = conn.cursor(PreparedCursor)
+        cur.execute("SELECT %s + 2", (1,))
+        self.assertEqual((3,), cur.fetchone())
+
+    def test_error(self):
+        conn = self.connect()
+        pipe = conn.pipeline()
+        cur1 = pipe.execute("SELECT 1")
+        pipe.execute("SELEKT 2")
+        cur3 = pipe.execute("SELECT 3")
+        with self.assertRaises(pymysql.ProgrammingError):
+            pipe.run()
+        self.assertEqual(((1,),), cur1.fetchall())
+        self.assertEqual(((3,),), cur3.fetchall())
+
+        cur = conn.cursor()
+        cur.execute("SELECT 4")
+        self.assertEqual(((4,),), cur.fetchall())
+
+        with self.assertRaises(pymysql.NotSupportedError):
+            conn.pipeline(SSCursor)
+
+    def test_converter_error(self):
+        def broken(value):
+            raise ValueError(value)
+
+        conv = pymysql.converters.conversions.copy()
+        conv[FIELD_TYPE.VAR_STRING] = broken
+        conn = self.connect(conv=conv)
+        pipe = conn.pipeline()
+        pipe.execute("SELECT 'a'")
+        pipe.execute("SELECT 2")
+        # The connection is closed not to read the unread responses as others.
+        with self.assertRaises(ValueError):
+            pipe.run()
+        self.assertFalse(conn.open)
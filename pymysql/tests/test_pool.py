@@ -0,0 +1,156 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+import pymysql
+from pymysql.constants import SERVER_STATUS
+from pymysql.pool import ConnectionPool, PoolTimeoutError
+from pymysql.tests import base
+
+
+def _dummy_connection():
+    return mock.Mock(open=True, server_status=0)
+
+
+def test_release_twice():
+    with mock.patch("pymysql.pool.Connection", side_effect=_dummy_connection):
+        pool = ConnectionPool(max_size=2)
+        conn = pool.get_connection()
+        pool.release(conn)
+        with pytest.raises(ValueError):
+            pool.release(conn)
+        # The connection is not returned twice.
+        assert conn is pool.get_connection()
+        assert conn is not pool.get_connection()
+        with pytest.raises(ValueError):
+            pool.release(_dummy_connection())
+
+
+def test_min_size_connect_error():
+    conns = [_dummy_connection(), _dummy_connection()]
+    error = pymysql.OperationalError(2003, "Can't connect")
+    patch = mock.patch("pymysql.pool.Connection", side_effect=[*conns, error])
+    with patch, pytest.raises(pymysql.OperationalError):
+        ConnectionPool(min_size=3)
+    for conn in conns:
+        conn.close.assert_called_once_with()
+
+
+class TestConnectionPool(base.PyMySQLTestCase):
+    def create_pool(self, **kwargs):
+        params = self.databases[0].copy()
+        params.update(kwargs)
+        pool = ConnectionPool(**params)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_reuse(self):
+        pool = self.create_pool(min_size=1, max_size=2)
+        self.assertEqual((1, 1), (pool.size, pool.idle))
+        with pool.connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT CONNECTION_ID()")
+            thread_id = cur.fetchone()[0]
+        with pool.connection() as conn:
+            self.assertEqual(thread_id, conn.thread_id())
+        self.assertEqual((1, 1), (pool.size, pool.idle))
+
+    def test_timeout(self):
+        pool = self.create_pool(max_size=2, timeout=0.1)
+        conns = [pool.get_connection(), pool.get_connection()]
+        with self.assertRaises(PoolTimeoutError):
+            pool.get_connection()
+
+        def release():
+            time.sleep(0.1)
+            pool.release(conns[0])
+
+        thread = threading.Thread(target=release)
+        thread.start()
+        self.assertIs(conns[0], pool.get_connection(timeout=5))
+        thread.join()
+
+    def test_release_rollback(self):
+        pool = self.create_pool(max_size=1)
+        conn = pool.get_connection()
+        conn.begin()
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        self.assertTrue(
+            conn.server_status & pymysql.constants.SERVER_STATUS.SERVER_STATUS_IN_TRANS
+        )
+        pool.release(conn)
+        self.assertFalse(
+            conn.server_status & pymysql.constants.SERVER_STATUS.SERVER_STATUS_IN_TRANS
+        )
+
+    def test_broken_connection(self):
+        pool = self.create_pool(max_size=1, ping_interval=0)
+        conn = pool.get_connection()
+        thread_id = conn.thread_id()
+        pool.release(conn)
+        kill_conn = self.connect()
+        kill_conn.kill(thread_id)
+        conn2 = pool.get_connection()
+        # The dead connection is replaced instead of reconnected.
+        self.assertIsNot(conn, conn2)
+        self.assertNotEqual(thread_id, conn2.thread_id())
+        self.assertFalse(conn.open)
+
+    def test_max_lifetime_and_idle_time(self):
+        pool = self.create_pool(max_size=2, max_lifetime=0.1)
+        conn = pool.get_connection()
+        pool.release(conn)
+        time.sleep(0.2)
+        self.assertIsNot(conn, pool.get_connection())
+        self.assertFalse(conn.open)
+
+        pool = self.create_pool(max_size=2, max_idle_time=0.1)
+        conns = [pool.get_connection(), pool.get_connection()]
+        for conn in conns:
+            pool.release(conn)
+        time.sleep(0.2)
+        pool.release(pool.get_connection())
+        self.assertEqual((1, 1), (pool.size, pool.idle))
+
+    def test_max_lifetime_order(self):
+        pool = self.create_pool(max_size=3, max_lifetime=0.5)
+        old = pool.get_connection()
+        time.sleep(0.3)
+        new = pool.get_connection()
+        conn = pool.get_connection()
+        # The older connection is released after the newer one.
+        pool.release(new)
+        pool.release(old)
+        time.sleep(0.3)
+        pool.release(conn)
+        self.assertEqual((2, 2), (pool.size, pool.idle))
+        self.assertFalse(old.open)
+        self.assertTrue(new.open)
+
+    def test_close(self):
+        pool = self.create_pool(min_size=1, max_size=2)
+        idle = pool.get_connection()
+        in_use = pool.get_connection()
+        pool.release(idle)
+        pool.close()
+        self.assertFalse(idle.open)
+        self.assertTrue(in_use.open)
+        pool.release(in_use)
+        self.assertFalse(in_use.open)
+        with self.assertRaises(pymysql.Error):
+            pool.get_connection()
+
+    def test_reset_session(self):
+        pool = self.create_pool(max_size=1, reset_session=True)
+        with pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SET @a = 1")
+            conn.begin()
+        with pool.connection() as conn2:
+            self.assertIs(conn, conn2)
+            cur = conn2.cursor()
+            self.assertFalse(conn2.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS)
+            cur.execute("SELECT @a")
+            self.assertEqual((None,), cur.fetchone())
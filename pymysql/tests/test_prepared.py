@@ -0,0 +1,235 @@
+import datetime
+import io
+from decimal import Decimal
+
+import pymysql.cursors
+from pymysql.tests import base
+
+
+def test_convert_placeholders():
+    convert = pymysql.cursors._convert_placeholders
+    assert convert("SELECT %s, %s") == ("SELECT ?, ?", [None, None])
+    assert convert("SELECT %(a)s, %(b)s, %(a)s") == ("SELECT ?, ?, ?", ["a", "b", "a"])
+    assert convert("SELECT '%%s', %s") == ("SELECT '%s', ?", [None])
+
+
+def test_merge_param_types():
+    merge = pymysql.connections._merge_param_types
+    assert merge([(8, 0), None], [None, (253, 0)]) == [(8, 0), (253, 0)]
+    assert merge([(8, 0), None], [(8, 0), None]) == [(8, 0), None]
+    assert merge([(8, 0)], [(8, 0x80)]) is None
+    assert merge([(8, 0)], [(253, 0)]) is None
+
+
+def test_is_long_data():
+    is_long_data = pymysql.protocol._is_long_data
+    assert is_long_data(io.BytesIO())
+    assert is_long_data(iter([b"a"]))
+    assert is_long_data(b"a" for _ in range(2))
+    for value in ("a", b"a", [b"a"], (b"a",), {b"a"}, {"a": b"a"}, 1):
+        assert not is_long_data(value)
+
+
+class DummyStatement:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_statement_cache():
+    cache = pymysql.connections.StatementCache(2)
+    statements = [DummyStatement() for i in range(3)]
+    assert cache.get("q0") is None
+    assert cache.put("q0", statements[0])
+    assert cache.put("q1", statements[1])
+    assert cache.get("q0") is statements[0]
+    assert cache.put("q2", statements[2])  # evicts q1
+    assert statements[1].closed
+    assert cache.get("q1") is None
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 2, 1)
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0
+    assert not statements[0].closed
+
+
+def test_statement_cache_disabled():
+    cache = pymysql.connections.StatementCache(0)
+    assert not cache.put("q0", DummyStatement())
+    assert len(cache) == 0
+
+
+class TestPreparedCursor(base.PyMySQLTestCase):
+    cursor_type = pymysql.cursors.PreparedCursor
+
+    def setUp(self):
+        super().setUp()
+        self.conn = conn = self.connect()
+        self.safe_create_table(
+            conn,
+            "test_prepared",
+            """CREATE TABLE test_prepared (
+                i INT, u BIGINT UNSIGNED, f DOUBLE, d DECIMAL(10, 2),
+                s VARCHAR(32), b VARBINARY(32), dt DATETIME(6), da DATE, t TIME(6)
+            )""",
+        )
+
+    def test_roundtrip(self):
+        values = (
+            -42,
+            2**64 - 1,
+            1.5,
+            Decimal("3.25"),
+            "Unicode あ",
+            b"\x00\xff\\'",
+            datetime.datetime(2024, 2, 29, 12, 34, 56, 789),
+            datetime.date(1999, 12, 31),
+            datetime.timedelta(hours=-25, minutes=-1, microseconds=-5),
+        )
+        cur = self.conn.cursor(self.cursor_type)
+        cur.execute(
+            "INSERT INTO test_prepared VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+            values,
+        )
+        self.assertEqual(1, cur.rowcount)
+        cur.execute("SELECT * FROM test_prepared")
+        self.assertEqual([values], list(cur.fetchall()))
+        cur.close()
+
+    def test_null_and_named(self):
+        cur = self.conn.cursor(self.cursor_type)
+        cur.execute(
+            "INSERT INTO test_prepared (i, s) VALUES (%(i)s, %(s)s)",
+            {"i": None, "s": "foo"},
+        )
+        cur.execute("SELECT i, s, f FROM test_prepared WHERE s = %s", ("foo",))
+        self.assertEqual((None, "foo", None), cur.fetchone())
+        self.assertIsNone(cur.fetchone())
+        cur.close()
+
+    def test_reuse_statement(self):
+        cache = self.conn.statement_cache
+        cur = self.conn.cursor(self.cursor_type)
+        cur.executemany(
+            "INSERT INTO test_prepared (i) VALUES (%s)", [(i,) for i in range(10)]
+        )
+        self.assertEqual(10, cur.rowcount)
+        # PreparedCursor looks up the statement once in executemany().
+        hits = cache.hits
+        self.assertEqual(1, cache.misses)
+        for i in range(10):
+            cur.execute("SELECT i FROM test_prepared WHERE i = %s", (i,))
+            self.assertEqual((i,), cur.fetchone())
+        self.assertEqual((hits + 9, 2), (cache.hits, cache.misses))
+        self.assertEqual(2, len(cache))
+        cur.close()
+
+    def test_executemany(self):
+        cur = self.conn.cursor(self.cursor_type)
+        rows = [(i, f"s{i}", b"b" * (i % 32)) for i in range(100)]
+        # Parameters of different types and NULL
+        rows += [(None, "null", None), ("100", 100, "str"), (2**63, None, b"")]
+        self.assertEqual(
+            len(rows),
+            cur.executemany(
+                "INSERT INTO test_prepared (u, s, b) VALUES (%s, %s, %s)", rows
+            ),
+        )
+        self.assertEqual(
+            50,
+            cur.executemany(
+                "UPDATE test_prepared SET f = %(f)s WHERE u = %(u)s",
+                [{"f": i / 2, "u": i} for i in range(0, 100, 2)],
+            ),
+        )
+        cur.execute("SELECT s, b FROM test_prepared WHERE u IS NULL")
+        self.assertEqual(("null", None), cur.fetchone())
+        cur.execute("SELECT s, b FROM test_prepared WHERE u = 100")
+        self.assertEqual(("100", b"str"), cur.fetchone())
+        cur.execute("SELECT COUNT(*), SUM(f), MAX(u) FROM test_prepared")
+        self.assertEqual((len(rows), 1225.0, 2**63), cur.fetchone())
+
+        with self.assertRaises(pymysql.ProgrammingError):
+            cur.executemany("SELECT %s, %s", [(1, 2), (1,)])
+        cur.execute("SELECT 1")
+        self.assertEqual((1,), cur.fetchone())
+        cur.close()
+
+    def test_long_data(self):
+        conn = self.conn
+        conn.long_data_packet_size = 7
+        cur = conn.cursor(self.cursor_type)
+        query = "INSERT INTO test_prepared (i, s, b) VALUES (%s, %s, %s)"
+        cur.execute(query, (1, io.StringIO("Unicode あ"), io.BytesIO(b"\x00\xff" * 8)))
+        cur.execute(query, (2, iter(["a", "b"]), (b"" for _ in range(3))))
+        cur.executemany(
+            query, [(3, "x", b"y"), (4, iter([b"abc"]), b"z"), (5, "x", b"")]
+        )
+
+        def broken():
+            yield b"partial"
+            raise ValueError("broken")
+
+        with self.assertRaises(ValueError):
+            cur.execute(query, (6, "x", broken()))
+        with self.assertRaises(TypeError):
+            cur.execute(query, (6, "x", iter([1, 2])))
+        # Containers are not streamed.
+        with self.assertRaises(TypeError):
+            cur.execute(query, (6, "x", [b"a", b"b"]))
+        # The data sent before the errors are discarded.
+        cur.execute(query, (6, "x", None))
+
+        cur.execute("SELECT i, s, b FROM test_prepared ORDER BY i")
+        self.assertEqual(
+            [
+                (1, "Unicode あ", b"\x00\xff" * 8),
+                (2, "ab", b""),
+                (3, "x", b"y"),
+                (4, "abc", b"z"),
+                (5, "x", b""),
+                (6, "x", None),
+            ],
+            list(cur.fetchall()),
+        )
+        misses = conn.statement_cache.misses
+        with self.assertRaises(pymysql.NotSupportedError):
+            conn.pipeline(self.cursor_type).execute("SELECT %s", (io.BytesIO(b"x"),))
+        # The query is rejected before preparing it.
+        self.assertEqual(misses, conn.statement_cache.misses)
+        cur.close()
+
+    def test_statement_cache_eviction(self):
+        conn = self.connect(statement_cache_size=2)
+        cache = conn.statement_cache
+        cur = conn.cursor(self.cursor_type)
+        for i in range(5):
+            cur.execute(f"SELECT {i}")
+            self.assertEqual((i,), cur.fetchone())
+        self.assertEqual(2, len(cache))
+        self.assertEqual(3, cache.evictions)
+        cur.execute("SELECT 4")
+        self.assertEqual((4,), cur.fetchone())
+        self.assertEqual(1, cache.hits)
+        cur.close()
+
+    def test_statement_cache_disabled(self):
+        conn = self.connect(statement_cache_size=0)
+        cur = conn.cursor(self.cursor_type)
+        for i in range(3):
+            cur.execute("SELECT %s", (i,))
+            self.assertEqual((i,), cur.fetchone())
+        self.assertEqual(0, len(conn.statement_cache))
+        cur.close()
+
+    def test_wrong_number_of_parameters(self):
+        cur = self.conn.cursor(self.cursor_type)
+        with self.assertRaises(pymysql.ProgrammingError):
+            cur.execute("SELECT %s, %s", (1,))
+        cur.close()
+
+
+class TestSSPreparedCursor(TestPreparedCursor):
+    cursor_type = pymysql.cursors.SSPreparedCursor
@@ -0,0 +1,85 @@
+import struct
+
+from pymysql.connections import Connection
+from pymysql.constants import FIELD_TYPE, SERVER_STATUS, SESSION_TRACK
+from pymysql.protocol import MysqlPacket, OKPacketWrapper, parse_session_state
+
+
+def _lenenc_str(data):
+    return bytes([len(data)]) + data
+
+
+def _item(type_, data):
+    return bytes([type_]) + _lenenc_str(data)
+
+
+def test_parse_session_state():
+    data = (
+        _item(SESSION_TRACK.SYSTEM_VARIABLES, _lenenc_str(b"autocommit") + b"\x03OFF")
+        + _item(SESSION_TRACK.SCHEMA, _lenenc_str(b"test"))
+        + _item(SESSION_TRACK.STATE_CHANGE, b"\x011")
+        + _item(SESSION_TRACK.GTIDS, b"\x00" + _lenenc_str(b"uuid:1-5"))
+        + _item(SESSION_TRACK.TRANSACTION_STATE, _lenenc_str(b"T_______"))
+        + _item(42, b"xyz")
+    )
+    assert parse_session_state(data) == [
+        (SESSION_TRACK.SYSTEM_VARIABLES, (b"autocommit", b"OFF")),
+        (SESSION_TRACK.SCHEMA, b"test"),
+        (SESSION_TRACK.STATE_CHANGE, b"1"),
+        (SESSION_TRACK.GTIDS, b"uuid:1-5"),
+        (SESSION_TRACK.TRANSACTION_STATE, b"T_______"),
+        (42, b"xyz"),
+    ]
+
+
+def test_ok_packet_session_track():
+    status = SERVER_STATUS.SERVER_STATUS_AUTOCOMMIT
+    header = b"\x00\x01\x02" + status.to_bytes(2, "little") + b"\x00\x00"
+
+    ok = OKPacketWrapper(MysqlPacket(header + b"message", None))
+    assert (ok.affected_rows, ok.insert_id, ok.message) == (1, 2, b"message")
+    assert ok.session_state_changes == []
+
+    ok = OKPacketWrapper(MysqlPacket(header, None), session_track=True)
+    assert (ok.message, ok.session_state_changes) == (b"", [])
+
+    status |= SERVER_STATUS.SERVER_SESSION_STATE_CHANGED
+    header = b"\x00\x01\x02" + status.to_bytes(2, "little") + b"\x00\x00"
+    state = _item(SESSION_TRACK.SCHEMA, _lenenc_str(b"test"))
+    packet = MysqlPacket(header + b"\x00" + _lenenc_str(state), None)
+    ok = OKPacketWrapper(packet, session_track=True)
+    assert ok.message == b""
+    assert ok.session_state_changes == [(SESSION_TRACK.SCHEMA, b"test")]
+
+
+def test_result_session_track():
+    # The OK packet ending the rows with CLIENT_DEPRECATE_EOF.
+    status = (
+        SERVER_STATUS.SERVER_STATUS_IN_TRANS
+        | SERVER_STATUS.SERVER_SESSION_STATE_CHANGED
+    )
+    state = _item(SESSION_TRACK.TRANSACTION_STATE, _lenenc_str(b"T_____W_"))
+    ok = b"\xfe\x00\x00" + struct.pack("<HH", status, 0) + b"\x00"
+    ok += _lenenc_str(state)
+    field = b"".join(_lenenc_str(s) for s in (b"def", b"", b"t", b"t", b"a", b"a"))
+    field += b"\x0c" + struct.pack("<HIBHBxx", 45, 4, FIELD_TYPE.VAR_STRING, 0, 0)
+
+    for unbuffered in (False, True):
+        conn = Connection(defer_connect=True)
+        conn._deprecate_eof = conn._session_track = True
+        packets = iter([b"\x01", field, _lenenc_str(b"x"), ok])
+
+        def read_packet(packet_type=MysqlPacket, conn=conn, packets=packets):
+            return packet_type(next(packets), conn.encoding)
+
+        conn._read_packet = read_packet
+        conn._read_query_result(unbuffered=unbuffered)
+        if unbuffered:
+            assert conn.transaction_state is None
+            result = conn._result
+            assert result._read_rowdata_packet_unbuffered() == ("x",)
+            assert result._read_rowdata_packet_unbuffered() is None
+        else:
+            assert conn._result.rows == (("x",),)
+        assert conn.transaction_state == "T_____W_"
+        assert conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS
@@ -0,0 +1,47 @@
+import socket
+import struct
+import threading
+
+import pytest
+
+from pymysql._socketio import SocketReader
+
+
+def _reader(data, buffer_size):
+    client, server = socket.socketpair()
+
+    def send():
+        # Send in small pieces to exercise partial receives.
+        for i in range(0, len(data), 1000):
+            server.sendall(data[i : i + 1000])
+        server.close()
+
+    thread = threading.Thread(target=send)
+    thread.start()
+    return SocketReader(client, buffer_size), client, thread
+
+
+def test_read_and_unpack():
+    header = struct.Struct("<HBB")
+    payloads = [bytes([i]) * (i * 37) for i in range(100)]
+    data = b"".join(header.pack(len(p), 0, i) + p for i, p in enumerate(payloads))
+    reader, sock, thread = _reader(data, 256)
+    for i, payload in enumerate(payloads):
+        length, _, seq = reader.unpack(header)
+        assert (length, seq) == (len(payload), i)
+        assert reader.read(length) == payload  # some are larger than the buffer
+    assert reader.read(10) == b""
+    with pytest.raises(EOFError):
+        reader.unpack(header)
+    thread.join()
+    reader.close()
+    assert reader.closed
+    sock.close()
+
+
+def test_short_read():
+    reader, sock, thread = _reader(b"x" * 10, 256)
+    assert reader.read(5) == b"xxxxx"
+    assert reader.read(100) == b"xxxxx"
+    thread.join()
+    sock.close()